@@ -6,9 +6,10 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
 from urllib import parse
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -19,10 +20,13 @@ if str(SRC_DIR) not in sys.path:
 from egov_law_api.api_client import (  # noqa: E402
     DEFAULT_BASE_URL,
     DEFAULT_TIMEOUT,
+    RateLimiter,
     decode_bytes,
     parse_json_text,
     request_endpoint,
 )
+from egov_law_api.records import LawRecord, RevisionHistory, RevisionRecord, parse_laws  # noqa: E402
+from egov_law_api.scheduler import BULK, use_priority  # noqa: E402
 
 
 LAW_SCOPES = [
@@ -56,6 +60,19 @@ DISCLAIMER_TEXT = (
     "It is not legal advice or legality judgment. "
     "本資料は法令情報の取得・草稿支援のみを目的としています。法的助言や適法性の判断ではありません。"
 )
+INDEX_FIELDS = (
+    "position",
+    "topic",
+    "law_title_query",
+    "found",
+    "law_title",
+    "law_id",
+    "law_num",
+    "law_revision_id",
+    "updated",
+    "amendment_enforcement_date",
+    "message",
+)
 
 
 def parse_args() -> argparse.Namespace:
@@ -69,8 +86,12 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--asof",
-        default="",
-        help="Optional date (YYYY-MM-DD) for historical lookup.",
+        action="append",
+        default=[],
+        help=(
+            "Optional date (YYYY-MM-DD) for historical lookup. Repeat or comma-separate several dates "
+            "to build one pack per date plus a cross-date comparison from shared fetches."
+        ),
     )
     parser.add_argument(
         "--base-url",
@@ -83,16 +104,76 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_TIMEOUT,
         help=f"HTTP timeout seconds (default: {DEFAULT_TIMEOUT})",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Reuse the previous pack in --output-dir: check each scope's current law_revision_id "
+            "with one /laws call and refetch revisions/articles only for scopes that changed."
+        ),
+    )
+    parser.add_argument(
+        "--catalog",
+        help=(
+            "Scope catalog (.json list or {\"scopes\": [...]}, .jsonl one scope per line, or .yaml "
+            "with PyYAML). Streams results into sharded JSONL/Markdown plus an index."
+        ),
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Catalog mode: scopes processed in parallel (default: 4).",
+    )
+    parser.add_argument(
+        "--rate-per-minute",
+        type=float,
+        default=60.0,
+        help="Catalog mode: max upstream requests per minute across workers, 0 = unlimited (default: 60).",
+    )
+    parser.add_argument(
+        "--scopes-per-shard",
+        type=int,
+        default=100,
+        help="Catalog mode: scopes per JSONL/Markdown shard (default: 100).",
+    )
+    args = parser.parse_args()
+    dates: list[str] = []
+    for value in (value.strip() for item in args.asof for value in item.split(",")):
+        if not value:
+            continue
+        try:
+            # Python 3.11+ also accepts 20240101 or 2024-W01-1; the API and
+            # RevisionHistory.in_force() only understand YYYY-MM-DD.
+            normalized = date.fromisoformat(value).isoformat()
+        except ValueError:
+            parser.error(f"--asof must be YYYY-MM-DD: {value!r}")
+        if normalized not in dates:
+            dates.append(normalized)
+    args.asof_dates = dates
+    args.asof = dates[0] if len(dates) == 1 else ""
+    if len(dates) > 1 and (args.catalog or args.incremental):
+        parser.error("Multiple --asof dates cannot be combined with --catalog or --incremental.")
+    return args
 
 
-def call_json(path: str, query: dict[str, Any], *, base_url: str, timeout: float) -> dict[str, Any]:
+def call_json(
+    path: str,
+    query: dict[str, Any],
+    *,
+    base_url: str,
+    timeout: float,
+    use_cache: bool = True,
+    rate_limiter: RateLimiter | None = None,
+) -> dict[str, Any]:
     response = request_endpoint(
         path=path,
         query=query,
         base_url=base_url,
         timeout=timeout,
         accept="application/json",
+        use_cache=use_cache,
+        rate_limiter=rate_limiter,
     )
     if response.status >= 400:
         body_text = decode_bytes(response.body)
@@ -104,41 +185,68 @@ def call_json(path: str, query: dict[str, Any], *, base_url: str, timeout: float
     return payload
 
 
-def extract_law_title(item: dict[str, Any]) -> str:
-    """Extract best-effort law title from one /laws item."""
-    revision_info = item.get("current_revision_info") or item.get("revision_info") or {}
-    title = revision_info.get("law_title")
-    if isinstance(title, str):
-        return title
-    return ""
+def extract_law_title(item: LawRecord) -> str:
+    """Extract best-effort law title from one /laws record."""
+    return item.law_title
 
 
-def select_best_match(laws: list[dict[str, Any]], query_title: str) -> dict[str, Any]:
+def select_best_match(laws: list[LawRecord], query_title: str) -> LawRecord | None:
     """Select best law match by exact-title preference."""
     if not laws:
-        return {}
-    exact = [law for law in laws if extract_law_title(law) == query_title]
-    if exact:
-        return exact[0]
-    prefixed = [law for law in laws if extract_law_title(law).startswith(query_title)]
-    if prefixed:
-        return prefixed[0]
-    contains = [law for law in laws if query_title in extract_law_title(law)]
-    if contains:
-        return contains[0]
+        return None
+    for matches in (
+        lambda title: title == query_title,
+        lambda title: title.startswith(query_title),
+        lambda title: query_title in title,
+    ):
+        for law in laws:
+            if matches(law.law_title):
+                return law
     return laws[0]
 
 
-def fetch_scope_evidence(scope: dict[str, str], *, asof: str, base_url: str, timeout: float) -> dict[str, Any]:
+def search_scope(
+    scope: dict[str, str],
+    *,
+    asof: str,
+    base_url: str,
+    timeout: float,
+    use_cache: bool = True,
+    rate_limiter: RateLimiter | None = None,
+) -> dict[str, Any]:
     query = {
         "law_title": scope["law_title"],
         "limit": 20,
         "response_format": "json",
         "asof": asof or None,
     }
-    search_result = call_json("/laws", query, base_url=base_url, timeout=timeout)
-    laws = search_result.get("laws") or []
-    if not laws:
+    return call_json(
+        "/laws", query, base_url=base_url, timeout=timeout, use_cache=use_cache, rate_limiter=rate_limiter
+    )
+
+
+def current_revision_id(search_result: dict[str, Any], query_title: str) -> str | None:
+    """Return the law_revision_id the scope would resolve to, or None if nothing matched."""
+    first = select_best_match(parse_laws(search_result), query_title)
+    revision = first.best_revision if first is not None else None
+    return revision.law_revision_id if revision is not None else None
+
+
+def fetch_scope_evidence(
+    scope: dict[str, str],
+    *,
+    asof: str,
+    base_url: str,
+    timeout: float,
+    search_result: dict[str, Any] | None = None,
+    rate_limiter: RateLimiter | None = None,
+) -> dict[str, Any]:
+    if search_result is None:
+        search_result = search_scope(
+            scope, asof=asof, base_url=base_url, timeout=timeout, rate_limiter=rate_limiter
+        )
+    first = select_best_match(parse_laws(search_result), scope["law_title"])
+    if first is None:
         return {
             "topic": scope["topic"],
             "law_title_query": scope["law_title"],
@@ -147,28 +255,21 @@ def fetch_scope_evidence(scope: dict[str, str], *, asof: str, base_url: str, tim
             "message": "No law matched the provided title query.",
         }
 
-    first = select_best_match(laws, scope["law_title"])
-    law_info = first.get("law_info") or {}
-    current_revision = first.get("current_revision_info") or first.get("revision_info") or {}
-    law_id = law_info.get("law_id")
-    law_num = law_info.get("law_num")
-    law_title = current_revision.get("law_title") or scope["law_title"]
-    law_revision_id = current_revision.get("law_revision_id")
-    updated = current_revision.get("updated")
-    amendment_enforcement_date = current_revision.get("amendment_enforcement_date")
-    amendment_law_title = current_revision.get("amendment_law_title")
-    amendment_law_num = current_revision.get("amendment_law_num")
+    current_revision = first.best_revision or RevisionRecord.from_dict({})
+    law_id = first.law_id
+    law_revision_id = current_revision.law_revision_id
 
     revisions: dict[str, Any] = {}
     article1: dict[str, Any] = {}
-    if isinstance(law_id, str) and law_id:
+    if law_id:
         revisions = call_json(
             f"/law_revisions/{parse.quote(law_id, safe='')}",
             {"response_format": "json"},
             base_url=base_url,
             timeout=timeout,
+            rate_limiter=rate_limiter,
         )
-    if isinstance(law_revision_id, str) and law_revision_id:
+    if law_revision_id:
         article1 = call_json(
             f"/law_data/{parse.quote(law_revision_id, safe='')}",
             {
@@ -179,6 +280,7 @@ def fetch_scope_evidence(scope: dict[str, str], *, asof: str, base_url: str, tim
             },
             base_url=base_url,
             timeout=timeout,
+            rate_limiter=rate_limiter,
         )
 
     return {
@@ -186,21 +288,44 @@ def fetch_scope_evidence(scope: dict[str, str], *, asof: str, base_url: str, tim
         "law_title_query": scope["law_title"],
         "why_to_check": scope["why_to_check"],
         "found": True,
-        "law_title": law_title,
-        "law_id": law_id,
-        "law_num": law_num,
+        "law_title": first.law_title or scope["law_title"],
+        "law_id": first.info.law_id,
+        "law_num": first.info.law_num,
         "law_revision_id": law_revision_id,
-        "updated": updated,
-        "amendment_enforcement_date": amendment_enforcement_date,
-        "amendment_law_title": amendment_law_title,
-        "amendment_law_num": amendment_law_num,
+        "updated": current_revision.updated,
+        "amendment_enforcement_date": current_revision.value("amendment_enforcement_date"),
+        "amendment_law_title": current_revision.amendment_law_title,
+        "amendment_law_num": current_revision.amendment_law_num,
         "laws_search_result": search_result,
         "law_revisions_result": revisions,
         "article1_result": article1,
     }
 
 
-def build_markdown(pack: dict[str, Any]) -> str:
+def build_markdown(pack: dict[str, Any], reused_sections: dict[str, list[str]] | None = None) -> str:
+    """Render the checklist; sections in reused_sections (keyed by topic) are copied verbatim."""
+    lines = render_preamble(pack)
+    lines.extend(render_coverage_table(pack["items"]))
+    changes = pack.get("changes")
+    if changes is not None:
+        lines.append("## Changes Since Previous Run")
+        changed = [change for change in changes if change["status"] != "unchanged"]
+        if not changed:
+            lines.append("- No scope changed; all sections reused from the previous pack.")
+        for change in changed:
+            lines.append(
+                f"- {change['topic']}: {change['status']} "
+                f"(`{change.get('previous_law_revision_id') or '-'}` -> `{change.get('law_revision_id') or '-'}`)"
+            )
+        lines.append("")
+    lines.append("## Per-Law Notes")
+    for item in pack["items"]:
+        section = (reused_sections or {}).get(item["topic"])
+        lines.extend(section if section is not None else render_item_section(item))
+    return "\n".join(lines)
+
+
+def render_preamble(pack: dict[str, Any]) -> list[str]:
     lines: list[str] = []
     lines.append("# iOS Legal Draft Evidence Pack")
     lines.append("")
@@ -232,10 +357,15 @@ def build_markdown(pack: dict[str, Any]) -> str:
     lines.append("3. Keep `law_id` and `law_revision_id` in your internal review notes.")
     lines.append("4. Request licensed legal review before publication.")
     lines.append("")
+    return lines
+
+
+def render_coverage_table(items: Iterable[dict[str, Any]]) -> list[str]:
+    lines: list[str] = []
     lines.append("## Coverage Summary")
     lines.append("| Topic | Law title | law_id | law_revision_id | Updated | Amendment enforcement date |")
     lines.append("| --- | --- | --- | --- | --- | --- |")
-    for item in pack["items"]:
+    for item in items:
         if not item.get("found"):
             lines.append(f"| {item['topic']} | (not found) | - | - | - | - |")
             continue
@@ -245,66 +375,508 @@ def build_markdown(pack: dict[str, Any]) -> str:
             f"{item.get('amendment_enforcement_date','')} |"
         )
     lines.append("")
-    lines.append("## Per-Law Notes")
-    for item in pack["items"]:
-        lines.append(f"### {item['topic']}")
-        lines.append(f"- Why to check: {item['why_to_check']}")
-        if not item.get("found"):
-            lines.append(f"- Result: {item.get('message', 'not found')}")
-            lines.append("")
+    return lines
+
+
+def render_item_section(item: dict[str, Any]) -> list[str]:
+    lines = [f"### {item['topic']}", f"- Why to check: {item['why_to_check']}"]
+    if not item.get("found"):
+        lines.append(f"- Result: {item.get('message', 'not found')}")
+        lines.append("")
+        return lines
+    lines.append(f"- Law title: `{item.get('law_title', '')}`")
+    lines.append(f"- Law num: `{item.get('law_num', '')}`")
+    lines.append(f"- law_id: `{item.get('law_id', '')}`")
+    lines.append(f"- law_revision_id: `{item.get('law_revision_id', '')}`")
+    lines.append(f"- updated: `{item.get('updated', '')}`")
+    lines.append(f"- amendment_enforcement_date: `{item.get('amendment_enforcement_date', '')}`")
+    lines.append(f"- amendment_law_title: `{item.get('amendment_law_title', '')}`")
+    lines.append(f"- amendment_law_num: `{item.get('amendment_law_num', '')}`")
+    lines.append("- Suggested next command:")
+    lines.append("```bash")
+    lines.append(
+        "egov-law law-data "
+        f"--law-id-or-num-or-revision-id {item.get('law_revision_id','')} "
+        "--elm 'MainProvision-Article[1]'"
+    )
+    lines.append("```")
+    lines.append("")
+    return lines
+
+
+def load_previous_pack(path: Path, *, base_url: str, asof: str) -> dict[str, Any] | None:
+    """Load the previous pack if it was built against the same base URL and asof."""
+    try:
+        pack = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(pack, dict) or pack.get("base_url") != base_url or pack.get("asof") != asof:
+        return None
+    return pack
+
+
+def split_item_sections(markdown: str) -> dict[str, list[str]]:
+    """Split the Per-Law Notes part of a previous checklist into sections keyed by topic."""
+    sections: dict[str, list[str]] = {}
+    _, found, notes = markdown.partition("\n## Per-Law Notes\n")
+    if not found:
+        return sections
+    current: list[str] | None = None
+    for line in notes.split("\n"):
+        if line.startswith("### "):
+            current = sections.setdefault(line[4:], [])
+        if current is not None:
+            current.append(line)
+    return sections
+
+
+def refresh_scope(
+    scope: dict[str, str],
+    previous: dict[str, Any] | None,
+    *,
+    asof: str,
+    base_url: str,
+    timeout: float,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Check one scope with a single uncached /laws call; refetch details only if its revision moved."""
+    search_result = search_scope(scope, asof=asof, base_url=base_url, timeout=timeout, use_cache=False)
+    revision_id = current_revision_id(search_result, scope["law_title"])
+    previous_revision_id = (previous or {}).get("law_revision_id")
+    change = {
+        "topic": scope["topic"],
+        "previous_law_revision_id": previous_revision_id,
+        "law_revision_id": revision_id,
+    }
+    if previous is not None and previous.get("found") == bool(revision_id) and previous_revision_id == revision_id:
+        return previous, {**change, "status": "unchanged"}
+    evidence = fetch_scope_evidence(
+        scope,
+        asof=asof,
+        base_url=base_url,
+        timeout=timeout,
+        search_result=search_result,
+    )
+    if previous is None:
+        status = "new"
+    elif not evidence.get("found"):
+        status = "not_found"
+    else:
+        status = "revised"
+    return evidence, {**change, "status": status}
+
+
+def _normalize_scope(raw: Any, position: int) -> dict[str, str]:
+    if not isinstance(raw, dict) or not isinstance(raw.get("law_title"), str) or not raw["law_title"].strip():
+        raise ValueError(f"Catalog entry {position} needs a non-empty law_title.")
+    return {
+        "topic": str(raw.get("topic") or raw["law_title"]),
+        "law_title": raw["law_title"].strip(),
+        "why_to_check": str(raw.get("why_to_check") or ""),
+    }
+
+
+def iter_catalog(path: Path) -> Iterator[dict[str, str]]:
+    """Yield scopes from a catalog file; .jsonl catalogs are read line by line."""
+    suffix = path.suffix.lower()
+    if suffix == ".jsonl":
+        with path.open(encoding="utf-8") as handle:
+            position = 0
+            for line in handle:
+                if line.strip():
+                    yield _normalize_scope(json.loads(line), position)
+                    position += 1
+        return
+    if suffix in {".yaml", ".yml"}:
+        try:
+            import yaml  # type: ignore[import-not-found]
+        except ImportError as exc:
+            raise ValueError("YAML catalogs require PyYAML (pip install pyyaml); or use JSON/JSONL.") from exc
+        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    else:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        data = data.get("scopes")
+    if not isinstance(data, list):
+        raise ValueError("Catalog must be a list of scopes or an object with a scopes list.")
+    for position, raw in enumerate(data):
+        yield _normalize_scope(raw, position)
+
+
+class ShardWriter:
+    """Append per-scope JSONL records and Markdown sections, rotating files every N scopes."""
+
+    def __init__(self, shard_dir: Path, scopes_per_shard: int) -> None:
+        self.shard_dir = shard_dir
+        self.scopes_per_shard = max(1, scopes_per_shard)
+        self.shards: list[str] = []
+        self._count = 0
+        self._records: Any = None
+        self._sections: Any = None
+        shard_dir.mkdir(parents=True, exist_ok=True)
+
+    def write(self, record: dict[str, Any]) -> tuple[str, int]:
+        if self._records is None or self._count % self.scopes_per_shard == 0:
+            self._rotate()
+        line = self._count % self.scopes_per_shard
+        self._records.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._sections.write("\n".join(render_item_section(record)) + "\n")
+        self._count += 1
+        return self.shards[-1], line
+
+    def _rotate(self) -> None:
+        self.close()
+        name = f"part-{len(self.shards):05d}"
+        self._records = (self.shard_dir / f"{name}.jsonl").open("w", encoding="utf-8")
+        self._sections = (self.shard_dir / f"{name}.md").open("w", encoding="utf-8")
+        self.shards.append(name)
+
+    def close(self) -> None:
+        for handle in (self._records, self._sections):
+            if handle is not None:
+                handle.close()
+        self._records = self._sections = None
+
+
+def _failed_record(position: int, scope: dict[str, str], exc: BaseException) -> dict[str, Any]:
+    return {
+        "position": position,
+        "retrieved_at_utc": datetime.now(timezone.utc).isoformat(),
+        "topic": scope["topic"],
+        "law_title_query": scope["law_title"],
+        "why_to_check": scope["why_to_check"],
+        "found": False,
+        "message": f"{type(exc).__name__}: {exc}",
+    }
+
+
+def _scope_record(
+    position: int, scope: dict[str, str], *, asof: str, base_url: str, timeout: float, rate_limiter: RateLimiter | None
+) -> dict[str, Any]:
+    try:
+        # Worker threads don't inherit the caller's context, so the catalog sets bulk priority here.
+        with use_priority(BULK):
+            evidence = fetch_scope_evidence(
+                scope, asof=asof, base_url=base_url, timeout=timeout, rate_limiter=rate_limiter
+            )
+    except Exception as exc:  # one failing scope must not stop the catalog
+        return _failed_record(position, scope, exc)
+    return {"position": position, "retrieved_at_utc": datetime.now(timezone.utc).isoformat(), **evidence}
+
+
+def run_catalog(args: argparse.Namespace, output_dir: Path, meta: dict[str, Any]) -> tuple[Path, Path]:
+    """Stream catalog scopes through a bounded worker pool into shards, then build the index.
+
+    At most 2 x concurrency scopes are in flight or waiting to be written.
+    Records are written in catalog order as soon as every earlier scope is
+    done, so shards, checklist, and index agree; only the small index rows are
+    kept until the end.
+    """
+    rate_limiter = RateLimiter(args.rate_per_minute) if args.rate_per_minute > 0 else None
+    writer = ShardWriter(output_dir / "shards", args.scopes_per_shard)
+    index_rows: list[dict[str, Any]] = []
+    max_in_flight = max(1, args.concurrency) * 2
+    scopes = iter_catalog(Path(args.catalog).expanduser())
+    submitted: dict[Future[dict[str, Any]], tuple[int, dict[str, str]]] = {}
+    ready: dict[int, dict[str, Any]] = {}
+    next_position = 0
+
+    def collect(done: Iterable[Future[dict[str, Any]]]) -> None:
+        nonlocal next_position
+        for future in done:
+            position, scope = submitted.pop(future)
+            try:
+                ready[position] = future.result()
+            except Exception as exc:  # one failing scope must not stop the catalog
+                ready[position] = _failed_record(position, scope, exc)
+        while next_position in ready:
+            record = ready.pop(next_position)
+            next_position += 1
+            shard, line = writer.write(record)
+            index_rows.append({key: record.get(key) for key in INDEX_FIELDS} | {"shard": shard, "line": line})
+            print(f"[{len(index_rows)}] {record['topic']}: {record.get('law_revision_id') or 'not found'}", file=sys.stderr)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            for position, scope in enumerate(scopes):
+                # Records finished out of order count against the bound until they can be written.
+                while submitted and len(submitted) + len(ready) >= max_in_flight:
+                    collect(wait(submitted, return_when=FIRST_COMPLETED).done)
+                future = pool.submit(
+                    _scope_record,
+                    position,
+                    scope,
+                    asof=args.asof,
+                    base_url=args.base_url,
+                    timeout=args.timeout,
+                    rate_limiter=rate_limiter,
+                )
+                submitted[future] = (position, scope)
+            while submitted:
+                collect(wait(submitted, return_when=FIRST_COMPLETED).done)
+    finally:
+        writer.close()
+
+    index_path = output_dir / "evidence_index.json"
+    index_path.write_text(
+        json.dumps(
+            {
+                **meta,
+                "catalog": str(args.catalog),
+                "scopes": len(index_rows),
+                "found": sum(1 for row in index_rows if row["found"]),
+                "shards": [f"shards/{name}.jsonl" for name in writer.shards],
+                "items": index_rows,
+            },
+            ensure_ascii=False,
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    md_path = output_dir / "evidence_checklist.md"
+    with md_path.open("w", encoding="utf-8") as out:
+        out.write("\n".join([*render_preamble(meta), *render_coverage_table(index_rows), "## Per-Law Notes"]))
+        out.write("\n")
+        for name in writer.shards:
+            with (output_dir / "shards" / f"{name}.md").open(encoding="utf-8") as section:
+                for line in section:
+                    out.write(line)
+    return index_path, md_path
+
+
+def resolve_revision(revisions: RevisionHistory, asof: str) -> RevisionRecord | None:
+    """Pick the revision in force on `asof`: the latest amendment_enforcement_date on or before it."""
+    return revisions.in_force(asof)
+
+
+def build_multi_date_items(
+    scope: dict[str, str],
+    dates: list[str],
+    articles: dict[str, dict[str, Any]],
+    *,
+    base_url: str,
+    timeout: float,
+) -> dict[str, dict[str, Any]]:
+    """Build one evidence item per date from a single /laws and /law_revisions lookup.
+
+    Article text is fetched once per distinct law_revision_id and shared through
+    `articles` across scopes and dates.
+    """
+    base = {"topic": scope["topic"], "law_title_query": scope["law_title"], "why_to_check": scope["why_to_check"]}
+    search_result = search_scope(scope, asof="", base_url=base_url, timeout=timeout)
+    law = select_best_match(parse_laws(search_result), scope["law_title"])
+    if law is None:
+        missing = {**base, "found": False, "message": "No law matched the provided title query."}
+        return {asof: dict(missing) for asof in dates}
+
+    law_id = law.info.law_id
+    revisions_result: dict[str, Any] = {}
+    if law_id:
+        revisions_result = call_json(
+            f"/law_revisions/{parse.quote(law_id, safe='')}",
+            {"response_format": "json"},
+            base_url=base_url,
+            timeout=timeout,
+        )
+    revisions = RevisionHistory.from_dict(revisions_result)
+
+    items: dict[str, dict[str, Any]] = {}
+    for asof in dates:
+        revision = resolve_revision(revisions, asof)
+        if revision is None:
+            items[asof] = {**base, "found": False, "law_id": law_id, "message": f"No revision in force on {asof}."}
             continue
-        lines.append(f"- Law title: `{item.get('law_title', '')}`")
-        lines.append(f"- Law num: `{item.get('law_num', '')}`")
-        lines.append(f"- law_id: `{item.get('law_id', '')}`")
-        lines.append(f"- law_revision_id: `{item.get('law_revision_id', '')}`")
-        lines.append(f"- updated: `{item.get('updated', '')}`")
-        lines.append(f"- amendment_enforcement_date: `{item.get('amendment_enforcement_date', '')}`")
-        lines.append(f"- amendment_law_title: `{item.get('amendment_law_title', '')}`")
-        lines.append(f"- amendment_law_num: `{item.get('amendment_law_num', '')}`")
-        lines.append("- Suggested next command:")
-        lines.append("```bash")
+        law_revision_id = revision.law_revision_id
+        if law_revision_id and law_revision_id not in articles:
+            articles[law_revision_id] = call_json(
+                f"/law_data/{parse.quote(law_revision_id, safe='')}",
+                {"response_format": "json", "law_full_text_format": "json", "elm": "MainProvision-Article[1]"},
+                base_url=base_url,
+                timeout=timeout,
+            )
+        items[asof] = {
+            **base,
+            "found": True,
+            "law_title": revision.law_title or scope["law_title"],
+            "law_id": law_id,
+            "law_num": law.info.law_num,
+            "law_revision_id": law_revision_id,
+            "updated": revision.updated,
+            "amendment_enforcement_date": revision.value("amendment_enforcement_date"),
+            "amendment_law_title": revision.amendment_law_title,
+            "amendment_law_num": revision.amendment_law_num,
+            "laws_search_result": search_result,
+            "law_revisions_result": revisions_result,
+            "article1_result": articles.get(law_revision_id or "", {}),
+        }
+    return items
+
+
+def build_comparison_markdown(comparison: dict[str, Any]) -> str:
+    dates = comparison["dates"]
+    lines = ["# Cross-Date Evidence Comparison", ""]
+    lines.append(f"- Generated at (UTC): `{comparison['generated_at_utc']}`")
+    lines.append(f"- Dates: {', '.join(f'`{value}`' for value in dates)}")
+    lines.append("")
+    lines.append(f"| Topic | Law title | {' | '.join(dates)} | Changed |")
+    lines.append(f"| --- | --- | {' | '.join('---' for _ in dates)} | --- |")
+    for row in comparison["rows"]:
+        cells = [row["revisions"][value] or "(not in force)" for value in dates]
         lines.append(
-            "egov-law law-data "
-            f"--law-id-or-num-or-revision-id {item.get('law_revision_id','')} "
-            "--elm 'MainProvision-Article[1]'"
+            f"| {row['topic']} | {row['law_title'] or '(not found)'} | {' | '.join(cells)} | "
+            f"{'yes' if row['changed'] else 'no'} |"
         )
-        lines.append("```")
-        lines.append("")
+    lines.append("")
     return "\n".join(lines)
 
 
+def run_multi_date(
+    args: argparse.Namespace, output_dir: Path, source_terms: dict[str, str]
+) -> list[Path]:
+    """Write one pack per --asof date plus asof_comparison.{json,md}."""
+    dates = args.asof_dates
+    articles: dict[str, dict[str, Any]] = {}
+    per_date: dict[str, list[dict[str, Any]]] = {asof: [] for asof in dates}
+    rows: list[dict[str, Any]] = []
+    for scope in LAW_SCOPES:
+        items = build_multi_date_items(scope, dates, articles, base_url=args.base_url, timeout=args.timeout)
+        revisions = {asof: items[asof].get("law_revision_id") for asof in dates}
+        rows.append(
+            {
+                "topic": scope["topic"],
+                "law_title": next((item.get("law_title") for item in items.values() if item.get("found")), None),
+                "law_id": next((item.get("law_id") for item in items.values() if item.get("law_id")), None),
+                "revisions": revisions,
+                "changed": len(set(revisions.values())) > 1,
+            }
+        )
+        for asof in dates:
+            per_date[asof].append(items[asof])
+
+    generated_at = datetime.now(timezone.utc).isoformat()
+    written: list[Path] = []
+    for asof in dates:
+        pack = {
+            "generated_at_utc": generated_at,
+            "base_url": args.base_url,
+            "asof": asof,
+            "source_terms": source_terms,
+            "items": per_date[asof],
+        }
+        date_dir = output_dir / f"asof-{asof}"
+        date_dir.mkdir(parents=True, exist_ok=True)
+        json_path = date_dir / "ios_legal_evidence_pack.json"
+        md_path = date_dir / "ios_legal_draft_checklist.md"
+        json_path.write_text(json.dumps(pack, ensure_ascii=False, indent=2), encoding="utf-8")
+        md_path.write_text(build_markdown(pack), encoding="utf-8")
+        written.extend([json_path, md_path])
+
+    comparison = {
+        "generated_at_utc": generated_at,
+        "base_url": args.base_url,
+        "dates": dates,
+        "distinct_revisions_fetched": len(articles),
+        "source_terms": source_terms,
+        "rows": rows,
+    }
+    comparison_json = output_dir / "asof_comparison.json"
+    comparison_md = output_dir / "asof_comparison.md"
+    comparison_json.write_text(json.dumps(comparison, ensure_ascii=False, indent=2), encoding="utf-8")
+    comparison_md.write_text(build_comparison_markdown(comparison), encoding="utf-8")
+    written.extend([comparison_json, comparison_md])
+    return written
+
+
 def main() -> int:
     args = parse_args()
     output_dir = Path(args.output_dir).expanduser()
     output_dir.mkdir(parents=True, exist_ok=True)
+    json_path = output_dir / "ios_legal_evidence_pack.json"
+    md_path = output_dir / "ios_legal_draft_checklist.md"
+    source_terms = {
+        "terms_url": E_GOV_TERMS_URL,
+        "attribution_template": ATTRIBUTION_TEMPLATE,
+        "edited_content_template": EDIT_NOTICE_TEMPLATE,
+        "disclaimer": DISCLAIMER_TEXT,
+    }
 
+    if len(args.asof_dates) > 1:
+        for path in run_multi_date(args, output_dir, source_terms):
+            print(str(path))
+        return 0
+
+    if args.catalog:
+        if args.incremental:
+            raise SystemExit("--incremental is not supported together with --catalog.")
+        meta = {
+            "generated_at_utc": datetime.now(timezone.utc).isoformat(),
+            "base_url": args.base_url,
+            "asof": args.asof,
+            "source_terms": source_terms,
+        }
+        try:
+            index_path, catalog_md_path = run_catalog(args, output_dir, meta)
+        except (OSError, ValueError) as exc:
+            print(str(exc), file=sys.stderr)
+            return 2
+        print(str(index_path))
+        print(str(catalog_md_path))
+        return 0
+
+    previous_pack = (
+        load_previous_pack(json_path, base_url=args.base_url, asof=args.asof) if args.incremental else None
+    )
     items: list[dict[str, Any]] = []
-    for scope in LAW_SCOPES:
-        evidence = fetch_scope_evidence(
-            scope,
-            asof=args.asof,
-            base_url=args.base_url,
-            timeout=args.timeout,
-        )
-        items.append(evidence)
+    changes: list[dict[str, Any]] | None = None
+    reused_sections: dict[str, list[str]] = {}
+    if previous_pack is None:
+        if args.incremental:
+            print("No compatible previous pack found; building a full pack.", file=sys.stderr)
+        for scope in LAW_SCOPES:
+            evidence = fetch_scope_evidence(
+                scope,
+                asof=args.asof,
+                base_url=args.base_url,
+                timeout=args.timeout,
+            )
+            items.append(evidence)
+    else:
+        previous_items = {
+            (item.get("topic"), item.get("law_title_query")): item for item in previous_pack.get("items") or []
+        }
+        try:
+            previous_sections = split_item_sections(md_path.read_text(encoding="utf-8"))
+        except OSError:
+            previous_sections = {}
+        changes = []
+        for scope in LAW_SCOPES:
+            evidence, change = refresh_scope(
+                scope,
+                previous_items.get((scope["topic"], scope["law_title"])),
+                asof=args.asof,
+                base_url=args.base_url,
+                timeout=args.timeout,
+            )
+            items.append(evidence)
+            changes.append(change)
+            if change["status"] == "unchanged" and scope["topic"] in previous_sections:
+                reused_sections[scope["topic"]] = previous_sections[scope["topic"]]
+            print(
+                f"{change['status']}: {scope['topic']} ({change['law_revision_id'] or 'not found'})",
+                file=sys.stderr,
+            )
 
     pack = {
         "generated_at_utc": datetime.now(timezone.utc).isoformat(),
         "base_url": args.base_url,
         "asof": args.asof,
-        "source_terms": {
-            "terms_url": E_GOV_TERMS_URL,
-            "attribution_template": ATTRIBUTION_TEMPLATE,
-            "edited_content_template": EDIT_NOTICE_TEMPLATE,
-            "disclaimer": DISCLAIMER_TEXT,
-        },
+        "source_terms": source_terms,
         "items": items,
     }
+    if changes is not None:
+        pack["changes"] = changes
 
-    json_path = output_dir / "ios_legal_evidence_pack.json"
-    md_path = output_dir / "ios_legal_draft_checklist.md"
     json_path.write_text(json.dumps(pack, ensure_ascii=False, indent=2), encoding="utf-8")
-    md_path.write_text(build_markdown(pack), encoding="utf-8")
+    md_path.write_text(build_markdown(pack, reused_sections), encoding="utf-8")
 
     print(str(json_path))
     print(str(md_path))
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Measure CLI / MCP entry-point startup time and check that heavy imports stay lazy.
+
+The lazy-import check is deterministic and decides the exit status: heavy
+modules (mcp, sqlite3, urllib.request, ...) must stay unloaded where they are
+not needed.
+
+Timings are reported for information, because wall-clock medians on shared
+machines vary by 2-3x between runs of the same tree. Pass --enforce-budgets to
+also fail when a scenario exceeds its budget (useful on a quiet machine).
+
+- Scenario time: each scenario runs in a fresh interpreter several times; the
+  figure is the median wall time minus the median of a bare `python -c pass`.
+  - cli-help: `egov-law --help`
+  - cli-cached: `egov-law search-law` answered from the shared SQLite cache
+    (the upstream URL is unreachable, so a cache miss fails the run)
+  - mcp-help: `egov-law-mcp --help`
+- Import time: `python -X importtime` for each entry module. It reports the
+  cumulative import time and the self time of this package's own modules, which
+  excludes the interpreter start and most of the noise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+UNREACHABLE_BASE_URL = "http://127.0.0.1:9/api/2"
+
+# Modules that must not be imported by the given statement.
+LAZY_IMPORTS = {
+    "import egov_law_api.cli": (
+        "mcp",
+        "multiprocessing",
+        "sqlite3",
+        "urllib.request",
+        "xml.etree.ElementTree",
+        "egov_law_api.export",
+        "egov_law_api.xref",
+        "egov_law_api.multi_search",
+    ),
+    "import egov_law_api.mcp_server": ("mcp", "multiprocessing", "tracemalloc", "urllib.request"),
+}
+
+# mcp-help: importing mcp_server costs about 45-60 ms here, two thirds of it
+# asyncio. That was already imported before the lazy-import work; FastMCP tool
+# functions are coroutines, so it cannot be deferred.
+DEFAULT_BUDGETS_MS = {"cli-help": 60.0, "cli-cached": 90.0, "mcp-help": 90.0}
+IMPORT_STATEMENTS = ("egov_law_api.cli", "egov_law_api.mcp_server")
+
+
+def _env(**extra: str) -> dict[str, str]:
+    env = dict(os.environ)
+    existing = env.get("PYTHONPATH", "")
+    env["PYTHONPATH"] = f"{SRC_DIR}{os.pathsep}{existing}" if existing else str(SRC_DIR)
+    for key in ("EGOV_LAW_TRACE_FILE", "EGOV_LAW_API_RECORD", "EGOV_LAW_API_REPLAY"):
+        env.pop(key, None)
+    env.update(extra)
+    return env
+
+
+def _time_runs(cmd: list[str], env: dict[str, str], runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        samples.append(time.perf_counter() - started)
+        if proc.returncode != 0:
+            raise SystemExit(f"Command failed ({proc.returncode}): {' '.join(cmd)}\n{proc.stderr.decode()}")
+    return statistics.median(samples) * 1000
+
+
+def _seed_shared_cache(path: Path) -> None:
+    """Store one /laws response so the cached scenario never touches the network."""
+    sys.path.insert(0, str(SRC_DIR))
+    from egov_law_api.api_client import build_url
+    from egov_law_api.cache_store import SharedCache
+
+    url = build_url(UNREACHABLE_BASE_URL, "/laws", {"law_title": "bench", "response_format": "json"})
+    body = json.dumps({"total_count": 1, "count": 1, "laws": [{"law_info": {"law_id": "bench"}}]}).encode()
+    store = SharedCache(path, ttl_seconds=3600, max_bytes=16 * 1024 * 1024)
+    store.put(url, "application/json, application/xml", 200, {"content-type": "application/json"}, body)
+
+
+def check_lazy_imports() -> list[str]:
+    problems = []
+    for statement, modules in LAZY_IMPORTS.items():
+        probe = f"import sys; {statement}; print(','.join(m for m in {modules!r} if m in sys.modules))"
+        out = subprocess.run(
+            [sys.executable, "-c", probe], env=_env(), capture_output=True, text=True, check=True
+        ).stdout.strip()
+        if out:
+            problems.append(f"`{statement}` loaded {out}")
+    return problems
+
+
+def measure_import_time(module: str, runs: int) -> dict[str, float]:
+    """Median cumulative import time of module, and of the package's own modules' self time, in ms."""
+    cumulative: list[float] = []
+    own: list[float] = []
+    for _ in range(runs):
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            env=_env(), capture_output=True, text=True, check=True,
+        ).stderr
+        total = package = 0
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+            if not self_us.isdigit():
+                continue
+            if name == module:
+                total = int(cumulative_us)
+            if name == "egov_law_api" or name.startswith("egov_law_api."):
+                package += int(self_us)
+        cumulative.append(total / 1000)
+        own.append(package / 1000)
+    return {"cumulative_ms": round(statistics.median(cumulative), 1), "package_self_ms": round(statistics.median(own), 1)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=9, help="Runs per scenario (default: 9).")
+    for name, budget in DEFAULT_BUDGETS_MS.items():
+        parser.add_argument(
+            f"--budget-{name}",
+            type=float,
+            default=budget,
+            help=f"Allowed startup overhead in ms for {name} (default: {budget:g}).",
+        )
+    parser.add_argument(
+        "--enforce-budgets",
+        action="store_true",
+        help="Also fail when a scenario exceeds its budget (default: timings are informational).",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="egov-law-bench-") as tmp:
+        cache_path = Path(tmp) / "responses.db"
+        _seed_shared_cache(cache_path)
+        py = sys.executable
+        scenarios = {
+            "cli-help": ([py, "-m", "egov_law_api.cli", "--help"], _env()),
+            "cli-cached": (
+                [py, "-m", "egov_law_api.cli", "search-law", "--law-title", "bench"],
+                _env(
+                    EGOV_LAW_API_BASE_URL=UNREACHABLE_BASE_URL,
+                    EGOV_LAW_API_SHARED_CACHE=str(cache_path),
+                    EGOV_LAW_API_TIMEOUT_SECONDS="1",
+                ),
+            ),
+            "mcp-help": ([py, "-m", "egov_law_api.mcp_server", "--help"], _env()),
+        }
+        baseline = _time_runs([py, "-c", "pass"], _env(), args.runs)
+        results = []
+        for name, (cmd, env) in scenarios.items():
+            total = _time_runs(cmd, env, args.runs)
+            overhead = total - baseline
+            budget = getattr(args, f"budget_{name.replace('-', '_')}")
+            results.append(
+                {
+                    "scenario": name,
+                    "median_ms": round(total, 1),
+                    "overhead_ms": round(overhead, 1),
+                    "budget_ms": budget,
+                    "ok": overhead <= budget,
+                }
+            )
+
+    imports = {module: measure_import_time(module, args.runs) for module in IMPORT_STATEMENTS}
+    problems = check_lazy_imports()
+    over_budget = [item["scenario"] for item in results if not item["ok"]]
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "baseline_ms": round(baseline, 1),
+                    "results": results,
+                    "import_time": imports,
+                    "lazy_import_problems": problems,
+                }
+            )
+        )
+    else:
+        print(f"python -c pass: {baseline:.1f} ms (subtracted below)")
+        for item in results:
+            status = "ok" if item["ok"] else "over budget"
+            print(
+                f"{item['scenario']:<11} {item['overhead_ms']:>7.1f} ms"
+                f" (budget {item['budget_ms']:g} ms, total {item['median_ms']:.1f} ms)  {status}"
+            )
+        for module, timing in imports.items():
+            print(
+                f"import {module}: {timing['cumulative_ms']:.1f} ms cumulative,"
+                f" {timing['package_self_ms']:.1f} ms in egov_law_api modules"
+            )
+        if over_budget and not args.enforce_budgets:
+            print("timings are informational; pass --enforce-budgets to fail on them")
+        for problem in problems:
+            print(f"lazy import regression: {problem}")
+    if problems:
+        return 1
+    return 1 if over_budget and args.enforce_budgets else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
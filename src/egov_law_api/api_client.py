@@ -2,15 +2,35 @@
 
 from __future__ import annotations
 
+import binascii
+import codecs
 import json
+import mmap
 import os
-from dataclasses import dataclass
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Iterable
-from urllib import error, parse, request
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, Sequence, Union
+from urllib import error, parse
+
+from . import recording
+from .cache_store import normalize_cache_key, shared_cache
+from .host_quota import host_quota
+from .scheduler import INTERACTIVE, current_priority, scheduler
+from .tracing import span
 
 DEFAULT_BASE_URL = os.environ.get("EGOV_LAW_API_BASE_URL", "https://laws.e-gov.go.jp/api/2")
 DEFAULT_TIMEOUT = float(os.environ.get("EGOV_LAW_API_TIMEOUT_SECONDS", "30"))
+CACHE_TTL_SECONDS = float(os.environ.get("EGOV_LAW_API_CACHE_TTL_SECONDS", "600"))
+NEGATIVE_CACHE_TTL_SECONDS = float(os.environ.get("EGOV_LAW_API_NEGATIVE_CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_BYTES = int(os.environ.get("EGOV_LAW_API_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+SPILL_THRESHOLD_BYTES = int(os.environ.get("EGOV_LAW_API_SPILL_THRESHOLD_BYTES", str(8 * 1024 * 1024)))
+MAX_RESPONSE_BYTES = int(os.environ.get("EGOV_LAW_API_MAX_RESPONSE_BYTES", str(512 * 1024 * 1024)))
+READ_CHUNK_BYTES = 1024 * 1024
+BASE64_CHUNK_CHARS = 4 * 256 * 1024
+MAX_FIELD_PATHS = 32
 E_GOV_TERMS_URL = "https://laws.e-gov.go.jp/terms/"
 E_GOV_ATTRIBUTION_TEMPLATE = "出典: e-Gov法令検索 (https://laws.e-gov.go.jp/) （YYYY年MM月DD日利用）"
 E_GOV_EDIT_NOTICE_TEMPLATE = "本資料は e-Gov法令検索の情報をもとに作成し、編集・加工しています。"
@@ -20,6 +40,15 @@ E_GOV_USAGE_NOTE = (
 )
 
 
+# Bodies above SPILL_THRESHOLD_BYTES are read into a temp file and exposed as a
+# read-only mmap, which supports len(), slicing, and the buffer protocol like bytes.
+ResponseBody = Union[bytes, mmap.mmap]
+
+
+class ResponseTooLargeError(ValueError):
+    """Raised when a response body exceeds MAX_RESPONSE_BYTES."""
+
+
 @dataclass(frozen=True)
 class ApiResponse:
     """HTTP response details returned from e-Gov API."""
@@ -27,7 +56,157 @@ class ApiResponse:
     url: str
     status: int
     headers: dict[str, str]
-    body: bytes
+    body: ResponseBody
+    from_cache: bool = False
+
+    @property
+    def spilled(self) -> bool:
+        return isinstance(self.body, mmap.mmap)
+
+
+# 408 and 429 are transient like 5xx and are never negative-cached.
+_UNCACHEABLE_4XX = frozenset({408, 429})
+_NEGATIVE_PROBE_MAX_BYTES = 64 * 1024
+_RESULT_LIST_KEYS = ("laws", "items", "revisions")
+
+
+def is_negative_response(response: ApiResponse) -> bool:
+    """Return True for deterministic misses: 4xx (except 408/429) or a 200 with an empty result set."""
+    if 400 <= response.status < 500:
+        return response.status not in _UNCACHEABLE_4XX
+    if response.status != 200 or response.spilled or len(response.body) > _NEGATIVE_PROBE_MAX_BYTES:
+        return False
+    if "application/json" not in response.headers.get("content-type", "").lower():
+        return False
+    try:
+        payload = json.loads(bytes(response.body))
+    except ValueError:
+        return False
+    if not isinstance(payload, dict):
+        return False
+    if payload.get("total_count") == 0:
+        return True
+    present = [payload[key] for key in _RESULT_LIST_KEYS if key in payload]
+    return bool(present) and all(value == [] for value in present)
+
+
+class ResponseCache:
+    """Thread-safe in-process LRU cache, bounded by TTL and total bytes.
+
+    Successful responses live for ttl_seconds. Deterministic misses (4xx and
+    empty result sets) live for the shorter negative_ttl_seconds; 5xx is never cached.
+    Keys are normalized URLs, so parameter order does not matter.
+    """
+
+    def __init__(self, ttl_seconds: float, max_bytes: int, negative_ttl_seconds: float = 0.0) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._bytes = 0
+        # key -> (expires_at, response, negative)
+        self._entries: OrderedDict[tuple[str, str], tuple[float, ApiResponse, bool]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_bytes > 0
+
+    def get(self, url: str, accept: str) -> ApiResponse | None:
+        key = (normalize_cache_key(url, accept), accept)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            _, response, negative = entry
+            if negative:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return replace(response, from_cache=True)
+
+    def put(self, response: ApiResponse, accept: str) -> None:
+        size = len(response.body)
+        if response.spilled or size > self.max_bytes // 4 or response.status >= 500:
+            return
+        negative = is_negative_response(response)
+        if negative:
+            ttl = self.negative_ttl_seconds
+        elif response.status == 200:
+            ttl = self.ttl_seconds
+        else:
+            return
+        if ttl <= 0:
+            return
+        key = (normalize_cache_key(response.url, accept), accept)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, response, negative)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+
+    def contains(self, url: str, accept: str) -> bool:
+        with self._lock:
+            entry = self._entries.get((normalize_cache_key(url, accept), accept))
+            return entry is not None and entry[0] >= time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "negative_ttl_seconds": self.negative_ttl_seconds,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+            }
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        _, response, _ = self._entries.pop(key)
+        self._bytes -= len(response.body)
+
+
+response_cache = ResponseCache(CACHE_TTL_SECONDS, CACHE_MAX_BYTES, NEGATIVE_CACHE_TTL_SECONDS)
+
+
+class RateLimiter:
+    """Thread-safe token bucket that blocks callers to stay under `per_minute` requests."""
+
+    def __init__(self, per_minute: float, *, burst: int = 1) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be > 0.")
+        self.interval = 60.0 / per_minute
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.interval
+            time.sleep(wait)
 
 
 def parse_query_items(items: Iterable[str]) -> dict[str, Any]:
@@ -62,16 +241,94 @@ def build_url(base_url: str, path: str, query: dict[str, Any] | None = None) ->
     return f"{full_path}?{parse.urlencode(filtered, doseq=True)}"
 
 
+def read_body(
+    stream: BinaryIO,
+    url: str,
+    headers: dict[str, str],
+    *,
+    spill_threshold: int = SPILL_THRESHOLD_BYTES,
+    max_bytes: int = MAX_RESPONSE_BYTES,
+) -> ResponseBody:
+    """Read a response body, spilling to a memory-mapped temp file above spill_threshold.
+
+    Raises ResponseTooLargeError as soon as the body (or its Content-Length)
+    exceeds max_bytes; `max_bytes <= 0` disables the limit.
+    """
+    declared = headers.get("content-length", "")
+    if max_bytes > 0 and declared.isdigit() and int(declared) > max_bytes:
+        raise ResponseTooLargeError(f"Response too large ({declared} bytes > {max_bytes}): {url}")
+    if spill_threshold <= 0:
+        if max_bytes <= 0:
+            return stream.read()
+        # Read in chunks so an oversized body fails at max_bytes instead of after being buffered.
+        chunks: list[bytes] = []
+        total = 0
+        while True:
+            chunk = stream.read(READ_CHUNK_BYTES)
+            if not chunk:
+                return b"".join(chunks)
+            total += len(chunk)
+            if total > max_bytes:
+                raise ResponseTooLargeError(f"Response too large (> {max_bytes} bytes): {url}")
+            chunks.append(chunk)
+    head = stream.read(spill_threshold + 1)
+    if max_bytes > 0 and len(head) > max_bytes:
+        raise ResponseTooLargeError(f"Response too large (> {max_bytes} bytes): {url}")
+    if len(head) <= spill_threshold:
+        return head
+    import tempfile
+
+    with tempfile.TemporaryFile(prefix="egov-law-") as spill:
+        spill.write(head)
+        total = len(head)
+        del head
+        while True:
+            chunk = stream.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            total += len(chunk)
+            if max_bytes > 0 and total > max_bytes:
+                raise ResponseTooLargeError(f"Response too large (> {max_bytes} bytes): {url}")
+            spill.write(chunk)
+        spill.flush()
+        return mmap.mmap(spill.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 def fetch(url: str, timeout: float, accept: str) -> ApiResponse:
-    """Fetch a URL and return status, headers, and body."""
-    req = request.Request(url, headers={"Accept": accept})
-    try:
-        with request.urlopen(req, timeout=timeout) as resp:
-            headers = {k.lower(): v for k, v in resp.headers.items()}
-            return ApiResponse(url=url, status=resp.status, headers=headers, body=resp.read())
-    except error.HTTPError as exc:
-        headers = {k.lower(): v for k, v in exc.headers.items()} if exc.headers else {}
-        return ApiResponse(url=url, status=exc.code, headers=headers, body=exc.read())
+    """Fetch a URL and return status, headers, and body.
+
+    In replay mode the response comes from the recording archive; in record
+    mode each network response is also appended to the archive.
+    """
+    recording.ensure_configured(DEFAULT_BASE_URL)
+    with span("http.fetch", url=url) as current:
+        if recording.replayer is not None:
+            status, headers, body = recording.replayer.respond(url, accept)
+            current.set(status=status, bytes=len(body), replayed=True)
+            return ApiResponse(url=url, status=status, headers=headers, body=body)
+        # urllib.request (http.client, email, ssl) is only imported once a network call is made.
+        from urllib import request
+
+        req = request.Request(url, headers={"Accept": accept})
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            with request.urlopen(req, timeout=timeout) as resp:
+                headers = {k.lower(): v for k, v in resp.headers.items()}
+                response = ApiResponse(url=url, status=resp.status, headers=headers, body=read_body(resp, url, headers))
+        except error.HTTPError as exc:
+            headers = {k.lower(): v for k, v in exc.headers.items()} if exc.headers else {}
+            response = ApiResponse(url=url, status=exc.code, headers=headers, body=read_body(exc, url, headers))
+        current.set(status=response.status, bytes=len(response.body), spilled=response.spilled)
+        if recording.recorder is not None:
+            recording.recorder.record(
+                url,
+                accept,
+                (response.status, response.headers, response.body),
+                started_at=started_at,
+                duration=time.perf_counter() - started,
+            )
+        return response
 
 
 def request_endpoint(
@@ -81,18 +338,143 @@ def request_endpoint(
     base_url: str = DEFAULT_BASE_URL,
     timeout: float = DEFAULT_TIMEOUT,
     accept: str = "application/json, application/xml",
+    use_cache: bool = True,
+    rate_limiter: RateLimiter | None = None,
+    priority: str | None = None,
 ) -> ApiResponse:
-    """Call e-Gov endpoint and return ApiResponse."""
+    """Call e-Gov endpoint and return ApiResponse.
+
+    Repeated calls are served from response_cache, then from the cross-process
+    shared_cache (when EGOV_LAW_API_SHARED_CACHE is set), before hitting the network.
+    Only network fetches wait on rate_limiter and the host-wide quota (when
+    EGOV_LAW_API_HOST_QUOTA_FILE is set). Requests that miss response_cache
+    take a scheduler slot at `priority` (default: the current use_priority()).
+    """
     url = build_url(base_url=base_url, path=path, query=query)
+    with span("http.request", endpoint=path) as current:
+        if not use_cache:
+            current.set(cache="off")
+            with scheduler.slot(priority):
+                response = _fetch_upstream(url, timeout, accept, rate_limiter, priority)
+        else:
+            cached = response_cache.get(url, accept) if response_cache.enabled else None
+            if cached is not None:
+                current.set(cache="hit")
+                response = cached
+            else:
+
+                def load() -> ApiResponse:
+                    shared = _shared_cache_get(url, accept)
+                    if shared is not None:
+                        current.set(cache="shared")
+                        loaded = ApiResponse(
+                            url=url, status=shared[0], headers=shared[1], body=shared[2], from_cache=True
+                        )
+                    else:
+                        current.set(cache="miss")
+                        loaded = _fetch_upstream(url, timeout, accept, rate_limiter, priority)
+                        _shared_cache_put(loaded, accept)
+                    if response_cache.enabled:
+                        response_cache.put(loaded, accept)
+                    return loaded
+
+                # The slot is taken before joining the single flight, so an
+                # interactive caller never waits behind a queued background leader.
+                with scheduler.slot(priority):
+                    response, joined = _in_flight.run((normalize_cache_key(url, accept), accept), load)
+                if joined:
+                    current.set(cache="joined")
+        current.set(status=response.status, bytes=len(response.body))
+        return response
+
+
+def _fetch_upstream(
+    url: str, timeout: float, accept: str, rate_limiter: RateLimiter | None, priority: str | None
+) -> ApiResponse:
+    """fetch() after the caller's rate_limiter and, outside replay, the host-wide quota."""
+    recording.ensure_configured(DEFAULT_BASE_URL)
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+    if host_quota is not None and recording.replayer is None:
+        with span("host_quota.wait"):
+            host_quota.acquire(background=(priority or current_priority()) != INTERACTIVE)
     return fetch(url=url, timeout=timeout, accept=accept)
 
 
-def decode_bytes(raw: bytes) -> str:
-    """Decode bytes payload as UTF-8 with replacement fallback."""
+class _InFlightCall:
+    __slots__ = ("done", "response", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: ApiResponse | None = None
+        self.error: BaseException | None = None
+
+
+class _InFlightRequests:
+    """Collapse concurrent identical requests into one upstream call (single flight)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[tuple[str, str], _InFlightCall] = {}
+
+    def run(self, key: tuple[str, str], load: Callable[[], ApiResponse]) -> tuple[ApiResponse, bool]:
+        """Return (response, joined); joined is True when another caller's fetch was reused."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _InFlightCall()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            assert call.response is not None
+            # Joiners did not reach upstream themselves; report it like a cache hit.
+            return replace(call.response, from_cache=True), True
+        try:
+            call.response = load()
+            return call.response, False
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+_in_flight = _InFlightRequests()
+
+
+def _shared_cache_get(url: str, accept: str) -> tuple[int, dict[str, str], bytes] | None:
+    if shared_cache is None or not shared_cache.enabled:
+        return None
+    import sqlite3
+
+    try:
+        return shared_cache.get(url, accept)
+    except sqlite3.Error:
+        return None
+
+
+def _shared_cache_put(response: ApiResponse, accept: str) -> None:
+    """Store a fetched response for other processes; cache failures never fail the request."""
+    if shared_cache is None or not shared_cache.enabled or response.spilled or is_negative_response(response):
+        return
+    import sqlite3
+
+    try:
+        shared_cache.put(response.url, accept, response.status, response.headers, response.body)
+    except sqlite3.Error:
+        pass
+
+
+def decode_bytes(raw: ResponseBody) -> str:
+    """Decode bytes payload (or a spilled mmap body) as UTF-8 with replacement fallback."""
     try:
-        return raw.decode("utf-8")
+        return str(raw, "utf-8")
     except UnicodeDecodeError:
-        return raw.decode("utf-8", errors="replace")
+        return str(raw, "utf-8", errors="replace")
 
 
 def parse_json_text(text: str) -> Any:
@@ -100,7 +482,7 @@ def parse_json_text(text: str) -> Any:
     return json.loads(text)
 
 
-def format_payload(body: bytes, headers: dict[str, str], *, raw: bool = False) -> str:
+def format_payload(body: ResponseBody, headers: dict[str, str], *, raw: bool = False) -> str:
     """Render payload as pretty JSON when possible."""
     text = decode_bytes(body)
     if raw:
@@ -114,6 +496,108 @@ def format_payload(body: bytes, headers: dict[str, str], *, raw: bool = False) -
     return text
 
 
+def full_text_is_base64(query: dict[str, Any]) -> bool:
+    """Return True when /law_data returns law_full_text Base64-encoded (formats differ)."""
+    full_text_format = query.get("law_full_text_format")
+    response_format = query.get("response_format") or "json"
+    return full_text_format is not None and full_text_format != response_format
+
+
+def iter_base64_decoded(encoded: str, chunk_chars: int = BASE64_CHUNK_CHARS) -> Iterator[bytes]:
+    """Decode Base64 text in fixed-size chunks without materializing the whole decoded payload."""
+    if any(char.isspace() for char in encoded[:256]):
+        encoded = "".join(encoded.split())
+    chunk_chars -= chunk_chars % 4
+    for start in range(0, len(encoded), chunk_chars):
+        try:
+            yield binascii.a2b_base64(encoded[start:start + chunk_chars])
+        except binascii.Error as exc:
+            raise ValueError(f"law_full_text is not valid Base64: {exc}") from exc
+
+
+def decode_base64_text(encoded: str) -> str:
+    """Decode Base64-encoded UTF-8 text incrementally."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts = [decoder.decode(chunk) for chunk in iter_base64_decoded(encoded)]
+    parts.append(decoder.decode(b"", final=True))
+    return "".join(parts)
+
+
+def write_base64_file(encoded: str, path: Path) -> int:
+    """Stream-decode Base64 text into path and return the number of bytes written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with path.open("wb") as handle:
+        for chunk in iter_base64_decoded(encoded):
+            handle.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def decode_full_text_field(payload: Any, *, output_path: str | None = None) -> Any:
+    """Replace a Base64 `law_full_text` with its decoded text, or with a file handle when output_path is set."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("law_full_text"), str):
+        return payload
+    encoded = payload["law_full_text"]
+    with span("decode.full_text", encoded_chars=len(encoded), to_file=bool(output_path)):
+        if output_path:
+            out_path = Path(output_path).expanduser()
+            written = write_base64_file(encoded, out_path)
+            payload["law_full_text"] = {"saved_to": str(out_path.resolve()), "bytes": written}
+        else:
+            payload["law_full_text"] = decode_base64_text(encoded)
+    return payload
+
+
+def parse_fields(spec: str | Sequence[str] | None) -> list[tuple[str, ...]]:
+    """Parse `laws.law_info.law_id,total_count` (or a list of paths) into key paths."""
+    if not spec:
+        return []
+    items = spec.split(",") if isinstance(spec, str) else list(spec)
+    paths: list[tuple[str, ...]] = []
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+        segments = tuple(segment.strip() for segment in item.split("."))
+        if not all(segments):
+            raise ValueError(f"Invalid field path: {item!r}")
+        paths.append(segments)
+    if len(paths) > MAX_FIELD_PATHS:
+        raise ValueError(f"fields accepts at most {MAX_FIELD_PATHS} paths.")
+    return paths
+
+
+def project_fields(value: Any, paths: list[tuple[str, ...]]) -> Any:
+    """Keep only the given key paths of a decoded JSON payload.
+
+    Lists are traversed transparently, so `laws.law_info.law_id` keeps
+    `law_info.law_id` of every element in `laws`. Missing keys are skipped.
+    """
+    if not paths:
+        return value
+    tree: dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        for segment in path[:-1]:
+            node = node.setdefault(segment, {})
+            if node is None:
+                break
+        else:
+            node[path[-1]] = None
+    return _project(value, tree)
+
+
+def _project(value: Any, tree: dict[str, Any] | None) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: _project(value[key], subtree) for key, subtree in tree.items() if key in value}
+    return value
+
+
 def bool_query(enabled: bool) -> str | None:
     """Convert bool to e-Gov API query string form."""
     return "true" if enabled else None
@@ -126,7 +610,7 @@ def resolve_binary_output(path: str | None, fallback: str) -> Path:
     return Path(fallback)
 
 
-def write_binary_output(path: str | None, fallback: str, payload: bytes) -> Path:
+def write_binary_output(path: str | None, fallback: str, payload: ResponseBody) -> Path:
     """Write binary payload to disk and return output path."""
     out_path = resolve_binary_output(path, fallback)
     out_path.parent.mkdir(parents=True, exist_ok=True)
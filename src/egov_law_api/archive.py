@@ -0,0 +1,273 @@
+"""Download every file of one law revision concurrently, deduplicated by content hash.
+
+archive_revision() reads attached_files_info from /law_data, then fetches the
+requested /law_file formats and every /attachment src on a thread pool. Bodies
+larger than the spill threshold stream through a temp file (see read_body), so
+memory stays bounded while the pool keeps the connection count up. Downloads
+run at bulk priority, so interactive requests are scheduled ahead of them.
+Identical bodies are written once; later copies point at the first in the manifest.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import Any, Sequence
+from urllib import parse
+
+from .api_client import (
+    DEFAULT_BASE_URL,
+    DEFAULT_TIMEOUT,
+    RateLimiter,
+    ResponseBody,
+    decode_bytes,
+    parse_json_text,
+    request_endpoint,
+    source_terms,
+)
+from .scheduler import BULK
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+LAW_FILE_TYPES = ("xml", "json", "html", "rtf", "docx")
+DEFAULT_FILE_TYPES = ("xml",)
+DEFAULT_WORKERS = 4
+MAX_ARCHIVE_FILES = 1000
+WRITE_CHUNK_BYTES = 1024 * 1024
+
+
+def _attachment_path(src: str) -> PurePosixPath:
+    """Map an attachment src such as ./pict/a.jpg to a safe relative path."""
+    parts = [part for part in PurePosixPath(src.replace("\\", "/")).parts if part not in ("", ".", "/")]
+    if not parts or ".." in parts:
+        raise ValueError(f"Unsafe attachment src: {src}")
+    return PurePosixPath("attachments", *parts)
+
+
+def _law_file_path(law_revision_id: str, file_type: str) -> PurePosixPath:
+    """Map a revision ID to law_file/<id>.<type>, refusing IDs that would leave that directory."""
+    if law_revision_id.strip(".") == "" or any(char in law_revision_id for char in "/\\\0"):
+        raise ValueError(f"Unsafe law_revision_id: {law_revision_id}")
+    return PurePosixPath("law_file", f"{law_revision_id}.{file_type}")
+
+
+def list_attachments(payload: Any) -> list[str]:
+    """Return the distinct attachment src values from a /law_data payload, in order."""
+    info = payload.get("attached_files_info") if isinstance(payload, dict) else None
+    files = info.get("attached_files") if isinstance(info, dict) else None
+    seen: dict[str, None] = {}
+    for item in files or []:
+        src = item.get("src") if isinstance(item, dict) else None
+        if isinstance(src, str) and src.strip():
+            seen.setdefault(src.strip(), None)
+    return list(seen)
+
+
+def _write_body(path: Path, body: ResponseBody) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.part")
+    view = memoryview(body)
+    with tmp.open("wb") as handle:
+        for offset in range(0, len(view), WRITE_CHUNK_BYTES):
+            handle.write(view[offset:offset + WRITE_CHUNK_BYTES])
+    os.replace(tmp, path)
+
+
+class _Store:
+    """Write each distinct body once and remember which path holds it."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._paths: dict[str, str] = {}
+
+    def save(self, relpath: PurePosixPath, body: ResponseBody) -> tuple[str, str | None]:
+        """Return (sha256, duplicate_of); the body is written only when it is new."""
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            first = self._paths.get(digest)
+            if first is None:
+                self._paths[digest] = str(relpath)
+        if first is not None:
+            return digest, first
+        try:
+            _write_body(self.root / relpath, body)
+        except OSError:
+            with self._lock:
+                self._paths.pop(digest, None)
+            raise
+        return digest, None
+
+
+Job = tuple[dict[str, Any], str, dict[str, Any], PurePosixPath]
+
+
+@dataclass
+class ArchivePlan:
+    """Downloads needed for one revision: (manifest entry, path, query, output relpath).
+
+    `rejected` holds manifest entries (with an error) for attachments whose src
+    cannot be stored safely; they are reported but never downloaded.
+    """
+
+    law_revision_id: str
+    file_types: list[str]
+    jobs: list[Job]
+    law_info: dict[str, Any] = field(default_factory=dict)
+    rejected: list[dict[str, Any]] = field(default_factory=list)
+
+
+def plan_archive(
+    law_revision_id: str,
+    *,
+    file_types: Sequence[str] = DEFAULT_FILE_TYPES,
+    attachments: bool = True,
+    rate_limiter: RateLimiter | None = None,
+    base_url: str = DEFAULT_BASE_URL,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> ArchivePlan:
+    """List the law files and attachments to fetch (one cached /law_data call)."""
+    types = list(dict.fromkeys(file_type.strip().lower() for file_type in file_types if file_type.strip()))
+    for file_type in types:
+        if file_type not in LAW_FILE_TYPES:
+            raise ValueError(f"file type must be one of {', '.join(LAW_FILE_TYPES)}: {file_type}")
+    revision_ref = parse.quote(law_revision_id, safe="")
+    plan = ArchivePlan(
+        law_revision_id,
+        types,
+        [
+            (
+                {"kind": "law_file", "file_type": file_type},
+                f"/law_file/{parse.quote(file_type, safe='')}/{revision_ref}",
+                {},
+                _law_file_path(law_revision_id, file_type),
+            )
+            for file_type in types
+        ],
+    )
+    if not attachments:
+        return plan
+    response = request_endpoint(
+        f"/law_data/{revision_ref}",
+        {"response_format": "json"},
+        base_url=base_url,
+        timeout=timeout,
+        rate_limiter=rate_limiter,
+    )
+    if response.status >= 400:
+        raise ValueError(f"HTTP {response.status} while listing attachments: {response.url}")
+    payload = parse_json_text(decode_bytes(response.body))
+    for src in list_attachments(payload):
+        entry = {"kind": "attachment", "src": src}
+        try:
+            plan.jobs.append((entry, f"/attachment/{revision_ref}", {"src": src}, _attachment_path(src)))
+        except ValueError as exc:
+            plan.rejected.append({**entry, "error": f"{type(exc).__name__}: {exc}"})
+    plan.law_info = {
+        "law_id": (payload.get("law_info") or {}).get("law_id", ""),
+        "law_title": (payload.get("revision_info") or {}).get("law_title", ""),
+    }
+    return plan
+
+
+def run_archive(
+    plan: ArchivePlan,
+    output_dir: Path,
+    *,
+    workers: int = DEFAULT_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+    base_url: str = DEFAULT_BASE_URL,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> dict[str, Any]:
+    """Download plan.jobs concurrently into output_dir and write output_dir/manifest.json.
+
+    Returns the manifest: one entry per file with url, status, path, bytes,
+    sha256 and duplicate_of (or error), plus totals.
+    """
+    started = time.perf_counter()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    store = _Store(output_dir)
+
+    def download(job: Job) -> dict[str, Any]:
+        entry, path, query, relpath = job
+        entry = dict(entry)
+        try:
+            response = request_endpoint(
+                path,
+                query,
+                base_url=base_url,
+                timeout=timeout,
+                accept="*/*",
+                use_cache=False,
+                rate_limiter=rate_limiter,
+                priority=BULK,
+            )
+            entry.update(url=response.url, status=response.status)
+            if response.status >= 400:
+                entry["error"] = f"HTTP {response.status}"
+                return entry
+            digest, duplicate_of = store.save(relpath, response.body)
+            entry.update(path=duplicate_of or str(relpath), bytes=len(response.body), sha256=digest)
+            if duplicate_of:
+                entry["duplicate_of"] = duplicate_of
+        except (OSError, ValueError) as exc:
+            entry["error"] = f"{type(exc).__name__}: {exc}"
+        return entry
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        files = list(pool.map(download, plan.jobs)) + plan.rejected
+
+    written = [item for item in files if "sha256" in item and "duplicate_of" not in item]
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "law_revision_id": plan.law_revision_id,
+        **plan.law_info,
+        "retrieved_at_utc": datetime.now(timezone.utc).isoformat(),
+        "file_types": plan.file_types,
+        "files": files,
+        "totals": {
+            "requested": len(files),
+            "written": len(written),
+            "duplicates": sum(1 for item in files if "duplicate_of" in item),
+            "failed": sum(1 for item in files if "error" in item),
+            "bytes_downloaded": sum(item.get("bytes", 0) for item in files),
+            "bytes_written": sum(item["bytes"] for item in written),
+        },
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "source_terms": source_terms(),
+    }
+    (output_dir / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifest
+
+
+def archive_revision(
+    law_revision_id: str,
+    output_dir: Path,
+    *,
+    file_types: Sequence[str] = DEFAULT_FILE_TYPES,
+    attachments: bool = True,
+    workers: int = DEFAULT_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+    base_url: str = DEFAULT_BASE_URL,
+    timeout: float = DEFAULT_TIMEOUT,
+    max_files: int = MAX_ARCHIVE_FILES,
+) -> dict[str, Any]:
+    """Plan and run an archive of one revision; see plan_archive and run_archive."""
+    plan = plan_archive(
+        law_revision_id,
+        file_types=file_types,
+        attachments=attachments,
+        rate_limiter=rate_limiter,
+        base_url=base_url,
+        timeout=timeout,
+    )
+    if len(plan.jobs) > max_files:
+        raise ValueError(f"Revision has {len(plan.jobs)} files to download; the limit is {max_files}.")
+    return run_archive(plan, output_dir, workers=workers, rate_limiter=rate_limiter, base_url=base_url, timeout=timeout)
@@ -0,0 +1,236 @@
+"""Article histories: how one provision read in every revision of a law.
+
+A history lists the law's revisions (/law_revisions, ordered by enforcement
+date), takes the element at one elm path from each revision, and collapses
+consecutive revisions with identical text into one version. The result is a
+short timeline: each distinct text once, with the date it took effect and
+the range of revisions that carried it.
+
+Revisions held in the article store (EGOV_LAW_API_ARTICLE_STORE) are read
+from it when the elm path is one of its stored chunks. The rest come from
+/law_data?elm=, fetched concurrently at bulk priority; each fetch still goes
+through the response cache, the scheduler, and any rate limiter, so the
+workers only overlap the waiting. A revision where the element does not exist (HTTP 400
+or 404) is recorded as an `absent` version.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Sequence
+from urllib import parse
+from xml.etree import ElementTree as ET
+
+from .api_client import (
+    DEFAULT_BASE_URL,
+    DEFAULT_TIMEOUT,
+    RateLimiter,
+    decode_bytes,
+    parse_json_text,
+    request_endpoint,
+)
+from .law_xml import element_text, json_tree_to_element, parse_base64_xml
+from .records import RevisionHistory, RevisionRecord, is_revision_id
+from .scheduler import BULK
+
+DEFAULT_WORKERS = 4
+# Statuses meaning "this revision has no element at elm" rather than a failure.
+ABSENT_STATUSES = frozenset([400, 404])
+
+
+def law_ref_of(law_ref: str) -> str:
+    """Law ID or number to list revisions for; a law_revision_id is reduced to its law ID."""
+    return law_ref.split("_", 1)[0] if is_revision_id(law_ref) else law_ref
+
+
+def ordered_revisions(payload: Any) -> tuple[RevisionHistory, list[RevisionRecord]]:
+    """Parse a /law_revisions payload; revisions oldest first, undated (unscheduled) ones last."""
+    history = RevisionHistory.from_dict(payload if isinstance(payload, dict) else {})
+    revisions = [revision for revision in history if revision.law_revision_id]
+    if not revisions:
+        raise ValueError(f"No revisions listed for {history.info.law_id or 'this law'}.")
+    revisions.sort(key=lambda revision: revision.amendment_enforcement_date <= 0)
+    return history, revisions
+
+
+def revision_window(
+    revisions: Sequence[RevisionRecord], max_revisions: int, until_revision_id: str = ""
+) -> tuple[list[RevisionRecord], int]:
+    """The last max_revisions revisions up to until_revision_id (default: all), and how many precede them."""
+    end = len(revisions)
+    if until_revision_id:
+        revision_ids = [revision.law_revision_id for revision in revisions]
+        if until_revision_id not in revision_ids:
+            raise ValueError(f"until_revision_id {until_revision_id!r} is not a revision of this law.")
+        end = revision_ids.index(until_revision_id) + 1
+    start = max(0, end - max_revisions)
+    return list(revisions[start:end]), start
+
+
+def element_query(law_revision_id: str, elm: str) -> tuple[str, dict[str, Any]]:
+    """/law_data path and query for one element of one revision (the URL egov_get_law_data uses)."""
+    path = f"/law_data/{parse.quote(law_revision_id, safe='')}"
+    return path, {"law_full_text_format": "json", "elm": elm, "response_format": "json"}
+
+
+def element_version(root: ET.Element) -> dict[str, str]:
+    """Title, caption, and readable text of one element (Article, Paragraph, Chapter, ...)."""
+    title = next((child for child in root if child.tag.endswith("Title")), None)
+    caption = next((child for child in root if child.tag.endswith("Caption")), None)
+    return {
+        "tag": root.tag,
+        "title": element_text(title) if title is not None else "",
+        "caption": element_text(caption) if caption is not None else "",
+        "text": element_text(root),
+    }
+
+
+def element_from_payload(payload: Any) -> dict[str, str]:
+    """element_version() of the element in a decoded /law_data?elm= JSON payload."""
+    full_text = payload.get("law_full_text") if isinstance(payload, dict) else None
+    if full_text is None:
+        raise ValueError("law_data response has no law_full_text.")
+    if isinstance(full_text, str):
+        root = ET.fromstring(full_text) if full_text.lstrip().startswith("<") else parse_base64_xml(full_text)
+    else:
+        root = json_tree_to_element(full_text)
+    return element_version(root)
+
+
+def stored_elements(law_revision_ids: Sequence[str], elm: str) -> dict[str, dict[str, str]]:
+    """Elements available from the article store without any upstream request."""
+    from .article_store import ARTICLE_STORE_PATH, ArticleStore
+
+    if not ARTICLE_STORE_PATH or not Path(ARTICLE_STORE_PATH).expanduser().exists():
+        return {}
+    store = ArticleStore(ARTICLE_STORE_PATH)
+    found: dict[str, dict[str, str]] = {}
+    try:
+        for law_revision_id in law_revision_ids:
+            if not store.has_revision(law_revision_id):
+                continue
+            data = store.chunk_at(law_revision_id, elm)
+            if data is not None:
+                found[law_revision_id] = element_version(ET.fromstring(data))
+    finally:
+        store.close()
+    return found
+
+
+def build_timeline(
+    history: RevisionHistory,
+    revisions: Sequence[RevisionRecord],
+    elm: str,
+    elements: dict[str, dict[str, str] | None],
+    sources: dict[str, int],
+    earlier: int = 0,
+) -> dict[str, Any]:
+    """Collapse consecutive revisions with the same element (None = absent) into versions.
+
+    `earlier` counts revisions before `revisions` that were left out; the
+    result then names the revision to pass as until_revision_id for them.
+    """
+    if all(elements.get(revision.law_revision_id) is None for revision in revisions):
+        raise ValueError(f"elm {elm!r} was not found in any of the {len(revisions)} revisions.")
+    versions: list[dict[str, Any]] = []
+    previous: dict[str, str] | None = None
+    for revision in revisions:
+        element = elements.get(revision.law_revision_id)
+        if versions and element == previous:
+            versions[-1]["last_revision_id"] = revision.law_revision_id
+            versions[-1]["revision_count"] += 1
+            continue
+        enforced = revision.value("amendment_enforcement_date")
+        if versions:
+            versions[-1]["enforced_until"] = enforced
+        version: dict[str, Any] = {
+            "version": len(versions) + 1,
+            "status": "absent" if element is None else "present",
+            "enforced_from": enforced,
+            "enforced_until": None,
+            "amendment_law_num": revision.amendment_law_num,
+            "amendment_law_title": revision.amendment_law_title,
+            "first_revision_id": revision.law_revision_id,
+            "last_revision_id": revision.law_revision_id,
+            "revision_count": 1,
+        }
+        if element is not None:
+            version.update({key: value for key, value in element.items() if value})
+        versions.append(version)
+        previous = element
+    latest = revisions[-1]
+    timeline = {
+        "law_id": history.info.law_id,
+        "law_title": latest.law_title,
+        "elm": elm,
+        "revision_count": len(revisions),
+        "version_count": len(versions),
+        "sources": sources,
+        "versions": versions,
+    }
+    if earlier:
+        # The first revision is repeated on the next page so its versions join up.
+        timeline["earlier_revision_count"] = earlier
+        timeline["next_until_revision_id"] = revisions[0].law_revision_id
+    return timeline
+
+
+def fetch_element(
+    law_revision_id: str,
+    elm: str,
+    *,
+    base_url: str = DEFAULT_BASE_URL,
+    timeout: float = DEFAULT_TIMEOUT,
+    rate_limiter: RateLimiter | None = None,
+    priority: str | None = None,
+) -> tuple[dict[str, str] | None, bool]:
+    """(element or None when absent, served from cache) for one revision via /law_data?elm=."""
+    path, query = element_query(law_revision_id, elm)
+    response = request_endpoint(
+        path, query, base_url=base_url, timeout=timeout, rate_limiter=rate_limiter, priority=priority
+    )
+    if response.status in ABSENT_STATUSES:
+        return None, response.from_cache
+    if response.status >= 400:
+        raise ValueError(f"HTTP {response.status} while fetching {elm} of {law_revision_id}: {response.url}")
+    return element_from_payload(parse_json_text(decode_bytes(response.body))), response.from_cache
+
+
+def load_article_history(
+    law_ref: str,
+    elm: str,
+    *,
+    workers: int = DEFAULT_WORKERS,
+    base_url: str = DEFAULT_BASE_URL,
+    timeout: float = DEFAULT_TIMEOUT,
+    rate_limiter: RateLimiter | None = None,
+) -> dict[str, Any]:
+    """Timeline of distinct versions of elm across every revision of a law."""
+    if not elm.strip():
+        raise ValueError("An elm path is required (for example MainProvision-Article[27]).")
+    response = request_endpoint(
+        f"/law_revisions/{parse.quote(law_ref_of(law_ref), safe='')}",
+        {"response_format": "json"},
+        base_url=base_url,
+        timeout=timeout,
+        rate_limiter=rate_limiter,
+    )
+    if response.status >= 400:
+        raise ValueError(f"HTTP {response.status} while listing revisions: {response.url}")
+    history, revisions = ordered_revisions(parse_json_text(decode_bytes(response.body)))
+    revision_ids = [revision.law_revision_id for revision in revisions]
+    elements: dict[str, dict[str, str] | None] = dict(stored_elements(revision_ids, elm))
+    sources = {"article_store": len(elements), "cache": 0, "upstream": 0}
+    missing = [revision_id for revision_id in revision_ids if revision_id not in elements]
+
+    def fetch(revision_id: str) -> tuple[dict[str, str] | None, bool]:
+        return fetch_element(
+            revision_id, elm, base_url=base_url, timeout=timeout, rate_limiter=rate_limiter, priority=BULK
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for revision_id, (element, cached) in zip(missing, pool.map(fetch, missing)):
+            elements[revision_id] = element
+            sources["cache" if cached else "upstream"] += 1
+    return build_timeline(history, revisions, elm, elements, sources)
@@ -0,0 +1,498 @@
+"""Content-addressed article store: each distinct article is stored once across revisions.
+
+A revision's law XML is split into chunks: every Article and bare
+Paragraph of the main and supplementary provisions, appendices, and other
+LawBody parts such as TOC. Each chunk is serialized, hashed (sha256), and
+stored zlib-compressed once, no matter how many revisions contain it. The
+revision itself keeps only a compressed skeleton (the XML with each chunk
+replaced by an empty <StoredChunk/> placeholder) and its ordered
+(path, hash) list, both compressed. Paths follow law_xml.iter_articles, for example
+`MainProvision-Chapter[2]-Article[15]` or `SupplProvision[3]-Article[1]`.
+
+Unchanged articles in consecutive revisions therefore cost nothing, the
+full XML of any stored revision can be rebuilt on demand, and comparing two
+revisions is a comparison of their hash lists.
+
+The database is SQLite in WAL mode (see cache_store), so several processes
+may read while one writes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Sequence
+from urllib import parse
+from xml.etree import ElementTree as ET
+
+from .api_client import (
+    DEFAULT_BASE_URL,
+    DEFAULT_TIMEOUT,
+    RateLimiter,
+    decode_bytes,
+    parse_json_text,
+    request_endpoint,
+)
+from .law_xml import STRUCTURE_TAGS, LawDocument, law_document_from_element, load_law_document
+from .records import RevisionHistory
+from .scheduler import BULK
+
+if TYPE_CHECKING:
+    import sqlite3
+
+ARTICLE_STORE_PATH = os.environ.get("EGOV_LAW_API_ARTICLE_STORE", "").strip()
+BUSY_TIMEOUT_MS = 5000
+COMPRESSION_LEVEL = 9
+PLACEHOLDER_TAG = "StoredChunk"
+DEFAULT_WORKERS = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL UNIQUE,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS revisions (
+    law_revision_id TEXT PRIMARY KEY,
+    law_id TEXT NOT NULL,
+    law_num TEXT NOT NULL,
+    law_title TEXT NOT NULL,
+    skeleton BLOB NOT NULL,
+    refs BLOB NOT NULL,
+    xml_size INTEGER NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS revisions_law_id ON revisions (law_id);
+"""
+
+Ref = tuple[str, str]
+
+
+def _serialize(elem: ET.Element) -> bytes:
+    """Serialize an element without its tail (the tail belongs to the parent's content)."""
+    tail, elem.tail = elem.tail, None
+    try:
+        return ET.tostring(elem, encoding="utf-8", xml_declaration=False)
+    finally:
+        elem.tail = tail
+
+
+def _segment(tag: str, num: str | None) -> str:
+    return f"{tag}[{num}]" if num else tag
+
+
+def _is_appendix(tag: str) -> bool:
+    return "Appdx" in tag
+
+
+def split_revision(law: ET.Element) -> tuple[bytes, list[tuple[str, str, bytes]]]:
+    """Split a <Law> element into (skeleton XML, [(path, sha256, chunk XML), ...]) in document order.
+
+    Chunks are Articles and bare Paragraphs (paths as in law_xml.iter_articles),
+    appendices anywhere in the provisions, and every other LawBody child such
+    as TOC or AppdxTable (indexed by position, for example `AppdxTable[2]`).
+    """
+    chunks: list[tuple[str, str, bytes]] = []
+
+    def placeholder(source: ET.Element, path: str) -> ET.Element:
+        data = _serialize(source)
+        digest = hashlib.sha256(data).hexdigest()
+        chunks.append((path, digest, data))
+        ref = ET.Element(PLACEHOLDER_TAG)
+        ref.tail = source.tail
+        return ref
+
+    def shallow(elem: ET.Element) -> ET.Element:
+        clone = ET.Element(elem.tag, elem.attrib)
+        clone.text, clone.tail = elem.text, elem.tail
+        return clone
+
+    def provision(elem: ET.Element, path: str) -> ET.Element:
+        clone = shallow(elem)
+        appendices: dict[str, int] = {}
+        for child in elem:
+            if child.tag in STRUCTURE_TAGS:
+                clone.append(provision(child, f"{path}-{_segment(child.tag, child.get('Num'))}"))
+            elif child.tag in ("Article", "Paragraph"):
+                clone.append(placeholder(child, f"{path}-{_segment(child.tag, child.get('Num'))}"))
+            elif _is_appendix(child.tag):
+                appendices[child.tag] = appendices.get(child.tag, 0) + 1
+                clone.append(placeholder(child, f"{path}-{_segment(child.tag, str(appendices[child.tag]))}"))
+            else:
+                clone.append(_copy(child))
+        return clone
+
+    skeleton = shallow(law)
+    for child in law:
+        if child.tag != "LawBody":
+            skeleton.append(_copy(child))
+            continue
+        body = shallow(child)
+        counts: dict[str, int] = {}
+        for part in child:
+            if part.tag == "LawTitle":
+                body.append(_copy(part))
+            elif part.tag == "MainProvision":
+                body.append(provision(part, "MainProvision"))
+            elif part.tag == "SupplProvision":
+                counts[part.tag] = counts.get(part.tag, 0) + 1
+                body.append(provision(part, _segment(part.tag, str(counts[part.tag]))))
+            else:
+                counts[part.tag] = counts.get(part.tag, 0) + 1
+                body.append(placeholder(part, _segment(part.tag, str(counts[part.tag]))))
+        skeleton.append(body)
+    return _serialize(skeleton), chunks
+
+
+def _copy(elem: ET.Element) -> ET.Element:
+    clone = ET.Element(elem.tag, elem.attrib)
+    clone.text, clone.tail = elem.text, elem.tail
+    clone.extend(_copy(child) for child in elem)
+    return clone
+
+
+def _rebuild(skeleton: ET.Element, chunks: Iterator[bytes]) -> None:
+    """Replace placeholders, in document order, with the next chunk."""
+    for index, child in enumerate(list(skeleton)):
+        if child.tag == PLACEHOLDER_TAG:
+            restored = ET.fromstring(next(chunks))
+            restored.tail = child.tail
+            skeleton[index] = restored
+        else:
+            _rebuild(child, chunks)
+
+
+@dataclass(frozen=True)
+class RevisionDiff:
+    """Article-level comparison of two stored revisions (paths in document order)."""
+
+    old_revision_id: str
+    new_revision_id: str
+    unchanged: int
+    changed: list[str]
+    added: list[str]
+    removed: list[str]
+    moved: list[tuple[str, str]]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "old_revision_id": self.old_revision_id,
+            "new_revision_id": self.new_revision_id,
+            "unchanged": self.unchanged,
+            "changed": self.changed,
+            "added": self.added,
+            "removed": self.removed,
+            "moved": [{"from": old, "to": new} for old, new in self.moved],
+        }
+
+
+class ArticleStore:
+    """SQLite store of deduplicated, compressed article chunks and per-revision hash lists."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path).expanduser()
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        import sqlite3
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        with self._init_lock:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+        conn.execute("PRAGMA synchronous = NORMAL")
+        self._local.conn = conn
+        return conn
+
+    def has_revision(self, law_revision_id: str) -> bool:
+        row = self._connect().execute(
+            "SELECT 1 FROM revisions WHERE law_revision_id = ?", (law_revision_id,)
+        ).fetchone()
+        return row is not None
+
+    def put_document(self, doc: LawDocument) -> dict[str, Any]:
+        """Store one revision; returns article count, new chunks, and bytes added."""
+        if not doc.law_revision_id:
+            raise ValueError("A law_revision_id is required to store a revision.")
+        skeleton, chunks = split_revision(doc.root)
+        xml_size = len(_serialize(doc.root))
+        conn = self._connect()
+        # Compress outside the write transaction, and only chunks not stored yet.
+        missing: dict[str, bytes] = {}
+        for _, digest, data in chunks:
+            if digest not in missing and self._chunk_id(digest) is None:
+                missing[digest] = data
+        packed_chunks = [
+            (digest, zlib.compress(data, COMPRESSION_LEVEL), len(data)) for digest, data in missing.items()
+        ]
+        packed_skeleton = zlib.compress(skeleton, COMPRESSION_LEVEL)
+        new_chunks = 0
+        stored = 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for digest, packed, size in packed_chunks:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO chunks (hash, data, size, stored_size) VALUES (?, ?, ?, ?)",
+                    (digest, packed, size, len(packed)),
+                )
+                if cursor.rowcount:
+                    new_chunks += 1
+                    stored += len(packed)
+            # Refs name chunks by row id: small integers compress far better than hashes.
+            ids: dict[str, int] = {}
+            for _, digest, _ in chunks:
+                if digest not in ids:
+                    ids[digest] = self._chunk_id(digest) or 0
+            refs = [[path, ids[digest]] for path, digest, _ in chunks]
+            packed_refs = zlib.compress(json.dumps(refs, separators=(",", ":")).encode(), COMPRESSION_LEVEL)
+            conn.execute(
+                "INSERT OR REPLACE INTO revisions"
+                " (law_revision_id, law_id, law_num, law_title, skeleton, refs, xml_size, stored_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    doc.law_revision_id,
+                    doc.law_id,
+                    doc.law_num,
+                    doc.law_title,
+                    packed_skeleton,
+                    packed_refs,
+                    xml_size,
+                    time.time(),
+                ),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return {
+            "law_revision_id": doc.law_revision_id,
+            "chunks": len(chunks),
+            "new_chunks": new_chunks,
+            "xml_bytes": xml_size,
+            "stored_bytes": stored + len(packed_skeleton) + len(packed_refs),
+        }
+
+    def _chunk_id(self, digest: str) -> int | None:
+        row = self._connect().execute("SELECT id FROM chunks WHERE hash = ?", (digest,)).fetchone()
+        return row[0] if row else None
+
+    def _refs(self, law_revision_id: str) -> list[tuple[str, int]]:
+        row = self._connect().execute(
+            "SELECT refs FROM revisions WHERE law_revision_id = ?", (law_revision_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(law_revision_id)
+        return [(path, chunk_id) for path, chunk_id in json.loads(zlib.decompress(row[0]))]
+
+    def refs(self, law_revision_id: str) -> list[Ref]:
+        """Ordered (path, sha256) list of a stored revision."""
+        refs = self._refs(law_revision_id)
+        ids = sorted({chunk_id for _, chunk_id in refs})
+        hashes: dict[int, str] = {}
+        conn = self._connect()
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            marks = ",".join("?" * len(batch))
+            hashes.update(conn.execute(f"SELECT id, hash FROM chunks WHERE id IN ({marks})", batch).fetchall())
+        return [(path, hashes[chunk_id]) for path, chunk_id in refs]
+
+    def chunk(self, digest: str) -> bytes:
+        """Decompressed XML of one chunk by sha256."""
+        row = self._connect().execute("SELECT data FROM chunks WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        return zlib.decompress(row[0])
+
+    def _chunk_by_id(self, chunk_id: int) -> bytes:
+        row = self._connect().execute("SELECT data FROM chunks WHERE id = ?", (chunk_id,)).fetchone()
+        if row is None:
+            raise KeyError(chunk_id)
+        return zlib.decompress(row[0])
+
+    def chunk_at(self, law_revision_id: str, path: str) -> bytes | None:
+        """XML of the chunk stored at path in a revision, or None when path is not a chunk there."""
+        for chunk_path, chunk_id in self._refs(law_revision_id):
+            if chunk_path == path:
+                return self._chunk_by_id(chunk_id)
+        return None
+
+    def revisions(self, law_id: str = "") -> list[dict[str, Any]]:
+        """Stored revisions (optionally of one law), without their contents."""
+        sql = "SELECT law_revision_id, law_id, law_title, xml_size, stored_at FROM revisions"
+        params: tuple[str, ...] = ()
+        if law_id:
+            sql += " WHERE law_id = ?"
+            params = (law_id,)
+        rows = self._connect().execute(sql + " ORDER BY law_id, law_revision_id", params).fetchall()
+        return [
+            {"law_revision_id": row[0], "law_id": row[1], "law_title": row[2], "xml_bytes": row[3], "stored_at": row[4]}
+            for row in rows
+        ]
+
+    def load_element(self, law_revision_id: str) -> ET.Element:
+        """Rebuild the <Law> element of a stored revision."""
+        row = self._connect().execute(
+            "SELECT skeleton FROM revisions WHERE law_revision_id = ?", (law_revision_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(law_revision_id)
+        root = ET.fromstring(zlib.decompress(row[0]))
+        loaded: dict[int, bytes] = {}
+
+        def chunks() -> Iterator[bytes]:
+            for _, chunk_id in self._refs(law_revision_id):
+                if chunk_id not in loaded:
+                    loaded[chunk_id] = self._chunk_by_id(chunk_id)
+                yield loaded[chunk_id]
+
+        _rebuild(root, chunks())
+        return root
+
+    def load_xml(self, law_revision_id: str) -> str:
+        return ET.tostring(self.load_element(law_revision_id), encoding="unicode")
+
+    def load_document(self, law_revision_id: str) -> LawDocument:
+        row = self._connect().execute(
+            "SELECT law_id FROM revisions WHERE law_revision_id = ?", (law_revision_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(law_revision_id)
+        return law_document_from_element(
+            self.load_element(law_revision_id), law_id=row[0], law_revision_id=law_revision_id
+        )
+
+    def diff(self, old_revision_id: str, new_revision_id: str) -> RevisionDiff:
+        """Compare two revisions by their chunk lists; no chunk is decompressed."""
+        old = dict(self._refs(old_revision_id))
+        new_refs = self._refs(new_revision_id)
+        new = dict(new_refs)
+        changed = [path for path, digest in new_refs if path in old and old[path] != digest]
+        added = [path for path, _ in new_refs if path not in old]
+        removed = [path for path in old if path not in new]
+        # A renumbered article keeps its chunk under a new path.
+        removed_by_chunk = {old[path]: path for path in removed}
+        moved = [(removed_by_chunk[new[path]], path) for path in added if new[path] in removed_by_chunk]
+        moved_from = {old_path for old_path, _ in moved}
+        moved_to = {new_path for _, new_path in moved}
+        return RevisionDiff(
+            old_revision_id=old_revision_id,
+            new_revision_id=new_revision_id,
+            unchanged=sum(1 for path, digest in new_refs if old.get(path) == digest),
+            changed=changed,
+            added=[path for path in added if path not in moved_to],
+            removed=[path for path in removed if path not in moved_from],
+            moved=moved,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        conn = self._connect()
+        revisions, laws, xml_bytes, skeleton_bytes, refs = conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT law_id), COALESCE(SUM(xml_size), 0),"
+            " COALESCE(SUM(LENGTH(skeleton)), 0), COALESCE(SUM(LENGTH(refs)), 0) FROM revisions"
+        ).fetchone()
+        chunks, chunk_bytes, chunk_stored = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM chunks"
+        ).fetchone()
+        stored = chunk_stored + skeleton_bytes + refs
+        files = (self.path, self.path.with_name(self.path.name + "-wal"))
+        return {
+            "path": str(self.path),
+            "laws": laws,
+            "revisions": revisions,
+            "chunks": chunks,
+            "xml_bytes": xml_bytes,
+            "unique_chunk_bytes": chunk_bytes,
+            "stored_bytes": stored,
+            "ratio": round(stored / xml_bytes, 4) if xml_bytes else 0.0,
+            "file_bytes": sum(path.stat().st_size for path in files if path.exists()),
+        }
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def ingest_files(store: ArticleStore, paths: Iterable[Path], *, replace: bool = False) -> list[dict[str, Any]]:
+    """Store mirrored law files (law_file XML or law_data JSON); revisions already stored are skipped."""
+    results = []
+    for path in paths:
+        try:
+            doc = load_law_document(path)
+            if not replace and doc.law_revision_id and store.has_revision(doc.law_revision_id):
+                results.append({"file": str(path), "law_revision_id": doc.law_revision_id, "skipped": True})
+                continue
+            results.append({"file": str(path), **store.put_document(doc)})
+        except (OSError, ValueError, ET.ParseError) as exc:
+            results.append({"file": str(path), "error": f"{type(exc).__name__}: {exc}"})
+    return results
+
+
+def pull_history(
+    store: ArticleStore,
+    law_id: str,
+    *,
+    workers: int = DEFAULT_WORKERS,
+    rate_limiter: RateLimiter | None = None,
+    base_url: str = DEFAULT_BASE_URL,
+    timeout: float = DEFAULT_TIMEOUT,
+    revision_ids: Sequence[str] | None = None,
+) -> list[dict[str, Any]]:
+    """Fetch /law_file/xml for every revision of law_id not yet stored, at bulk priority."""
+    response = request_endpoint(
+        f"/law_revisions/{parse.quote(law_id, safe='')}",
+        {"response_format": "json"},
+        base_url=base_url,
+        timeout=timeout,
+        rate_limiter=rate_limiter,
+    )
+    if response.status >= 400:
+        raise ValueError(f"HTTP {response.status} while listing revisions: {response.url}")
+    history = RevisionHistory.from_dict(parse_json_text(decode_bytes(response.body)))
+    wanted = [revision.law_revision_id for revision in history if revision.law_revision_id]
+    if revision_ids:
+        selected = set(revision_ids)
+        wanted = [revision_id for revision_id in wanted if revision_id in selected]
+
+    def pull(revision_id: str) -> dict[str, Any]:
+        if store.has_revision(revision_id):
+            return {"law_revision_id": revision_id, "skipped": True}
+        try:
+            fetched = request_endpoint(
+                f"/law_file/xml/{parse.quote(revision_id, safe='')}",
+                base_url=base_url,
+                timeout=timeout,
+                accept="application/xml",
+                use_cache=False,
+                rate_limiter=rate_limiter,
+                priority=BULK,
+            )
+            if fetched.status >= 400:
+                return {"law_revision_id": revision_id, "error": f"HTTP {fetched.status}"}
+            root = ET.fromstring(bytes(fetched.body))
+            doc = law_document_from_element(root, law_id=history.info.law_id or law_id, law_revision_id=revision_id)
+            return store.put_document(doc)
+        except (OSError, ValueError, ET.ParseError) as exc:
+            return {"law_revision_id": revision_id, "error": f"{type(exc).__name__}: {exc}"}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(pull, wanted))
@@ -0,0 +1,232 @@
+"""SQLite-backed response cache shared between CLI runs and MCP server processes.
+
+The database runs in WAL mode so any number of processes can read while one
+writes. Entries are keyed by a normalized request URL (query parameters sorted)
+plus the Accept header, expire after a TTL, and the oldest entries are evicted
+once the stored bodies exceed max_bytes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib import parse
+
+if TYPE_CHECKING:
+    import sqlite3
+
+SHARED_CACHE_PATH = os.environ.get("EGOV_LAW_API_SHARED_CACHE", "").strip()
+SHARED_CACHE_TTL_SECONDS = float(os.environ.get("EGOV_LAW_API_SHARED_CACHE_TTL_SECONDS", "86400"))
+SHARED_CACHE_MAX_BYTES = int(os.environ.get("EGOV_LAW_API_SHARED_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    accept TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at);
+CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at);
+"""
+
+# (status, headers, body) as stored; api_client wraps it back into an ApiResponse.
+CachedEntry = tuple[int, dict[str, str], bytes]
+
+
+def normalize_cache_key(url: str, accept: str) -> str:
+    """Sort query parameters so equivalent requests share one entry."""
+    parts = parse.urlsplit(url)
+    query = parse.urlencode(sorted(parse.parse_qsl(parts.query, keep_blank_values=True)))
+    normalized = parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+    return f"{accept}\n{normalized}"
+
+
+class SharedCache:
+    """Cross-process cache-aside store on SQLite (WAL, one connection per thread)."""
+
+    def __init__(self, path: str | Path, *, ttl_seconds: float, max_bytes: int) -> None:
+        self.path = Path(path).expanduser()
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_bytes > 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        # sqlite3 is only loaded once a shared cache is actually opened.
+        import sqlite3
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        with self._init_lock:
+            if not self._initialized:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+        conn.execute("PRAGMA synchronous = NORMAL")
+        self._local.conn = conn
+        return conn
+
+    def get(self, url: str, accept: str) -> CachedEntry | None:
+        row = self._connect().execute(
+            "SELECT status, headers, body FROM responses WHERE key = ? AND expires_at >= ?",
+            (normalize_cache_key(url, accept), time.time()),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0], json.loads(row[1]), bytes(row[2])
+
+    def put(self, url: str, accept: str, status: int, headers: dict[str, str], body: bytes) -> None:
+        size = len(body)
+        if status != 200 or size > self.max_bytes // 4:
+            return
+        import hashlib
+
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                """
+                INSERT INTO responses (key, url, accept, status, headers, body, size, sha256, stored_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    url = excluded.url, status = excluded.status, headers = excluded.headers,
+                    body = excluded.body, size = excluded.size, sha256 = excluded.sha256,
+                    stored_at = excluded.stored_at, expires_at = excluded.expires_at
+                """,
+                (
+                    normalize_cache_key(url, accept),
+                    url,
+                    accept,
+                    status,
+                    json.dumps(headers),
+                    bytes(body),
+                    size,
+                    hashlib.sha256(body).hexdigest(),
+                    now,
+                    now + self.ttl_seconds,
+                ),
+            )
+            self._evict(conn, self.max_bytes)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def contains(self, url: str, accept: str) -> bool:
+        row = self._connect().execute(
+            "SELECT 1 FROM responses WHERE key = ? AND expires_at >= ?",
+            (normalize_cache_key(url, accept), time.time()),
+        ).fetchone()
+        return row is not None
+
+    def _evict(self, conn: sqlite3.Connection, max_bytes: int) -> int:
+        """Delete oldest entries until the total size fits; run inside a write transaction."""
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        removed = 0
+        if total <= max_bytes:
+            return removed
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY stored_at").fetchall():
+            if total <= max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        entries, total, expired = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(expires_at < ?), 0) FROM responses",
+            (time.time(),),
+        ).fetchone()
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "expired": expired,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "file_bytes": sum(
+                candidate.stat().st_size
+                for candidate in (self.path, Path(f"{self.path}-wal"))
+                if candidate.exists()
+            ),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def prune(self, *, max_bytes: int | None = None, vacuum: bool = False) -> dict[str, int]:
+        """Drop expired entries, then evict down to max_bytes (default: the configured limit)."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            expired = conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),)).rowcount
+            evicted = self._evict(conn, self.max_bytes if max_bytes is None else max_bytes)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if vacuum:
+            conn.execute("VACUUM")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return {"expired": expired, "evicted": evicted}
+
+    def verify(self, *, repair: bool = False) -> dict[str, Any]:
+        """Run SQLite's integrity check and compare every body against its stored SHA-256."""
+        import hashlib
+
+        conn = self._connect()
+        integrity = [row[0] for row in conn.execute("PRAGMA integrity_check").fetchall()]
+        corrupt: list[str] = []
+        checked = 0
+        for key, body, size, digest in conn.execute("SELECT key, body, size, sha256 FROM responses"):
+            checked += 1
+            if len(body) != size or hashlib.sha256(body).hexdigest() != digest:
+                corrupt.append(key)
+        if repair and corrupt:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in corrupt])
+            conn.execute("COMMIT")
+        return {
+            "integrity": integrity,
+            "checked": checked,
+            "corrupt": len(corrupt),
+            "corrupt_urls": [key.split("\n", 1)[1] for key in corrupt[:20]],
+            "repaired": repair and bool(corrupt),
+            "ok": integrity == ["ok"] and not corrupt,
+        }
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM responses")
+
+
+shared_cache: SharedCache | None = (
+    SharedCache(SHARED_CACHE_PATH, ttl_seconds=SHARED_CACHE_TTL_SECONDS, max_bytes=SHARED_CACHE_MAX_BYTES)
+    if SHARED_CACHE_PATH
+    else None
+)
@@ -3,39 +3,81 @@
 from __future__ import annotations
 
 import argparse
+import json
 import sys
 from pathlib import Path
-from typing import Sequence
+from typing import Any, Callable, Sequence
 from urllib import error, parse
 
 from .api_client import (
     DEFAULT_BASE_URL,
     DEFAULT_TIMEOUT,
     bool_query,
+    decode_bytes,
+    decode_full_text_field,
     E_GOV_ATTRIBUTION_TEMPLATE,
     E_GOV_EDIT_NOTICE_TEMPLATE,
     E_GOV_TERMS_URL,
     E_GOV_USAGE_NOTE,
+    RateLimiter,
+    fetch,
     format_payload,
+    full_text_is_base64,
+    parse_fields,
+    parse_json_text,
     parse_query_items,
+    project_fields,
     request_endpoint,
     write_binary_output,
 )
-
-
-def _run_json_like(args: argparse.Namespace, path: str, query: dict[str, object]) -> int:
-    response = request_endpoint(
-        path=path,
-        query=query,
-        base_url=args.base_url,
-        timeout=args.timeout,
-        accept="application/json, application/xml",
-    )
-    if response.status >= 400:
-        print(f"HTTP {response.status}: {response.url}", file=sys.stderr)
-        print(format_payload(response.body, response.headers, raw=True))
-        return 1
-    print(format_payload(response.body, response.headers, raw=args.raw))
+from .cache_store import (
+    SHARED_CACHE_MAX_BYTES,
+    SHARED_CACHE_PATH,
+    SHARED_CACHE_TTL_SECONDS,
+    SharedCache,
+)
+from .recording import run_load, summarize_archive
+from .tracing import span
+
+
+def _run_json_like(
+    args: argparse.Namespace,
+    path: str,
+    query: dict[str, object],
+    transform: Callable[[Any], Any] | None = None,
+) -> int:
+    with span(f"cli.{args.command}", endpoint=path) as current:
+        response = request_endpoint(
+            path=path,
+            query=query,
+            base_url=args.base_url,
+            timeout=args.timeout,
+            accept="application/json, application/xml",
+        )
+        current.set(status=response.status)
+        if response.status >= 400:
+            print(f"HTTP {response.status}: {response.url}", file=sys.stderr)
+            print(format_payload(response.body, response.headers, raw=True))
+            return 1
+        fields = parse_fields(args.fields)
+        is_json = "application/json" in response.headers.get("content-type", "")
+        if is_json and (fields or (transform is not None and not args.raw)):
+            with span("decode"):
+                payload = parse_json_text(decode_bytes(response.body))
+                if transform is not None and not args.raw:
+                    payload = transform(payload)
+                payload = project_fields(payload, fields)
+            with span("serialize") as serialize:
+                if args.raw:
+                    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+                else:
+                    text = json.dumps(payload, ensure_ascii=False, indent=2)
+                serialize.set(bytes=len(text))
+        else:
+            with span("serialize") as serialize:
+                text = format_payload(response.body, response.headers, raw=args.raw)
+                serialize.set(bytes=len(text))
+        print(text)
     _print_source_notice()
     return 0
 
@@ -112,7 +154,12 @@ def command_law_data(args: argparse.Namespace) -> int:
         }
     )
     path = f"/law_data/{parse.quote(args.law_id_or_num_or_revision_id, safe='')}"
-    return _run_json_like(args, path, query)
+    transform = None
+    if full_text_is_base64(query) and args.response_format == "json":
+        def transform(payload: Any) -> Any:
+            return decode_full_text_field(payload, output_path=args.full_text_output)
+
+    return _run_json_like(args, path, query, transform)
 
 
 def command_law_file(args: argparse.Namespace) -> int:
@@ -162,6 +209,225 @@ def command_attachment(args: argparse.Namespace) -> int:
     return 0
 
 
+def command_export(args: argparse.Namespace) -> int:
+    from .export import export_corpus
+
+    summary = export_corpus(
+        Path(args.input_dir).expanduser(),
+        Path(args.output_dir).expanduser(),
+        fmt=args.format,
+        workers=args.workers,
+        rows_per_shard=args.rows_per_shard,
+        force=args.force,
+    )
+    print(json.dumps(summary.to_dict(), ensure_ascii=False, indent=2))
+    _print_source_notice()
+    return 1 if summary.files_failed else 0
+
+
+def command_outline(args: argparse.Namespace) -> int:
+    from .outline import load_outline, resolve_revision_id, select_outline
+
+    with span("cli.outline") as current:
+        law_revision_id = resolve_revision_id(
+            args.law_id_or_num_or_revision_id, args.asof or "", base_url=args.base_url, timeout=args.timeout
+        )
+        outline, source = load_outline(law_revision_id, base_url=args.base_url, timeout=args.timeout)
+        current.set(source=source)
+    outline = select_outline(
+        outline,
+        under=args.under or "",
+        articles=not args.no_articles,
+        include_suppl_provisions=args.include_suppl_provisions,
+    )
+    print(json.dumps({"source": source, **outline}, ensure_ascii=False, indent=2))
+    _print_source_notice()
+    return 0
+
+
+def command_article_history(args: argparse.Namespace) -> int:
+    from .article_history import load_article_history
+
+    with span("cli.article_history") as current:
+        result = load_article_history(
+            args.law_id_or_num,
+            args.elm,
+            workers=args.workers,
+            base_url=args.base_url,
+            timeout=args.timeout,
+            rate_limiter=RateLimiter(args.rate_per_minute, burst=args.workers) if args.rate_per_minute else None,
+        )
+        current.set(revisions=result["revision_count"], versions=result["version_count"])
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    _print_source_notice()
+    return 0
+
+
+def command_xref_build(args: argparse.Namespace) -> int:
+    from .xref import build_graph_from_mirror
+
+    graph = build_graph_from_mirror(Path(args.input_dir).expanduser(), workers=args.workers)
+    output = Path(args.output).expanduser()
+    graph.save(output)
+    print(json.dumps({"graph": str(output), **graph.stats}, ensure_ascii=False, indent=2))
+    _print_source_notice()
+    return 0
+
+
+def command_xref(args: argparse.Namespace) -> int:
+    from .xref import XrefGraph
+
+    graph = XrefGraph.load(Path(args.graph).expanduser())
+    result = graph.query(args.node, direction=args.direction, hops=args.hops, limit=args.limit)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    _print_source_notice()
+    return 0
+
+
+def command_multi_search(args: argparse.Namespace) -> int:
+    from .multi_search import multi_search
+
+    terms = list(args.term)
+    if args.terms_file:
+        terms.extend(Path(args.terms_file).expanduser().read_text(encoding="utf-8").splitlines())
+    result = multi_search(
+        Path(args.input_dir).expanduser(),
+        terms,
+        law_ids=args.law_id,
+        workers=args.workers,
+        context_chars=args.context_chars,
+        max_hits_per_term=args.max_hits,
+    )
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    _print_source_notice()
+    return 0
+
+
+def command_archive(args: argparse.Namespace) -> int:
+    from .archive import archive_revision
+
+    manifest = archive_revision(
+        args.law_revision_id,
+        Path(args.output_dir).expanduser(),
+        file_types=args.file_type or ["xml"],
+        attachments=not args.no_attachments,
+        workers=args.workers,
+        rate_limiter=RateLimiter(args.rate_per_minute, burst=args.workers) if args.rate_per_minute else None,
+        base_url=args.base_url,
+        timeout=args.timeout,
+    )
+    print(json.dumps({key: value for key, value in manifest.items() if key != "files"}, ensure_ascii=False, indent=2))
+    for item in manifest["files"]:
+        if "error" in item:
+            print(f"failed: {item.get('file_type') or item.get('src')}: {item['error']}", file=sys.stderr)
+    _print_source_notice()
+    return 1 if manifest["totals"]["failed"] else 0
+
+
+def command_article_store(args: argparse.Namespace) -> int:
+    from .article_store import ARTICLE_STORE_PATH, ArticleStore, ingest_files, pull_history
+
+    path = args.store or ARTICLE_STORE_PATH
+    if not path:
+        raise ValueError("No article store configured. Pass --store or set EGOV_LAW_API_ARTICLE_STORE.")
+    if args.action not in ("ingest", "pull") and not Path(path).expanduser().exists():
+        raise ValueError(f"Article store not found: {path}")
+    store = ArticleStore(path)
+    if args.action == "show":
+        if not args.law_revision_id:
+            raise ValueError("show requires --law-revision-id.")
+        if not store.has_revision(args.law_revision_id):
+            raise ValueError(f"Revision not stored: {args.law_revision_id}")
+        text = store.load_xml(args.law_revision_id)
+        if args.output:
+            output = Path(args.output).expanduser()
+            output.write_text(text, encoding="utf-8")
+            print(str(output))
+        else:
+            print(text)
+        _print_source_notice()
+        return 0
+    failed = 0
+    if args.action == "ingest":
+        if not args.input_dir:
+            raise ValueError("ingest requires --input-dir.")
+        from .export import iter_input_files
+
+        items = ingest_files(store, iter_input_files(Path(args.input_dir).expanduser()), replace=args.replace)
+        failed = sum(1 for item in items if "error" in item)
+        result: dict[str, Any] = {"revisions": items, "store": store.stats()}
+    elif args.action == "pull":
+        if not args.law_id:
+            raise ValueError("pull requires --law-id.")
+        items = pull_history(
+            store,
+            args.law_id,
+            workers=args.workers,
+            rate_limiter=RateLimiter(args.rate_per_minute, burst=args.workers) if args.rate_per_minute else None,
+            base_url=args.base_url,
+            timeout=args.timeout,
+        )
+        failed = sum(1 for item in items if "error" in item)
+        result = {"revisions": items, "store": store.stats()}
+    elif args.action == "diff":
+        if not args.old or not args.new:
+            raise ValueError("diff requires --old and --new revision ids.")
+        for revision_id in (args.old, args.new):
+            if not store.has_revision(revision_id):
+                raise ValueError(f"Revision not stored: {revision_id}")
+        result = store.diff(args.old, args.new).to_dict()
+    else:
+        result = {**store.stats(), "stored_revisions": store.revisions(args.law_id or "")}
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.action in ("ingest", "pull"):
+        _print_source_notice()
+    return 1 if failed else 0
+
+
+def command_cache(args: argparse.Namespace) -> int:
+    path = args.path or SHARED_CACHE_PATH
+    if not path:
+        raise ValueError("No shared cache configured. Pass --path or set EGOV_LAW_API_SHARED_CACHE.")
+    if not Path(path).expanduser().exists():
+        raise ValueError(f"Shared cache not found: {path}")
+    store = SharedCache(path, ttl_seconds=SHARED_CACHE_TTL_SECONDS, max_bytes=SHARED_CACHE_MAX_BYTES)
+    if args.action == "stats":
+        result = store.stats()
+    elif args.action == "prune":
+        result = {**store.prune(max_bytes=args.max_bytes, vacuum=args.vacuum), **store.stats()}
+    else:
+        result = store.verify(repair=args.repair)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0 if result.get("ok", True) else 1
+
+
+def command_quota(args: argparse.Namespace) -> int:
+    from .host_quota import host_quota
+
+    if host_quota is None:
+        raise ValueError("No host-wide quota configured. Set EGOV_LAW_API_HOST_QUOTA_FILE (POSIX only).")
+    print(json.dumps(host_quota.status(), ensure_ascii=False, indent=2))
+    return 0
+
+
+def command_recording(args: argparse.Namespace) -> int:
+    if not Path(args.archive).expanduser().exists():
+        raise ValueError(f"Recording not found: {args.archive}")
+    if args.action == "info":
+        result = summarize_archive(args.archive)
+    else:
+        result = run_load(
+            args.archive,
+            lambda url, accept: fetch(url=url, timeout=args.timeout, accept=accept).status,
+            target_base=args.base_url,
+            speed=args.speed,
+            workers=args.workers,
+            limit=args.limit,
+        )
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
 def add_common_options(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--base-url",
@@ -183,9 +449,175 @@ def add_common_options(parser: argparse.ArgumentParser) -> None:
     )
 
 
+def add_fields_option(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--fields",
+        metavar="PATH[,PATH...]",
+        help=(
+            "Keep only these dot paths of the JSON payload; lists are traversed "
+            "(e.g. laws.law_info.law_id,laws.revision_info.law_title)."
+        ),
+    )
+
+
+class _LazyParser(argparse.ArgumentParser):
+    """Subcommand parser whose arguments are added on first use.
+
+    `configure` may import the modules that define choices and defaults, so
+    those load only when that subcommand is parsed or its help is shown.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        configure: Callable[[argparse.ArgumentParser], None] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._configure = configure
+
+    def _ensure_configured(self) -> None:
+        if self._configure is not None:
+            configure, self._configure = self._configure, None
+            configure(self)
+
+    def parse_known_args(self, args: Any = None, namespace: Any = None) -> Any:
+        self._ensure_configured()
+        return super().parse_known_args(args, namespace)
+
+    def format_help(self) -> str:
+        self._ensure_configured()
+        return super().format_help()
+
+
+def add_export_arguments(parser: argparse.ArgumentParser) -> None:
+    from .export import DEFAULT_ROWS_PER_SHARD, EXPORT_FORMATS
+
+    parser.add_argument("--input-dir", required=True, help="Directory of mirrored law files (*.xml, *.json).")
+    parser.add_argument("--output-dir", required=True, help="Directory for shards and _manifest.json.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument(
+        "--rows-per-shard",
+        type=int,
+        default=DEFAULT_ROWS_PER_SHARD,
+        help=f"Article rows per shard before rotating (default: {DEFAULT_ROWS_PER_SHARD}).",
+    )
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest and convert every file.")
+
+
+def add_xref_arguments(parser: argparse.ArgumentParser) -> None:
+    from .xref import DIRECTIONS, MAX_HOPS
+
+    parser.add_argument("--graph", required=True, help="Graph file built by xref-build.")
+    parser.add_argument("--node", required=True, help="LAW_ID:ARTICLE_NUM, for example 415AC0000000057:27")
+    parser.add_argument(
+        "--direction",
+        choices=DIRECTIONS,
+        default="out",
+        help="out: articles this one cites, in: articles citing this one, both: either.",
+    )
+    parser.add_argument("--hops", type=int, default=1, help=f"Neighborhood radius (1-{MAX_HOPS}).")
+    parser.add_argument("--limit", type=int, default=100)
+
+
+def add_multi_search_arguments(parser: argparse.ArgumentParser) -> None:
+    from .multi_search import DEFAULT_CONTEXT_CHARS, DEFAULT_MAX_HITS_PER_TERM
+
+    parser.add_argument("--input-dir", required=True, help="Directory of mirrored law files (*.xml, *.json).")
+    parser.add_argument("--term", action="append", default=[], help="Search term. Repeat for multiple terms.")
+    parser.add_argument("--terms-file", help="UTF-8 file with one term per line.")
+    parser.add_argument("--law-id", action="append", default=[], help="Only scan this law. Repeatable.")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count).")
+    parser.add_argument("--context-chars", type=int, default=DEFAULT_CONTEXT_CHARS)
+    parser.add_argument(
+        "--max-hits",
+        type=int,
+        default=DEFAULT_MAX_HITS_PER_TERM,
+        help=f"Hits listed per term; totals still count every match (default: {DEFAULT_MAX_HITS_PER_TERM}).",
+    )
+
+
+def add_article_history_arguments(parser: argparse.ArgumentParser) -> None:
+    from .article_history import DEFAULT_WORKERS
+
+    parser.add_argument("--law-id-or-num", required=True, help="Law ID or number (a revision ID selects its law).")
+    parser.add_argument("--elm", required=True, help="Element path, for example MainProvision-Article[27].")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Revisions fetched concurrently (default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument("--rate-per-minute", type=float, help="Cap upstream requests per minute.")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"API base URL (default: {DEFAULT_BASE_URL})")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Timeout in seconds (default: {DEFAULT_TIMEOUT})",
+    )
+
+
+def add_archive_arguments(parser: argparse.ArgumentParser) -> None:
+    from .archive import DEFAULT_WORKERS, LAW_FILE_TYPES
+
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"API base URL (default: {DEFAULT_BASE_URL})")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Timeout in seconds (default: {DEFAULT_TIMEOUT})",
+    )
+    parser.add_argument("--law-revision-id", required=True)
+    parser.add_argument("--output-dir", required=True, help="Directory for files and manifest.json.")
+    parser.add_argument(
+        "--file-type",
+        action="append",
+        choices=LAW_FILE_TYPES,
+        help="Law file format to download. Repeat for several (default: xml).",
+    )
+    parser.add_argument("--no-attachments", action="store_true", help="Skip /attachment downloads.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent downloads (default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument("--rate-per-minute", type=float, help="Cap upstream requests per minute.")
+
+
+def add_article_store_arguments(parser: argparse.ArgumentParser) -> None:
+    from .article_store import DEFAULT_WORKERS
+
+    parser.add_argument("action", choices=("ingest", "pull", "show", "diff", "stats"))
+    parser.add_argument("--store", help="Store database (default: EGOV_LAW_API_ARTICLE_STORE).")
+    parser.add_argument("--input-dir", help="ingest: directory of mirrored law files (*.xml, *.json).")
+    parser.add_argument("--replace", action="store_true", help="ingest: re-store revisions already present.")
+    parser.add_argument("--law-id", help="pull: law whose revisions to fetch; stats: list only this law.")
+    parser.add_argument("--law-revision-id", help="show: revision to rebuild.")
+    parser.add_argument("--output", help="show: write the XML here instead of stdout.")
+    parser.add_argument("--old", help="diff: older law_revision_id.")
+    parser.add_argument("--new", help="diff: newer law_revision_id.")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"API base URL (default: {DEFAULT_BASE_URL})")
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Timeout in seconds (default: {DEFAULT_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"pull: concurrent downloads (default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument("--rate-per-minute", type=float, help="pull: cap upstream requests per minute.")
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="CLI for e-Gov Law API v2")
-    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers = parser.add_subparsers(dest="command", required=True, parser_class=_LazyParser)
 
     search_law = subparsers.add_parser("search-law", help="Call /laws")
     add_common_options(search_law)
@@ -198,6 +630,7 @@ def build_parser() -> argparse.ArgumentParser:
     search_law.add_argument("--order")
     search_law.add_argument("--response-format", choices=("json", "xml"), default="json")
     search_law.add_argument("--raw", action="store_true", help="Print without JSON pretty-format.")
+    add_fields_option(search_law)
     search_law.set_defaults(func=command_search_law)
 
     keyword = subparsers.add_parser("keyword", help="Call /keyword")
@@ -211,6 +644,7 @@ def build_parser() -> argparse.ArgumentParser:
     keyword.add_argument("--order")
     keyword.add_argument("--response-format", choices=("json", "xml"), default="json")
     keyword.add_argument("--raw", action="store_true", help="Print without JSON pretty-format.")
+    add_fields_option(keyword)
     keyword.set_defaults(func=command_keyword)
 
     revisions = subparsers.add_parser("revisions", help="Call /law_revisions/{law_id_or_num}")
@@ -220,6 +654,7 @@ def build_parser() -> argparse.ArgumentParser:
     revisions.add_argument("--amendment-law-title")
     revisions.add_argument("--response-format", choices=("json", "xml"), default="json")
     revisions.add_argument("--raw", action="store_true", help="Print without JSON pretty-format.")
+    add_fields_option(revisions)
     revisions.set_defaults(func=command_revisions)
 
     law_data = subparsers.add_parser("law-data", help="Call /law_data/{id_or_num_or_revision_id}")
@@ -232,6 +667,14 @@ def build_parser() -> argparse.ArgumentParser:
     law_data.add_argument("--include-attached-file-content", action="store_true")
     law_data.add_argument("--response-format", choices=("json", "xml"), default="json")
     law_data.add_argument("--raw", action="store_true", help="Print without JSON pretty-format.")
+    add_fields_option(law_data)
+    law_data.add_argument(
+        "--full-text-output",
+        help=(
+            "When --law-full-text-format differs from --response-format, stream the decoded "
+            "Base64 law_full_text to this file instead of printing it inline."
+        ),
+    )
     law_data.set_defaults(func=command_law_data)
 
     law_file = subparsers.add_parser("law-file", help="Call /law_file/{file_type}/{id_or_num_or_revision_id}")
@@ -249,6 +692,117 @@ def build_parser() -> argparse.ArgumentParser:
     attachment.add_argument("--output", help="Output file path.")
     attachment.set_defaults(func=command_attachment)
 
+    export = subparsers.add_parser(
+        "export",
+        help="Convert mirrored law XML/JSON files into law/article/paragraph table shards",
+        configure=add_export_arguments,
+    )
+    export.set_defaults(func=command_export)
+
+    outline = subparsers.add_parser(
+        "outline",
+        help="Print a law's Part/Chapter/Section/Article hierarchy with elm paths (cached per revision)",
+    )
+    outline.add_argument("--law-id-or-num-or-revision-id", required=True)
+    outline.add_argument("--asof", help="Use the revision in force on this date (YYYY-MM-DD; default: today).")
+    outline.add_argument("--under", metavar="ELM", help="Only the subtree at this elm (e.g. MainProvision-Chapter[2]).")
+    outline.add_argument("--no-articles", action="store_true", help="Structure nodes and article counts only.")
+    outline.add_argument(
+        "--include-suppl-provisions",
+        action="store_true",
+        help="List the articles of supplementary provisions too (default: labels and counts only).",
+    )
+    outline.add_argument("--base-url", default=DEFAULT_BASE_URL, help=f"API base URL (default: {DEFAULT_BASE_URL})")
+    outline.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Timeout in seconds (default: {DEFAULT_TIMEOUT})",
+    )
+    outline.set_defaults(func=command_outline)
+
+    article_history = subparsers.add_parser(
+        "article-history",
+        help="Show how one provision read across all revisions of a law, as distinct versions",
+        configure=add_article_history_arguments,
+    )
+    article_history.set_defaults(func=command_article_history)
+
+    xref_build = subparsers.add_parser(
+        "xref-build",
+        help="Build an article cross-reference graph from mirrored law files",
+    )
+    xref_build.add_argument("--input-dir", required=True, help="Directory of mirrored law files (*.xml, *.json).")
+    xref_build.add_argument("--output", required=True, help="Graph file path (for example xref.graph).")
+    xref_build.add_argument("--workers", type=int, help="Worker processes (default: CPU count).")
+    xref_build.set_defaults(func=command_xref_build)
+
+    xref = subparsers.add_parser(
+        "xref",
+        help="Query an article cross-reference graph",
+        configure=add_xref_arguments,
+    )
+    xref.set_defaults(func=command_xref)
+
+    multi = subparsers.add_parser(
+        "multi-search",
+        help="Search many terms at once in mirrored law files (Aho-Corasick, one pass per law)",
+        configure=add_multi_search_arguments,
+    )
+    multi.set_defaults(func=command_multi_search)
+
+    archive = subparsers.add_parser(
+        "archive",
+        help="Download a revision's law files and all attachments concurrently, with a checksum manifest",
+        configure=add_archive_arguments,
+    )
+    archive.set_defaults(func=command_archive)
+
+    article_store = subparsers.add_parser(
+        "article-store",
+        help="Keep full revision histories with each distinct article stored once (ingest, pull, show, diff, stats)",
+        configure=add_article_store_arguments,
+    )
+    article_store.set_defaults(func=command_article_store)
+
+    cache = subparsers.add_parser("cache", help="Inspect or maintain the shared SQLite response cache")
+    cache.add_argument("action", choices=("stats", "prune", "verify"))
+    cache.add_argument("--path", help="Cache database (default: EGOV_LAW_API_SHARED_CACHE).")
+    cache.add_argument("--max-bytes", type=int, help="prune: evict oldest entries down to this size.")
+    cache.add_argument("--vacuum", action="store_true", help="prune: also VACUUM the database file.")
+    cache.add_argument("--repair", action="store_true", help="verify: delete entries whose body hash mismatches.")
+    cache.set_defaults(func=command_cache)
+
+    quota = subparsers.add_parser("quota", help="Show the host-wide upstream quota shared by all processes")
+    quota.set_defaults(func=command_quota)
+
+    rec = subparsers.add_parser(
+        "recording",
+        help="Summarize a recorded session (EGOV_LAW_API_RECORD) or replay it as load",
+    )
+    rec.add_argument("action", choices=("info", "load"))
+    rec.add_argument("archive", help="Recording archive (.jsonl.gz)")
+    rec.add_argument(
+        "--base-url",
+        default="",
+        help="load: send requests here instead of the recorded base URL.",
+    )
+    rec.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="load: replay pacing multiplier; 2 = twice as fast, 0 = back to back (default: 1).",
+    )
+    rec.add_argument("--workers", type=int, default=8, help="load: concurrent requests (default: 8).")
+    rec.add_argument("--limit", type=int, help="load: replay only the first N requests.")
+    rec.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"load: timeout in seconds (default: {DEFAULT_TIMEOUT})",
+    )
+    rec.set_defaults(func=command_recording)
+
     return parser
 
 
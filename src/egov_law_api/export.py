@@ -0,0 +1,312 @@
+"""Bulk conversion of mirrored law files into law/article/paragraph table shards."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from .law_xml import iter_articles, load_law_document
+
+MANIFEST_NAME = "_manifest.json"
+MANIFEST_VERSION = 1
+INPUT_SUFFIXES = (".xml", ".json")
+EXPORT_FORMATS = ("jsonl", "parquet")
+DEFAULT_ROWS_PER_SHARD = 50_000
+
+TABLE_SCHEMAS: dict[str, tuple[str, ...]] = {
+    "laws": ("law_id", "law_revision_id", "law_num", "law_title", "source_file"),
+    "articles": (
+        "law_id",
+        "law_revision_id",
+        "path",
+        "provision",
+        "article_num",
+        "article_title",
+        "caption",
+        "text",
+    ),
+    "paragraphs": ("law_id", "law_revision_id", "path", "article_num", "paragraph_num", "text"),
+}
+
+Rows = dict[str, list[tuple[Any, ...]]]
+
+
+@dataclass
+class ExportSummary:
+    """Counters reported at the end of an export run."""
+
+    output_dir: str
+    format: str
+    files_total: int = 0
+    files_skipped: int = 0
+    files_converted: int = 0
+    files_failed: int = 0
+    shards_written: int = 0
+    shards_invalidated: int = 0
+    rows: dict[str, int] = field(default_factory=lambda: {name: 0 for name in TABLE_SCHEMAS})
+    errors: list[dict[str, str]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def convert_law_file(path: str) -> Rows:
+    """Parse one mirrored law file into table rows (runs inside worker processes)."""
+    doc = load_law_document(Path(path))
+    rows: Rows = {name: [] for name in TABLE_SCHEMAS}
+    rows["laws"].append((doc.law_id, doc.law_revision_id, doc.law_num, doc.law_title, Path(path).name))
+    for article in iter_articles(doc):
+        rows["articles"].append(
+            (
+                doc.law_id,
+                doc.law_revision_id,
+                article.path,
+                article.provision,
+                article.article_num,
+                article.article_title,
+                article.caption,
+                article.text,
+            )
+        )
+        for paragraph in article.paragraphs:
+            rows["paragraphs"].append(
+                (
+                    doc.law_id,
+                    doc.law_revision_id,
+                    paragraph.path,
+                    article.article_num,
+                    paragraph.paragraph_num,
+                    paragraph.text,
+                )
+            )
+    return rows
+
+
+def iter_input_files(input_dir: Path) -> Iterator[Path]:
+    """Yield mirrored law files below input_dir in stable order."""
+    for path in sorted(input_dir.rglob("*")):
+        if path.is_file() and path.suffix.lower() in INPUT_SUFFIXES:
+            yield path
+
+
+def file_digest(path: Path) -> str:
+    """Return SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _JsonlTableWriter:
+    def __init__(self, path: Path, columns: tuple[str, ...]) -> None:
+        self.path = path
+        self.columns = columns
+        self._handle = path.open("w", encoding="utf-8")
+
+    def write_rows(self, rows: Iterable[tuple[Any, ...]]) -> None:
+        columns = self.columns
+        self._handle.writelines(
+            json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n" for row in rows
+        )
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class _ParquetTableWriter:
+    def __init__(self, path: Path, columns: tuple[str, ...]) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ValueError(
+                "Parquet export requires pyarrow. Install it with "
+                "`python3 -m pip install pyarrow` or use --format jsonl."
+            ) from exc
+        self._pa = pa
+        self.path = path
+        self.columns = columns
+        schema = pa.schema([(name, pa.string()) for name in columns])
+        self._writer = pq.ParquetWriter(str(path), schema)
+
+    def write_rows(self, rows: Iterable[tuple[Any, ...]]) -> None:
+        batch = list(rows)
+        if not batch:
+            return
+        arrays = [self._pa.array([row[i] for row in batch], self._pa.string()) for i in range(len(self.columns))]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, names=list(self.columns)))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class _ShardWriter:
+    """Writes one shard (a group of input files) as one file per table."""
+
+    def __init__(self, output_dir: Path, name: str, fmt: str) -> None:
+        writer_cls = _ParquetTableWriter if fmt == "parquet" else _JsonlTableWriter
+        self.name = name
+        self.files: list[str] = []
+        self.rows = {table: 0 for table in TABLE_SCHEMAS}
+        self._writers = {
+            table: writer_cls(output_dir / f"{name}.{table}.{fmt}", columns)
+            for table, columns in TABLE_SCHEMAS.items()
+        }
+
+    def add(self, relpath: str, rows: Rows) -> None:
+        for table, table_rows in rows.items():
+            self._writers[table].write_rows(table_rows)
+            self.rows[table] += len(table_rows)
+        self.files.append(relpath)
+
+    def close(self) -> dict[str, Any]:
+        for writer in self._writers.values():
+            writer.close()
+        return {"files": self.files, "rows": self.rows}
+
+
+def _load_manifest(path: Path, fmt: str) -> dict[str, Any]:
+    empty: dict[str, Any] = {"version": MANIFEST_VERSION, "format": fmt, "files": {}, "shards": {}}
+    if not path.exists():
+        return empty
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("format") != fmt:
+        return empty
+    return manifest
+
+
+def _remove_orphan_shards(output_dir: Path, shards: dict[str, Any]) -> int:
+    """Delete part-* table files the manifest does not list (left by --force, a reset manifest, or a crash)."""
+    removed = 0
+    for fmt in EXPORT_FORMATS:
+        for table in TABLE_SCHEMAS:
+            for path in output_dir.glob(f"part-*.{table}.{fmt}"):
+                if path.name[: -len(f".{table}.{fmt}")] not in shards:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+    return removed
+
+
+def _write_manifest(path: Path, manifest: dict[str, Any]) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _is_unchanged(path: Path, entry: dict[str, Any] | None) -> tuple[bool, dict[str, Any]]:
+    stat = path.stat()
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if entry is not None and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+        return True, {**fingerprint, "sha256": entry.get("sha256")}
+    digest = file_digest(path)
+    return entry is not None and entry.get("sha256") == digest, {**fingerprint, "sha256": digest}
+
+
+def export_corpus(
+    input_dir: Path,
+    output_dir: Path,
+    *,
+    fmt: str = "jsonl",
+    workers: int | None = None,
+    rows_per_shard: int = DEFAULT_ROWS_PER_SHARD,
+    force: bool = False,
+) -> ExportSummary:
+    """Convert mirrored law files into table shards, skipping files unchanged since the last run.
+
+    Resumability is tracked per input file in `_manifest.json`. A shard that
+    contains a changed or removed file is deleted, and its remaining unchanged
+    files are converted again into new shards. Shard files the manifest does
+    not list (after --force or a format change) are deleted first.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}.")
+    if rows_per_shard < 1:
+        raise ValueError("rows_per_shard must be >= 1.")
+    if not input_dir.is_dir():
+        raise ValueError(f"Input directory not found: {input_dir}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = {"version": MANIFEST_VERSION, "format": fmt, "files": {}, "shards": {}}
+    if not force:
+        manifest = _load_manifest(manifest_path, fmt)
+    summary = ExportSummary(output_dir=str(output_dir), format=fmt)
+
+    current: dict[str, Path] = {str(p.relative_to(input_dir)): p for p in iter_input_files(input_dir)}
+    summary.files_total = len(current)
+    previous_files: dict[str, Any] = manifest["files"]
+    fingerprints: dict[str, dict[str, Any]] = {}
+    stale: set[str] = {relpath for relpath in previous_files if relpath not in current}
+    for relpath, path in current.items():
+        unchanged, fingerprints[relpath] = _is_unchanged(path, previous_files.get(relpath))
+        if not unchanged:
+            stale.add(relpath)
+
+    shards: dict[str, Any] = manifest["shards"]
+    # Numbering restarts after the last listed shard, so unlisted files would be overwritten or left stale.
+    _remove_orphan_shards(output_dir, shards)
+    for shard_name in [name for name, info in shards.items() if stale.intersection(info["files"])]:
+        for table in TABLE_SCHEMAS:
+            (output_dir / f"{shard_name}.{table}.{fmt}").unlink(missing_ok=True)
+        for relpath in shards.pop(shard_name)["files"]:
+            previous_files.pop(relpath, None)
+        summary.shards_invalidated += 1
+    for relpath in stale:
+        previous_files.pop(relpath, None)
+
+    todo = [relpath for relpath in current if relpath not in previous_files]
+    summary.files_skipped = summary.files_total - len(todo)
+    next_index = 1 + max((int(name.split("-", 1)[1]) for name in shards), default=-1)
+    shard: _ShardWriter | None = None
+
+    def finish_shard() -> None:
+        nonlocal shard
+        if shard is None:
+            return
+        shards[shard.name] = shard.close()
+        summary.shards_written += 1
+        shard = None
+        _write_manifest(manifest_path, manifest)
+
+    # Imported here: the process pool pulls in multiprocessing, which CLI startup does not need.
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pending: dict[Future[Rows], str] = {}
+        queue = iter(todo)
+        while True:
+            while len(pending) < max_workers * 2:
+                relpath = next(queue, None)
+                if relpath is None:
+                    break
+                pending[pool.submit(convert_law_file, str(current[relpath]))] = relpath
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                relpath = pending.pop(future)
+                try:
+                    rows = future.result()
+                except Exception as exc:  # noqa: BLE001 - one bad file must not stop the run
+                    summary.files_failed += 1
+                    summary.errors.append({"file": relpath, "error": f"{type(exc).__name__}: {exc}"})
+                    continue
+                if shard is None:
+                    shard = _ShardWriter(output_dir, f"part-{next_index:05d}", fmt)
+                    next_index += 1
+                shard.add(relpath, rows)
+                previous_files[relpath] = fingerprints[relpath]
+                summary.files_converted += 1
+                for table, table_rows in rows.items():
+                    summary.rows[table] += len(table_rows)
+                if shard.rows["articles"] >= rows_per_shard:
+                    finish_shard()
+    finish_shard()
+    _write_manifest(manifest_path, manifest)
+    return summary
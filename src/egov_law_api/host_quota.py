@@ -0,0 +1,165 @@
+"""Host-wide upstream quota shared by every process that uses api_client.
+
+Each MCP server, CLI run, and example script otherwise paces itself alone,
+so ten processes on one host can send ten times the intended rate. When
+EGOV_LAW_API_HOST_QUOTA_FILE is set, every network fetch first takes a token
+from one bucket kept in that file:
+
+- The state is 20 bytes (magic, tokens, last refill time on the
+  system-wide monotonic clock), read and rewritten under an exclusive
+  flock(). Taking a token costs one lock plus one pread/pwrite.
+- The kernel releases the lock when its holder exits, so a process that
+  crashes mid-update cannot wedge the others. Tokens are spent, not leased,
+  so nothing has to be returned after a crash. A missing, torn, or stale
+  state (for example after a reboot) starts again from a full bucket.
+- Background requests (prefetch, bulk) only take a token while more than
+  EGOV_LAW_API_HOST_QUOTA_BACKGROUND_RESERVE tokens remain, leaving the
+  rest for interactive calls.
+
+A caller waits up to EGOV_LAW_API_HOST_QUOTA_MAX_WAIT_SECONDS for a token,
+then gets HostQuotaExceeded. All processes should use the same settings.
+Requires POSIX file locking; elsewhere the quota is disabled.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+HOST_QUOTA_FILE = os.environ.get("EGOV_LAW_API_HOST_QUOTA_FILE", "").strip()
+HOST_QUOTA_PER_MINUTE = float(os.environ.get("EGOV_LAW_API_HOST_QUOTA_PER_MINUTE", "60"))
+HOST_QUOTA_BURST = int(os.environ.get("EGOV_LAW_API_HOST_QUOTA_BURST", "10"))
+HOST_QUOTA_BACKGROUND_RESERVE = int(os.environ.get("EGOV_LAW_API_HOST_QUOTA_BACKGROUND_RESERVE", "3"))
+HOST_QUOTA_MAX_WAIT_SECONDS = float(os.environ.get("EGOV_LAW_API_HOST_QUOTA_MAX_WAIT_SECONDS", "30"))
+
+if HOST_QUOTA_PER_MINUTE <= 0:
+    HOST_QUOTA_PER_MINUTE = 60.0
+if HOST_QUOTA_BURST < 1:
+    HOST_QUOTA_BURST = 10
+if not 0 <= HOST_QUOTA_BACKGROUND_RESERVE < HOST_QUOTA_BURST:
+    HOST_QUOTA_BACKGROUND_RESERVE = HOST_QUOTA_BURST // 3
+if HOST_QUOTA_MAX_WAIT_SECONDS < 0:
+    HOST_QUOTA_MAX_WAIT_SECONDS = 30.0
+
+_MAGIC = b"EGQ1"
+_STATE = struct.Struct("<4sdd")
+
+
+class HostQuotaExceeded(ValueError):
+    """Raised when no host-wide token became available within the allowed wait."""
+
+
+class HostQuota:
+    """Token bucket in a lock-protected file, shared by all processes on the host."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        per_minute: float = HOST_QUOTA_PER_MINUTE,
+        *,
+        burst: int = HOST_QUOTA_BURST,
+        background_reserve: int = HOST_QUOTA_BACKGROUND_RESERVE,
+        max_wait: float = HOST_QUOTA_MAX_WAIT_SECONDS,
+    ) -> None:
+        if per_minute <= 0:
+            raise ValueError("per_minute must be > 0.")
+        if not 0 <= background_reserve < max(1, burst):
+            raise ValueError("background_reserve must be between 0 and burst - 1.")
+        self.path = Path(path).expanduser()
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.burst = max(1, burst)
+        self.background_reserve = background_reserve
+        self.max_wait = max_wait
+        # flock() locks belong to the open file description, which threads (and
+        # forked children) share, so threads also serialize on a process lock.
+        self._lock = threading.Lock()
+        self._fd = -1
+        self._pid = 0
+        self.acquired = 0
+        self.waited_seconds = 0.0
+
+    def _file(self) -> int:
+        if self._fd < 0 or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+        return self._fd
+
+    def _read(self, fd: int, now: float) -> tuple[float, float]:
+        data = os.pread(fd, _STATE.size, 0)
+        if len(data) == _STATE.size:
+            magic, tokens, updated = _STATE.unpack(data)
+            if magic == _MAGIC and math.isfinite(tokens) and math.isfinite(updated) and updated <= now:
+                return min(float(self.burst), max(0.0, tokens) + (now - updated) * self.rate), now
+        return float(self.burst), now
+
+    def _take(self, reserve: int) -> tuple[float, float]:
+        """Try to take one token; returns (seconds to wait, tokens left). Zero wait means taken."""
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                tokens, now = self._read(fd, time.monotonic())
+                needed = 1.0 + reserve
+                if tokens >= needed:
+                    tokens -= 1.0
+                    wait = 0.0
+                else:
+                    wait = (needed - tokens) / self.rate
+                os.pwrite(fd, _STATE.pack(_MAGIC, tokens, now), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        return wait, tokens
+
+    def acquire(self, *, background: bool = False) -> None:
+        """Block until a host-wide token is taken, or raise HostQuotaExceeded after max_wait seconds."""
+        reserve = self.background_reserve if background else 0
+        started = time.monotonic()
+        while True:
+            wait, _ = self._take(reserve)
+            if wait <= 0:
+                with self._lock:
+                    self.acquired += 1
+                    self.waited_seconds += time.monotonic() - started
+                return
+            if time.monotonic() - started + wait > self.max_wait:
+                raise HostQuotaExceeded(
+                    f"Host-wide upstream quota exhausted ({self.per_minute:g} requests/minute shared by all "
+                    f"processes using {self.path}); no token within {self.max_wait:g} seconds."
+                )
+            time.sleep(wait)
+
+    def status(self) -> dict[str, Any]:
+        """Current bucket level (without taking a token) and this process's usage."""
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            try:
+                tokens, _ = self._read(fd, time.monotonic())
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            return {
+                "path": str(self.path),
+                "per_minute": self.per_minute,
+                "burst": self.burst,
+                "background_reserve": self.background_reserve,
+                "tokens": round(tokens, 3),
+                "acquired": self.acquired,
+                "waited_seconds": round(self.waited_seconds, 3),
+            }
+
+
+host_quota: HostQuota | None = (
+    HostQuota(HOST_QUOTA_FILE) if HOST_QUOTA_FILE and fcntl is not None else None
+)
@@ -0,0 +1,246 @@
+"""Parsing helpers for e-Gov law full text (standard law XML or its JSON tree form)."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+from xml.etree import ElementTree as ET
+
+from .api_client import iter_base64_decoded
+from .records import is_revision_id
+
+PROVISION_TAGS = ("MainProvision", "SupplProvision")
+STRUCTURE_TAGS = ("Part", "Chapter", "Section", "Subsection", "Division")
+BLOCK_TAGS = frozenset(
+    ["Paragraph", "Item", *(f"Subitem{level}" for level in range(1, 11)), "TableRow"]
+)
+SKIP_TEXT_TAGS = frozenset(["ArticleTitle", "ArticleCaption", "ParagraphNum", "Rt", "SupplProvisionLabel"])
+
+
+@dataclass(frozen=True)
+class ParagraphText:
+    """One paragraph of an article."""
+
+    path: str
+    paragraph_num: str
+    text: str
+
+
+@dataclass(frozen=True)
+class ArticleText:
+    """One article (or a bare supplementary provision) with its paragraphs."""
+
+    path: str
+    provision: str
+    article_num: str | None
+    article_title: str
+    caption: str
+    text: str
+    paragraphs: tuple[ParagraphText, ...]
+
+
+@dataclass(frozen=True)
+class LawDocument:
+    """Parsed law full text plus the identifiers needed to cite it."""
+
+    law_id: str
+    law_revision_id: str
+    law_num: str
+    law_title: str
+    root: ET.Element
+
+
+def json_tree_to_element(node: Any) -> ET.Element:
+    """Convert e-Gov JSON full-text tree (`tag`/`attr`/`children`) into an Element."""
+    if not isinstance(node, dict) or "tag" not in node:
+        raise ValueError("law_full_text JSON must be an object with a 'tag' key.")
+    elem = ET.Element(str(node["tag"]), {k: str(v) for k, v in (node.get("attr") or {}).items()})
+    last: ET.Element | None = None
+    for child in node.get("children") or []:
+        if isinstance(child, str):
+            if last is None:
+                elem.text = (elem.text or "") + child
+            else:
+                last.tail = (last.tail or "") + child
+            continue
+        last = json_tree_to_element(child)
+        elem.append(last)
+    return elem
+
+
+def parse_base64_xml(encoded: str) -> ET.Element:
+    """Feed Base64-encoded XML into the parser chunk by chunk and return the root element."""
+    parser = ET.XMLParser()
+    try:
+        for chunk in iter_base64_decoded(encoded):
+            parser.feed(chunk)
+        return parser.close()
+    except ET.ParseError as exc:
+        raise ValueError(f"Decoded law_full_text is not valid XML: {exc}") from exc
+
+
+def find_law_element(root: ET.Element) -> ET.Element:
+    """Return the `Law` element from a bare law XML or a law_data XML response."""
+    if root.tag == "Law":
+        return root
+    law = root.find(".//Law")
+    if law is None:
+        raise ValueError(f"No <Law> element found under <{root.tag}>.")
+    return law
+
+
+def ids_from_filename(path: Path) -> tuple[str, str]:
+    """Guess (law_id, law_revision_id) from a mirrored file name such as `law_file_<id>.xml`."""
+    stem = path.stem
+    if stem.startswith("law_file_"):
+        stem = stem[len("law_file_"):]
+    if is_revision_id(stem):
+        return stem.split("_", 1)[0], stem
+    return stem, ""
+
+
+def law_document_from_element(root: ET.Element, *, law_id: str = "", law_revision_id: str = "") -> LawDocument:
+    """Build LawDocument from a parsed XML root, preferring IDs embedded in API responses."""
+    embedded_law_id = root.findtext("./law_info/law_id") or ""
+    embedded_revision_id = root.findtext("./revision_info/law_revision_id") or ""
+    law = find_law_element(root)
+    body = law.find("LawBody")
+    title_elem = body.find("LawTitle") if body is not None else None
+    return LawDocument(
+        law_id=embedded_law_id or law_id,
+        law_revision_id=embedded_revision_id or law_revision_id,
+        law_num=_clean(law.findtext("LawNum") or ""),
+        law_title=_clean(element_text(title_elem)) if title_elem is not None else "",
+        root=law,
+    )
+
+
+def law_document_from_payload(
+    payload: dict[str, Any],
+    *,
+    law_id: str = "",
+    law_revision_id: str = "",
+) -> LawDocument:
+    """Build LawDocument from a decoded `/law_data` JSON payload."""
+    law_info = payload.get("law_info") or {}
+    revision_info = payload.get("revision_info") or {}
+    full_text = payload.get("law_full_text")
+    if isinstance(full_text, str):
+        root = ET.fromstring(full_text) if full_text.lstrip().startswith("<") else parse_base64_xml(full_text)
+    else:
+        root = json_tree_to_element(full_text)
+    return law_document_from_element(
+        root,
+        law_id=str(law_info.get("law_id") or law_id),
+        law_revision_id=str(revision_info.get("law_revision_id") or law_revision_id),
+    )
+
+
+def load_law_document(path: Path) -> LawDocument:
+    """Load a mirrored law file (`.xml` law file/law_data response, or `.json` law_data response)."""
+    law_id, law_revision_id = ids_from_filename(path)
+    if path.suffix.lower() == ".json":
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(payload, dict):
+            raise ValueError(f"Unexpected JSON payload in {path}.")
+        return law_document_from_payload(payload, law_id=law_id, law_revision_id=law_revision_id)
+    root = ET.parse(path).getroot()
+    return law_document_from_element(root, law_id=law_id, law_revision_id=law_revision_id)
+
+
+def element_text(elem: ET.Element) -> str:
+    """Return readable text of an element, skipping titles, ruby readings, and numbering labels."""
+    parts: list[str] = []
+    _collect_text(elem, parts)
+    lines = [_clean(line) for line in "".join(parts).split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def _collect_text(elem: ET.Element, parts: list[str]) -> None:
+    if elem.tag in BLOCK_TAGS and parts and not parts[-1].endswith("\n"):
+        parts.append("\n")
+    if elem.text:
+        parts.append(elem.text)
+    for child in elem:
+        if child.tag not in SKIP_TEXT_TAGS:
+            _collect_text(child, parts)
+            if child.tag.endswith("Title"):
+                parts.append(" ")
+        if child.tail:
+            parts.append(child.tail)
+
+
+def _clean(value: str) -> str:
+    return " ".join(value.split())
+
+
+def _segment(tag: str, num: str | None) -> str:
+    return f"{tag}[{num}]" if num else tag
+
+
+def iter_articles(doc: LawDocument) -> Iterator[ArticleText]:
+    """Yield every article of the law in document order.
+
+    Paths join `Tag[Num]` segments with `-` (for example
+    `MainProvision-Chapter[2]-Article[15]`). Supplementary provisions are indexed
+    by position (`SupplProvision[3]`) because they carry no `Num` attribute.
+    """
+    body = doc.root.find("LawBody")
+    if body is None:
+        return
+    suppl_index = 0
+    for provision in body:
+        if provision.tag not in PROVISION_TAGS:
+            continue
+        if provision.tag == "SupplProvision":
+            suppl_index += 1
+            prefix = _segment("SupplProvision", str(suppl_index))
+        else:
+            prefix = "MainProvision"
+        yield from _walk_provision(provision, prefix, provision.tag)
+
+
+def _walk_provision(elem: ET.Element, path: str, provision: str) -> Iterator[ArticleText]:
+    bare_paragraphs: list[ET.Element] = []
+    for child in elem:
+        if child.tag in STRUCTURE_TAGS:
+            yield from _walk_provision(child, f"{path}-{_segment(child.tag, child.get('Num'))}", provision)
+        elif child.tag == "Article":
+            yield _article_text(child, f"{path}-{_segment('Article', child.get('Num'))}", provision)
+        elif child.tag == "Paragraph":
+            bare_paragraphs.append(child)
+    if bare_paragraphs:
+        paragraphs = tuple(_paragraph_text(p, path) for p in bare_paragraphs)
+        yield ArticleText(
+            path=path,
+            provision=provision,
+            article_num=None,
+            article_title="",
+            caption="",
+            text="\n".join(p.text for p in paragraphs if p.text),
+            paragraphs=paragraphs,
+        )
+
+
+def _article_text(article: ET.Element, path: str, provision: str) -> ArticleText:
+    paragraphs = tuple(_paragraph_text(p, path) for p in article.findall("Paragraph"))
+    return ArticleText(
+        path=path,
+        provision=provision,
+        article_num=article.get("Num"),
+        article_title=_clean(article.findtext("ArticleTitle") or ""),
+        caption=_clean(article.findtext("ArticleCaption") or ""),
+        text="\n".join(p.text for p in paragraphs if p.text),
+        paragraphs=paragraphs,
+    )
+
+
+def _paragraph_text(paragraph: ET.Element, parent_path: str) -> ParagraphText:
+    num = paragraph.get("Num") or ""
+    return ParagraphText(
+        path=f"{parent_path}-{_segment('Paragraph', num)}",
+        paragraph_num=num,
+        text=element_text(paragraph),
+    )
@@ -2,30 +2,52 @@
 
 from __future__ import annotations
 
+import argparse
 import asyncio
+import functools
 import json
 import os
 import re
+import sys
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Literal, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Literal, Optional
 from urllib import error, parse
 
-from mcp.server.fastmcp import FastMCP
-
 from .api_client import (
+    ApiResponse,
     DEFAULT_BASE_URL,
+    ResponseBody,
+    ResponseTooLargeError,
     DEFAULT_TIMEOUT,
     bool_query,
+    build_url,
     decode_bytes,
+    decode_full_text_field,
+    full_text_is_base64,
+    parse_fields,
     parse_json_text,
+    project_fields,
     request_endpoint,
+    response_cache,
     source_terms,
     write_binary_output,
 )
+from .profiling import DEFAULT_TOP_SITES, MAX_TOP_SITES, PROFILE_MODE, profiler
+from .records import is_revision_id, parse_laws
+from .scheduler import INTERACTIVE, PREFETCH, scheduler
+from .tracing import record_span, span, traced
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    from mcp.server.fastmcp import FastMCP
 
-mcp = FastMCP("japan-egov-law-api")
+    from .xref import XrefGraph
+
+SERVER_NAME = "japan-egov-law-api"
 
 MAX_TEXT_CHARS = int(os.environ.get("EGOV_LAW_MCP_MAX_TEXT_CHARS", "4000"))
 MAX_ID_CHARS = int(os.environ.get("EGOV_LAW_MCP_MAX_ID_CHARS", "256"))
@@ -33,6 +55,25 @@ MAX_FILE_TYPE_CHARS = int(os.environ.get("EGOV_LAW_MCP_MAX_FILE_TYPE_CHARS", "16
 MAX_LIMIT = int(os.environ.get("EGOV_LAW_MCP_MAX_LIMIT", "100"))
 RATE_LIMIT_PER_MINUTE = int(os.environ.get("EGOV_LAW_MCP_RATE_LIMIT_PER_MINUTE", "60"))
 RATE_LIMIT_WINDOW_SECONDS = 60.0
+XREF_GRAPH_PATH = os.environ.get("EGOV_LAW_MCP_XREF_GRAPH", "")
+MIRROR_DIR = os.environ.get("EGOV_LAW_MCP_MIRROR_DIR", "")
+SEARCH_WORKERS = int(os.environ.get("EGOV_LAW_MCP_SEARCH_WORKERS", "0")) or None
+ARCHIVE_MAX_FILES = int(os.environ.get("EGOV_LAW_MCP_ARCHIVE_MAX_FILES", "100"))
+ARCHIVE_WORKERS = int(os.environ.get("EGOV_LAW_MCP_ARCHIVE_WORKERS", "4"))
+ARTICLE_HISTORY_MAX_REVISIONS = int(os.environ.get("EGOV_LAW_MCP_ARTICLE_HISTORY_MAX_REVISIONS", "50"))
+MAX_BATCH_ITEMS = int(os.environ.get("EGOV_LAW_MCP_MAX_BATCH_ITEMS", "20"))
+BATCH_CONCURRENCY = int(os.environ.get("EGOV_LAW_MCP_BATCH_CONCURRENCY", "4"))
+MAX_BATCH_DEADLINE_SECONDS = 120.0
+MAX_IN_FLIGHT = int(os.environ.get("EGOV_LAW_MCP_MAX_IN_FLIGHT", "8"))
+MAX_QUEUED = int(os.environ.get("EGOV_LAW_MCP_MAX_QUEUED", "32"))
+CLIENT_RATE_LIMIT_PER_MINUTE = int(os.environ.get("EGOV_LAW_MCP_CLIENT_RATE_LIMIT_PER_MINUTE", "0"))
+DRAIN_SECONDS = float(os.environ.get("EGOV_LAW_MCP_DRAIN_SECONDS", "30"))
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+WARM_LIST_PATH = os.environ.get("EGOV_LAW_MCP_WARM_LIST", "")
+PREFETCH_ENABLED = os.environ.get("EGOV_LAW_MCP_PREFETCH", "1").lower() not in {"0", "false", "no"}
+PREFETCH_RATE_SHARE = float(os.environ.get("EGOV_LAW_MCP_PREFETCH_RATE_SHARE", "0.5"))
+PREFETCH_ELM = os.environ.get("EGOV_LAW_MCP_PREFETCH_ELM", "MainProvision")
+PREFETCH_QUEUE_SIZE = 256
 
 if MAX_TEXT_CHARS < 256:
     MAX_TEXT_CHARS = 4000
@@ -44,14 +85,192 @@ if MAX_LIMIT < 1:
     MAX_LIMIT = 100
 if RATE_LIMIT_PER_MINUTE < 1:
     RATE_LIMIT_PER_MINUTE = 60
+if MAX_BATCH_ITEMS < 1:
+    MAX_BATCH_ITEMS = 20
+if BATCH_CONCURRENCY < 1:
+    BATCH_CONCURRENCY = 4
+if MAX_IN_FLIGHT < 1:
+    MAX_IN_FLIGHT = 8
+if MAX_QUEUED < 0:
+    MAX_QUEUED = 32
+if CLIENT_RATE_LIMIT_PER_MINUTE < 0:
+    CLIENT_RATE_LIMIT_PER_MINUTE = 0
+if DRAIN_SECONDS < 0:
+    DRAIN_SECONDS = 30.0
+if not 0 < PREFETCH_RATE_SHARE <= 1:
+    PREFETCH_RATE_SHARE = 0.5
+if ARCHIVE_MAX_FILES < 1:
+    ARCHIVE_MAX_FILES = 100
+# Each file costs one rate-limit slot (plus one for the attachment listing), so a larger cap
+# could only ever fail with a rate-limit error.
+ARCHIVE_MAX_FILES = min(ARCHIVE_MAX_FILES, max(1, RATE_LIMIT_PER_MINUTE - 1))
+if ARCHIVE_WORKERS < 1:
+    ARCHIVE_WORKERS = 4
+if ARTICLE_HISTORY_MAX_REVISIONS < 1:
+    ARTICLE_HISTORY_MAX_REVISIONS = 50
+# Same budget as the archive cap: one slot per revision plus one for the revision list.
+ARTICLE_HISTORY_MAX_REVISIONS = min(ARTICLE_HISTORY_MAX_REVISIONS, max(1, RATE_LIMIT_PER_MINUTE - 1))
 
 _FILE_TYPE_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,16}$")
+_JSON_ACCEPT = "application/json, application/xml"
 _rate_window: list[float] = []
 _rate_lock = asyncio.Lock()
+_client_rate_windows: dict[str, list[float]] = {}
+_prefetch_queue: asyncio.Queue[tuple[str, dict[str, Any]]] | None = None
+_prefetch_seen: set[str] = set()
+_prefetch_task: asyncio.Task[None] | None = None
+_background_tasks: set[asyncio.Task[None]] = set()
+_xref_graphs: dict[str, tuple[int, XrefGraph]] = {}
+_search_pool: ProcessPoolExecutor | None = None
+_tools: list[Callable[..., Awaitable[str]]] = []
+_server: FastMCP | None = None
+
+
+def _tool(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Register a tool handler; the handler itself is returned unchanged."""
+    _tools.append(func)
+    return func
+
+
+def get_server() -> FastMCP:
+    """Build the FastMCP server on first use.
+
+    Importing `mcp` costs several hundred milliseconds, so `--help` and code that
+    only calls the tool functions never load it.
+    """
+    global _server
+    if _server is None:
+        from mcp.server.fastmcp import FastMCP
+
+        server = FastMCP(SERVER_NAME)
+        for func in _tools:
+            server.tool()(func)
+        _server = server
+    return _server
+
+
+def __getattr__(name: str) -> Any:
+    # `mcp_server.mcp` predates get_server(); keep it working for existing callers.
+    if name == "mcp":
+        return get_server()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class OverloadedError(RuntimeError):
+    """Raised when a tool call is shed because the server is saturated or draining."""
+
+
+class _ToolGate:
+    """Bounds concurrent tool calls, sheds load when the wait queue is full, and drains on shutdown."""
+
+    def __init__(self, max_in_flight: int, max_queued: int) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.in_flight = 0
+        self.queued = 0
+        self.draining = False
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self.draining:
+            raise OverloadedError("Server is shutting down. Retry shortly.")
+        if self._semaphore.locked() and self.queued >= self.max_queued:
+            raise OverloadedError(
+                f"Server overloaded: {self.in_flight} tool calls in flight and {self.queued} queued. Retry shortly."
+            )
+        self.queued += 1
+        self._idle.clear()
+        try:
+            with span("gate.wait", queued=self.queued, in_flight=self.in_flight):
+                await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+            if self.in_flight == 0 and self.queued == 0:
+                self._idle.set()
+
+    def start_drain(self) -> None:
+        self.draining = True
+
+    async def drain(self, timeout: float) -> bool:
+        """Reject new calls and wait for in-flight ones; return True if all finished in time."""
+        self.start_drain()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+_tool_gate = _ToolGate(MAX_IN_FLIGHT, MAX_QUEUED)
+
+
+def _gated(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Run a tool handler inside the shared concurrency gate."""
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        with span(f"tool.{func.__name__}", tool=func.__name__) as current, profiler.call(func.__name__) as sample:
+            try:
+                async with _tool_gate.slot():
+                    result = await func(*args, **kwargs)
+            except OverloadedError as exc:
+                result = _error_json(str(exc), error_type="Overloaded")
+            current.set(response_bytes=len(result))
+            if sample is not None:
+                sample.response_bytes = len(result)
+            return result
+
+    return wrapper
 
 
-def _to_json(value: dict[str, Any]) -> str:
-    return json.dumps(value, ensure_ascii=False, indent=2)
+def _current_client_key() -> str:
+    """Identify the calling client: MCP client_id, then MCP session, then remote address.
+
+    The server binds to 127.0.0.1 by default, so the remote address alone would
+    put every local client under one key.
+    """
+    if _server is None:
+        return "local"
+    try:
+        request_context = _server.get_context().request_context
+    except ValueError:
+        return "local"
+    meta = request_context.meta
+    client_id = getattr(meta, "client_id", None) if meta else None
+    if client_id:
+        return str(client_id)
+    request = request_context.request
+    if request is None:
+        # stdio: one session per process.
+        return f"session-{id(request_context.session)}"
+    # streamable-http sends the session in a header, SSE in the message URL.
+    session_id = request.headers.get("mcp-session-id") or request.query_params.get("session_id")
+    if session_id:
+        return f"session-{session_id}"
+    # Stateless HTTP has a fresh session per request; the address is all that persists.
+    client = getattr(request, "client", None)
+    if client is not None and client.host:
+        return client.host
+    return f"session-{id(request_context.session)}"
+
+
+def _to_json(value: dict[str, Any], *, compact: bool = False) -> str:
+    with span("serialize", compact=compact) as current, profiler.stage("serialize"):
+        if compact:
+            text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        else:
+            text = json.dumps(value, ensure_ascii=False, indent=2)
+        current.set(bytes=len(text))
+        return text
 
 
 def _sanitize_text(value: str, max_len: int = 400) -> str:
@@ -126,24 +345,48 @@ def _validate_file_type(value: str) -> str:
     return normalized
 
 
-def _decode_response_payload(headers: dict[str, str], body: bytes) -> Any:
-    text = decode_bytes(body)
+@traced("decode")
+def _decode_response_payload(headers: dict[str, str], body: ResponseBody) -> Any:
+    # A spilled (memory-mapped) body is still turned into one str and a full JSON tree here:
+    # tool results are returned as one JSON document, so the spill threshold does not bound
+    # this path. Only EGOV_LAW_API_MAX_RESPONSE_BYTES does.
+    with profiler.stage("decode_bytes"):
+        text = decode_bytes(body)
     content_type = headers.get("content-type", "").lower()
     if "application/json" in content_type:
         try:
-            return parse_json_text(text)
+            with profiler.stage("json_parse"):
+                return parse_json_text(text)
         except json.JSONDecodeError:
             return text
     return text
 
 
+def _validate_fields(fields: str, response_format: str) -> list[tuple[str, ...]]:
+    normalized = _validate_optional_text("fields", fields)
+    if normalized is None:
+        return []
+    if response_format != "json":
+        raise ValueError("fields requires response_format=json.")
+    return parse_fields(normalized)
+
+
+def _needs_full_text_decode(query: dict[str, Any], fields: list[tuple[str, ...]]) -> bool:
+    """Skip Base64 decoding when the projection drops law_full_text anyway."""
+    if not full_text_is_base64(query) or (query.get("response_format") or "json") != "json":
+        return False
+    return not fields or any(path[0] == "law_full_text" for path in fields)
+
+
 def _success_json(
     *,
     endpoint: str,
     status: int,
     url: str,
-    headers: dict[str, str],
-    body: bytes,
+    data: Any,
+    fields: list[tuple[str, ...]] | None = None,
+    compact: bool = False,
+    cached: bool = False,
 ) -> str:
     return _to_json(
         {
@@ -151,72 +394,244 @@ def _success_json(
             "endpoint": endpoint,
             "status": status,
             "url": url,
+            "cached": cached,
             "retrieved_at_utc": datetime.now(timezone.utc).isoformat(),
             "source_terms": source_terms(),
-            "data": _decode_response_payload(headers, body),
-        }
+            "data": project_fields(data, fields) if fields else data,
+        },
+        compact=compact,
     )
 
 
+def _http_error_payload(
+    *, endpoint: str, status: int, url: str, body: ResponseBody, cached: bool = False
+) -> dict[str, Any]:
+    body_text = decode_bytes(body)
+    return {
+        "success": False,
+        "error_type": "HTTPError",
+        "endpoint": endpoint,
+        "http_status": status,
+        "url": url,
+        "cached": cached,
+        "error_body": _sanitize_text(body_text, max_len=1200),
+    }
+
+
 def _http_error_json(
     *,
     endpoint: str,
     status: int,
     url: str,
-    body: bytes,
+    body: ResponseBody,
+    cached: bool = False,
 ) -> str:
-    body_text = decode_bytes(body)
-    return _to_json(
-        {
-            "success": False,
-            "error_type": "HTTPError",
-            "endpoint": endpoint,
-            "http_status": status,
-            "url": url,
-            "error_body": _sanitize_text(body_text, max_len=1200),
-            "source_terms": source_terms(),
-        }
-    )
+    payload = _http_error_payload(endpoint=endpoint, status=status, url=url, body=body, cached=cached)
+    return _to_json({**payload, "source_terms": source_terms()})
+
+
+def _prune_window(window: list[float], now: float) -> None:
+    while window and (now - window[0]) > RATE_LIMIT_WINDOW_SECONDS:
+        window.pop(0)
+
+
+def _is_cached(path: str, query: dict[str, Any]) -> bool:
+    """True when the call will be answered from the in-process cache (no upstream request)."""
+    return response_cache.enabled and response_cache.contains(build_url(DEFAULT_BASE_URL, path, query), _JSON_ACCEPT)
 
 
-async def _enforce_rate_limit(tool_name: str) -> None:
+@traced("rate_limit")
+async def _enforce_rate_limit(tool_name: str, cost: int = 1) -> None:
     now = time.monotonic()
+    client_window: list[float] | None = None
     async with _rate_lock:
-        while _rate_window and (now - _rate_window[0]) > RATE_LIMIT_WINDOW_SECONDS:
-            _rate_window.pop(0)
-        if len(_rate_window) >= RATE_LIMIT_PER_MINUTE:
+        _prune_window(_rate_window, now)
+        if len(_rate_window) + cost > RATE_LIMIT_PER_MINUTE:
             raise ValueError(
                 f"Rate limit exceeded: max {RATE_LIMIT_PER_MINUTE} requests/minute. Tool={tool_name}"
             )
-        _rate_window.append(now)
+        if CLIENT_RATE_LIMIT_PER_MINUTE:
+            if len(_client_rate_windows) > 1024:
+                for key in [key for key, window in _client_rate_windows.items() if not window]:
+                    del _client_rate_windows[key]
+            client_window = _client_rate_windows.setdefault(_current_client_key(), [])
+            _prune_window(client_window, now)
+            if len(client_window) + cost > CLIENT_RATE_LIMIT_PER_MINUTE:
+                raise ValueError(
+                    f"Client quota exceeded: max {CLIENT_RATE_LIMIT_PER_MINUTE} requests/minute "
+                    f"per client. Tool={tool_name}"
+                )
+            client_window.extend([now] * cost)
+        _rate_window.extend([now] * cost)
+
+
+@traced("validate")
+def _search_law_query(
+    *,
+    law_title: str = "",
+    law_num: str = "",
+    law_id: str = "",
+    asof: str = "",
+    limit: int = 5,
+    offset: int = 0,
+    order: str = "",
+    response_format: str = "json",
+) -> tuple[str, dict[str, Any]]:
+    law_title_n = _validate_optional_text("law_title", law_title)
+    law_num_n = _validate_optional_text("law_num", law_num)
+    law_id_n = _validate_optional_text("law_id", law_id)
+    asof_n = _validate_optional_text("asof", asof)
+    order_n = _validate_optional_text("order", order, max_len=64)
+    if not any([law_title_n, law_num_n, law_id_n]):
+        raise ValueError("Specify at least one of law_title, law_num, or law_id.")
+
+    query = {
+        "law_title": law_title_n,
+        "law_num": law_num_n,
+        "law_id": law_id_n,
+        "asof": asof_n,
+        "limit": _validate_limit(limit),
+        "offset": _validate_offset(offset),
+        "order": order_n,
+        "response_format": _validate_response_format(response_format),
+    }
+    return "/laws", query
+
+
+@traced("validate")
+def _keyword_search_query(
+    *,
+    keyword: str,
+    asof: str = "",
+    law_num: str = "",
+    law_title: str = "",
+    limit: int = 5,
+    offset: int = 0,
+    order: str = "",
+    response_format: str = "json",
+) -> tuple[str, dict[str, Any]]:
+    query = {
+        "keyword": _validate_required_text("keyword", keyword),
+        "asof": _validate_optional_text("asof", asof),
+        "law_num": _validate_optional_text("law_num", law_num),
+        "law_title": _validate_optional_text("law_title", law_title),
+        "limit": _validate_limit(limit),
+        "offset": _validate_offset(offset),
+        "order": _validate_optional_text("order", order, max_len=64),
+        "response_format": _validate_response_format(response_format),
+    }
+    return "/keyword", query
 
 
-async def _request_json_endpoint(endpoint: str, query: dict[str, Any]) -> str:
-    response = await asyncio.to_thread(
-        request_endpoint,
-        endpoint,
-        query,
-        base_url=DEFAULT_BASE_URL,
-        timeout=DEFAULT_TIMEOUT,
-        accept="application/json, application/xml",
+@traced("validate")
+def _law_data_query(
+    *,
+    law_id_or_num_or_revision_id: str,
+    law_full_text_format: str = "json",
+    asof: str = "",
+    elm: str = "",
+    omit_amendment_suppl_provision: bool = False,
+    include_attached_file_content: bool = False,
+    response_format: str = "json",
+) -> tuple[str, dict[str, Any]]:
+    law_ref = _validate_law_ref(
+        "law_id_or_num_or_revision_id",
+        law_id_or_num_or_revision_id,
     )
+    path = f"/law_data/{parse.quote(law_ref, safe='')}"
+    query = {
+        "law_full_text_format": _validate_response_format(law_full_text_format),
+        "asof": _validate_optional_text("asof", asof),
+        "elm": _validate_optional_text("elm", elm),
+        "omit_amendment_suppl_provision": bool_query(omit_amendment_suppl_provision),
+        "include_attached_file_content": bool_query(include_attached_file_content),
+        "response_format": _validate_response_format(response_format),
+    }
+    return path, query
+
+
+@traced("validate")
+def _law_revisions_query(
+    *,
+    law_id_or_num: str,
+    law_title: str = "",
+    amendment_law_title: str = "",
+    response_format: str = "json",
+) -> tuple[str, dict[str, Any]]:
+    law_ref = _validate_law_ref("law_id_or_num", law_id_or_num)
+    path = f"/law_revisions/{parse.quote(law_ref, safe='')}"
+    query = {
+        "law_title": _validate_optional_text("law_title", law_title),
+        "amendment_law_title": _validate_optional_text("amendment_law_title", amendment_law_title),
+        "response_format": _validate_response_format(response_format),
+    }
+    return path, query
+
+
+_BATCH_OPERATIONS = {
+    "search_law": _search_law_query,
+    "keyword_search": _keyword_search_query,
+    "get_law_revisions": _law_revisions_query,
+    "get_law_data": _law_data_query,
+}
+
+
+async def _call_json_endpoint(endpoint: str, query: dict[str, Any], *, priority: str = INTERACTIVE) -> ApiResponse:
+    submitted_ns = time.time_ns()
+
+    def call() -> ApiResponse:
+        record_span("threadpool.queue", submitted_ns, time.time_ns())
+        return request_endpoint(
+            endpoint,
+            query,
+            base_url=DEFAULT_BASE_URL,
+            timeout=DEFAULT_TIMEOUT,
+            accept=_JSON_ACCEPT,
+            priority=priority,
+        )
+
+    return await asyncio.to_thread(call)
+
+
+async def _request_json_endpoint(
+    endpoint: str,
+    query: dict[str, Any],
+    *,
+    fields: list[tuple[str, ...]] | None = None,
+    compact: bool = False,
+) -> str:
+    response = await _call_json_endpoint(endpoint, query)
+    return _response_json(endpoint, response, fields=fields, compact=compact)
+
+
+def _response_json(
+    endpoint: str,
+    response: ApiResponse,
+    *,
+    fields: list[tuple[str, ...]] | None = None,
+    compact: bool = False,
+) -> str:
     if response.status >= 400:
         return _http_error_json(
             endpoint=endpoint,
             status=response.status,
             url=response.url,
             body=response.body,
+            cached=response.from_cache,
         )
     return _success_json(
         endpoint=endpoint,
         status=response.status,
         url=response.url,
-        headers=response.headers,
-        body=response.body,
+        data=_decode_response_payload(response.headers, response.body),
+        fields=fields,
+        compact=compact,
+        cached=response.from_cache,
     )
 
 
-@mcp.tool()
+@_tool
+@_gated
 async def egov_search_law(
     law_title: str = "",
     law_num: str = "",
@@ -226,29 +641,47 @@ async def egov_search_law(
     offset: int = 0,
     order: str = "",
     response_format: Literal["json", "xml"] = "json",
+    fields: str = "",
+    compact: bool = False,
 ) -> str:
-    """Search laws by title/number/id using e-Gov GET /laws."""
+    """Search laws by title/number/id using e-Gov GET /laws.
+
+    `fields` keeps only the listed dot paths of the payload, for example
+    `laws.law_info.law_id,laws.revision_info.law_title,laws.revision_info.updated`.
+    `compact` returns the same envelope minified (no indentation); source_terms stay complete.
+    """
     try:
-        await _enforce_rate_limit("egov_search_law")
-        law_title_n = _validate_optional_text("law_title", law_title)
-        law_num_n = _validate_optional_text("law_num", law_num)
-        law_id_n = _validate_optional_text("law_id", law_id)
-        asof_n = _validate_optional_text("asof", asof)
-        order_n = _validate_optional_text("order", order, max_len=64)
-        if not any([law_title_n, law_num_n, law_id_n]):
-            raise ValueError("Specify at least one of law_title, law_num, or law_id.")
-
-        query = {
-            "law_title": law_title_n,
-            "law_num": law_num_n,
-            "law_id": law_id_n,
-            "asof": asof_n,
-            "limit": _validate_limit(limit),
-            "offset": _validate_offset(offset),
-            "order": order_n,
-            "response_format": _validate_response_format(response_format),
-        }
-        return await _request_json_endpoint("/laws", query)
+        field_paths = _validate_fields(fields, response_format)
+        path, query = _search_law_query(
+            law_title=law_title,
+            law_num=law_num,
+            law_id=law_id,
+            asof=asof,
+            limit=limit,
+            offset=offset,
+            order=order,
+            response_format=response_format,
+        )
+        if not _is_cached(path, query):
+            await _enforce_rate_limit("egov_search_law")
+        response = await _call_json_endpoint(path, query)
+        if response.status >= 400:
+            return _response_json(path, response, compact=compact)
+        # Decoded once for both the prefetcher and the envelope.
+        data = _decode_response_payload(response.headers, response.body)
+        if response_format == "json":
+            _prefetch_from_search(data)
+        return _success_json(
+            endpoint=path,
+            status=response.status,
+            url=response.url,
+            data=data,
+            fields=field_paths,
+            compact=compact,
+            cached=response.from_cache,
+        )
+    except ResponseTooLargeError as exc:
+        return _error_json(str(exc), error_type="ResponseTooLarge")
     except ValueError as exc:
         return _error_json(str(exc))
     except error.URLError as exc:
@@ -257,7 +690,8 @@ async def egov_search_law(
         return _error_json(str(exc), error_type=type(exc).__name__)
 
 
-@mcp.tool()
+@_tool
+@_gated
 async def egov_keyword_search(
     keyword: str,
     asof: str = "",
@@ -267,21 +701,31 @@ async def egov_keyword_search(
     offset: int = 0,
     order: str = "",
     response_format: Literal["json", "xml"] = "json",
+    fields: str = "",
+    compact: bool = False,
 ) -> str:
-    """Search law text by keyword using e-Gov GET /keyword."""
+    """Search law text by keyword using e-Gov GET /keyword.
+
+    `fields` (e.g. `items.law_info.law_id,items.sentences.text`) and `compact`
+    work as in egov_search_law.
+    """
     try:
-        await _enforce_rate_limit("egov_keyword_search")
-        query = {
-            "keyword": _validate_required_text("keyword", keyword),
-            "asof": _validate_optional_text("asof", asof),
-            "law_num": _validate_optional_text("law_num", law_num),
-            "law_title": _validate_optional_text("law_title", law_title),
-            "limit": _validate_limit(limit),
-            "offset": _validate_offset(offset),
-            "order": _validate_optional_text("order", order, max_len=64),
-            "response_format": _validate_response_format(response_format),
-        }
-        return await _request_json_endpoint("/keyword", query)
+        field_paths = _validate_fields(fields, response_format)
+        path, query = _keyword_search_query(
+            keyword=keyword,
+            asof=asof,
+            law_num=law_num,
+            law_title=law_title,
+            limit=limit,
+            offset=offset,
+            order=order,
+            response_format=response_format,
+        )
+        if not _is_cached(path, query):
+            await _enforce_rate_limit("egov_keyword_search")
+        return await _request_json_endpoint(path, query, fields=field_paths, compact=compact)
+    except ResponseTooLargeError as exc:
+        return _error_json(str(exc), error_type="ResponseTooLarge")
     except ValueError as exc:
         return _error_json(str(exc))
     except error.URLError as exc:
@@ -290,7 +734,8 @@ async def egov_keyword_search(
         return _error_json(str(exc), error_type=type(exc).__name__)
 
 
-@mcp.tool()
+@_tool
+@_gated
 async def egov_get_law_data(
     law_id_or_num_or_revision_id: str,
     law_full_text_format: Literal["json", "xml"] = "json",
@@ -299,24 +744,51 @@ async def egov_get_law_data(
     omit_amendment_suppl_provision: bool = False,
     include_attached_file_content: bool = False,
     response_format: Literal["json", "xml"] = "json",
+    full_text_output_path: str = "",
+    fields: str = "",
+    compact: bool = False,
 ) -> str:
-    """Get law full text (or filtered element) using e-Gov GET /law_data/{id}."""
+    """Get law full text (or filtered element) using e-Gov GET /law_data/{id}.
+
+    When law_full_text_format differs from response_format, the Base64 full text
+    is decoded: inline by default, or streamed to full_text_output_path.
+    `fields` (e.g. `revision_info.law_revision_id,law_full_text`) and `compact`
+    work as in egov_search_law.
+    """
     try:
-        await _enforce_rate_limit("egov_get_law_data")
-        law_ref = _validate_law_ref(
-            "law_id_or_num_or_revision_id",
-            law_id_or_num_or_revision_id,
+        field_paths = _validate_fields(fields, response_format)
+        path, query = _law_data_query(
+            law_id_or_num_or_revision_id=law_id_or_num_or_revision_id,
+            law_full_text_format=law_full_text_format,
+            asof=asof,
+            elm=elm,
+            omit_amendment_suppl_provision=omit_amendment_suppl_provision,
+            include_attached_file_content=include_attached_file_content,
+            response_format=response_format,
+        )
+        if not _is_cached(path, query):
+            await _enforce_rate_limit("egov_get_law_data")
+        if not _needs_full_text_decode(query, field_paths):
+            return await _request_json_endpoint(path, query, fields=field_paths, compact=compact)
+        response = await _call_json_endpoint(path, query)
+        if response.status >= 400:
+            return _response_json(path, response, fields=field_paths, compact=compact)
+        data = await asyncio.to_thread(
+            decode_full_text_field,
+            _decode_response_payload(response.headers, response.body),
+            output_path=full_text_output_path or None,
+        )
+        return _success_json(
+            endpoint=path,
+            status=response.status,
+            url=response.url,
+            data=data,
+            fields=field_paths,
+            compact=compact,
+            cached=response.from_cache,
         )
-        path = f"/law_data/{parse.quote(law_ref, safe='')}"
-        query = {
-            "law_full_text_format": _validate_response_format(law_full_text_format),
-            "asof": _validate_optional_text("asof", asof),
-            "elm": _validate_optional_text("elm", elm),
-            "omit_amendment_suppl_provision": bool_query(omit_amendment_suppl_provision),
-            "include_attached_file_content": bool_query(include_attached_file_content),
-            "response_format": _validate_response_format(response_format),
-        }
-        return await _request_json_endpoint(path, query)
+    except ResponseTooLargeError as exc:
+        return _error_json(str(exc), error_type="ResponseTooLarge")
     except ValueError as exc:
         return _error_json(str(exc))
     except error.URLError as exc:
@@ -325,24 +797,196 @@ async def egov_get_law_data(
         return _error_json(str(exc), error_type=type(exc).__name__)
 
 
-@mcp.tool()
+@_tool
+@_gated
 async def egov_get_law_revisions(
     law_id_or_num: str,
     law_title: str = "",
     amendment_law_title: str = "",
     response_format: Literal["json", "xml"] = "json",
+    fields: str = "",
+    compact: bool = False,
 ) -> str:
-    """Get revision history using e-Gov GET /law_revisions/{law_id_or_num}."""
+    """Get revision history using e-Gov GET /law_revisions/{law_id_or_num}.
+
+    `fields` (e.g. `revisions.law_revision_id,revisions.amendment_enforcement_date`)
+    and `compact` work as in egov_search_law.
+    """
+    try:
+        field_paths = _validate_fields(fields, response_format)
+        path, query = _law_revisions_query(
+            law_id_or_num=law_id_or_num,
+            law_title=law_title,
+            amendment_law_title=amendment_law_title,
+            response_format=response_format,
+        )
+        if not _is_cached(path, query):
+            await _enforce_rate_limit("egov_get_law_revisions")
+        return await _request_json_endpoint(path, query, fields=field_paths, compact=compact)
+    except ResponseTooLargeError as exc:
+        return _error_json(str(exc), error_type="ResponseTooLarge")
+    except ValueError as exc:
+        return _error_json(str(exc))
+    except error.URLError as exc:
+        return _error_json(str(exc), error_type="NetworkError")
+    except Exception as exc:  # pragma: no cover
+        return _error_json(str(exc), error_type=type(exc).__name__)
+
+
+@_tool
+@_gated
+async def egov_get_law_outline(
+    law_id_or_num_or_revision_id: str,
+    asof: str = "",
+    under: str = "",
+    include_articles: bool = True,
+    include_suppl_provisions: bool = False,
+    compact: bool = False,
+) -> str:
+    """Get a law's Part/Chapter/Section/Article outline with elm paths, without the full text.
+
+    Each node carries type, elm, num, title and caption (articles) or
+    article_count (structure). Pass an elm to egov_get_law_data to fetch just
+    that part. `under` returns one subtree; include_articles=False returns
+    structure only. Outlines are built once per law_revision_id and cached.
+    """
+    from .outline import cached_outline, fetch_outline, revision_in_force, select_outline
+
+    try:
+        law_ref = _validate_law_ref("law_id_or_num_or_revision_id", law_id_or_num_or_revision_id)
+        asof_n = _validate_optional_text("asof", asof) or ""
+        under_n = _validate_optional_text("under", under, max_len=MAX_ID_CHARS) or ""
+        law_revision_id = law_ref
+        if not is_revision_id(law_ref):
+            path, query = _law_revisions_query(law_id_or_num=law_ref)
+            if not _is_cached(path, query):
+                await _enforce_rate_limit("egov_get_law_outline")
+            response = await _call_json_endpoint(path, query)
+            if response.status >= 400:
+                return _response_json(path, response, compact=compact)
+            law_revision_id = revision_in_force(_decode_response_payload(response.headers, response.body), asof_n)
+        found = await asyncio.to_thread(cached_outline, law_revision_id)
+        if found is None:
+            await _enforce_rate_limit("egov_get_law_outline")
+            outline = await asyncio.to_thread(
+                fetch_outline, law_revision_id, base_url=DEFAULT_BASE_URL, timeout=DEFAULT_TIMEOUT
+            )
+            source = "upstream"
+        else:
+            outline, source = found
+        view = select_outline(
+            outline,
+            under=under_n,
+            articles=include_articles,
+            include_suppl_provisions=include_suppl_provisions,
+        )
+        return _to_json(
+            {
+                "success": True,
+                "source": source,
+                "retrieved_at_utc": datetime.now(timezone.utc).isoformat(),
+                "source_terms": source_terms(),
+                **view,
+            },
+            compact=compact,
+        )
+    except ResponseTooLargeError as exc:
+        return _error_json(str(exc), error_type="ResponseTooLarge")
+    except ValueError as exc:
+        return _error_json(str(exc))
+    except error.URLError as exc:
+        return _error_json(str(exc), error_type="NetworkError")
+    except Exception as exc:  # pragma: no cover
+        return _error_json(str(exc), error_type=type(exc).__name__)
+
+
+@_tool
+@_gated
+async def egov_get_article_history(
+    law_id_or_num: str,
+    elm: str,
+    max_revisions: int = 0,
+    until_revision_id: str = "",
+    compact: bool = False,
+) -> str:
+    """Show how one provision read across the revisions of a law, as distinct versions.
+
+    `elm` is a path such as `MainProvision-Article[27]` (see
+    egov_get_law_outline). The element is fetched from the newest
+    `max_revisions` revisions (default and upper bound
+    EGOV_LAW_MCP_ARTICLE_HISTORY_MAX_REVISIONS) concurrently, and consecutive
+    revisions with identical text are collapsed into one version with its
+    enforcement dates. Revisions without the element appear as `absent`
+    versions. When older revisions are left out, pass the returned
+    `next_until_revision_id` as `until_revision_id` to continue. Each
+    uncached revision counts against the rate limit.
+    """
+    from .article_history import (
+        ABSENT_STATUSES,
+        build_timeline,
+        element_from_payload,
+        element_query,
+        law_ref_of,
+        ordered_revisions,
+        revision_window,
+        stored_elements,
+    )
+
     try:
-        await _enforce_rate_limit("egov_get_law_revisions")
         law_ref = _validate_law_ref("law_id_or_num", law_id_or_num)
-        path = f"/law_revisions/{parse.quote(law_ref, safe='')}"
-        query = {
-            "law_title": _validate_optional_text("law_title", law_title),
-            "amendment_law_title": _validate_optional_text("amendment_law_title", amendment_law_title),
-            "response_format": _validate_response_format(response_format),
-        }
-        return await _request_json_endpoint(path, query)
+        elm_n = _validate_required_text("elm", elm, max_len=MAX_ID_CHARS)
+        until_n = _validate_optional_text("until_revision_id", until_revision_id, max_len=MAX_ID_CHARS) or ""
+        if not 0 <= max_revisions <= ARTICLE_HISTORY_MAX_REVISIONS:
+            raise ValueError(
+                f"max_revisions must be between 1 and {ARTICLE_HISTORY_MAX_REVISIONS} "
+                "(EGOV_LAW_MCP_ARTICLE_HISTORY_MAX_REVISIONS, at most EGOV_LAW_MCP_RATE_LIMIT_PER_MINUTE - 1), "
+                "or 0 for the limit. Page with until_revision_id, or use `egov-law article-history`."
+            )
+        path, query = _law_revisions_query(law_id_or_num=law_ref_of(law_ref))
+        if not _is_cached(path, query):
+            await _enforce_rate_limit("egov_get_article_history")
+        response = await _call_json_endpoint(path, query)
+        if response.status >= 400:
+            return _response_json(path, response, compact=compact)
+        history, revisions = ordered_revisions(_decode_response_payload(response.headers, response.body))
+        revisions, earlier = revision_window(revisions, max_revisions or ARTICLE_HISTORY_MAX_REVISIONS, until_n)
+        revision_ids = [revision.law_revision_id for revision in revisions]
+        elements: dict[str, Any] = dict(await asyncio.to_thread(stored_elements, revision_ids, elm_n))
+        sources = {"article_store": len(elements), "cache": 0, "upstream": 0}
+        planned = [
+            (revision_id, *element_query(revision_id, elm_n))
+            for revision_id in revision_ids
+            if revision_id not in elements
+        ]
+        uncached = sum(1 for _, path, query in planned if not _is_cached(path, query))
+        if uncached:
+            await _enforce_rate_limit("egov_get_article_history", cost=uncached)
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+        async def fetch(revision_id: str, path: str, query: dict[str, Any]) -> None:
+            async with semaphore:
+                fetched = await _call_json_endpoint(path, query)
+            sources["cache" if fetched.from_cache else "upstream"] += 1
+            if fetched.status in ABSENT_STATUSES:
+                elements[revision_id] = None
+            elif fetched.status >= 400:
+                raise ValueError(f"HTTP {fetched.status} while fetching {elm_n} of {revision_id}: {fetched.url}")
+            else:
+                elements[revision_id] = element_from_payload(_decode_response_payload(fetched.headers, fetched.body))
+
+        await asyncio.gather(*(fetch(*item) for item in planned))
+        timeline = build_timeline(history, revisions, elm_n, elements, sources, earlier)
+        return _to_json(
+            {
+                "success": True,
+                "retrieved_at_utc": datetime.now(timezone.utc).isoformat(),
+                "source_terms": source_terms(),
+                **timeline,
+            },
+            compact=compact,
+        )
+    except ResponseTooLargeError as exc:
+        return _error_json(str(exc), error_type="ResponseTooLarge")
     except ValueError as exc:
         return _error_json(str(exc))
     except error.URLError as exc:
@@ -351,7 +995,8 @@ async def egov_get_law_revisions(
         return _error_json(str(exc), error_type=type(exc).__name__)
 
 
-@mcp.tool()
+@_tool
+@_gated
 async def egov_download_law_file(
     file_type: str,
     law_id_or_num_or_revision_id: str,
@@ -396,6 +1041,8 @@ async def egov_download_law_file(
                 "bytes": len(response.body),
             }
         )
+    except ResponseTooLargeError as exc:
+        return _error_json(str(exc), error_type="ResponseTooLarge")
     except ValueError as exc:
         return _error_json(str(exc))
     except error.URLError as exc:
@@ -404,7 +1051,8 @@ async def egov_download_law_file(
         return _error_json(str(exc), error_type=type(exc).__name__)
 
 
-@mcp.tool()
+@_tool
+@_gated
 async def egov_download_attachment(
     law_revision_id: str,
     src: str = "",
@@ -448,6 +1096,8 @@ async def egov_download_attachment(
                 "bytes": len(response.body),
             }
         )
+    except ResponseTooLargeError as exc:
+        return _error_json(str(exc), error_type="ResponseTooLarge")
     except ValueError as exc:
         return _error_json(str(exc))
     except error.URLError as exc:
@@ -456,8 +1106,556 @@ async def egov_download_attachment(
         return _error_json(str(exc), error_type=type(exc).__name__)
 
 
-def main() -> None:
-    mcp.run()
+@_tool
+@_gated
+async def egov_archive_revision(
+    law_revision_id: str,
+    output_dir: str,
+    file_types: list[str] | None = None,
+    include_attachments: bool = True,
+) -> str:
+    """Download a revision's law files and every attachment concurrently into output_dir.
+
+    file_types defaults to ["xml"] (also: json, html, rtf, docx). Identical
+    files are stored once. Writes output_dir/manifest.json with sizes and
+    SHA-256 checksums and returns its totals. Each download counts against
+    the rate limit; at most EGOV_LAW_MCP_ARCHIVE_MAX_FILES files per call.
+    """
+    from .archive import plan_archive, run_archive
+
+    try:
+        law_revision_id_n = _validate_law_ref("law_revision_id", law_revision_id)
+        output_dir_n = _validate_required_text("output_dir", output_dir)
+        types = [_validate_file_type(file_type) for file_type in file_types or ["xml"]]
+        if include_attachments and not _is_cached(
+            f"/law_data/{parse.quote(law_revision_id_n, safe='')}", {"response_format": "json"}
+        ):
+            await _enforce_rate_limit("egov_archive_revision")
+        plan = await asyncio.to_thread(
+            plan_archive,
+            law_revision_id_n,
+            file_types=types,
+            attachments=include_attachments,
+            base_url=DEFAULT_BASE_URL,
+            timeout=DEFAULT_TIMEOUT,
+        )
+        if len(plan.jobs) > ARCHIVE_MAX_FILES:
+            raise ValueError(
+                f"Revision has {len(plan.jobs)} files to download; the limit is {ARCHIVE_MAX_FILES} "
+                "(EGOV_LAW_MCP_ARCHIVE_MAX_FILES, at most EGOV_LAW_MCP_RATE_LIMIT_PER_MINUTE - 1). "
+                "Use `egov-law archive` for large revisions."
+            )
+        await _enforce_rate_limit("egov_archive_revision", cost=len(plan.jobs))
+        manifest = await asyncio.to_thread(
+            run_archive,
+            plan,
+            Path(output_dir_n).expanduser(),
+            workers=ARCHIVE_WORKERS,
+            base_url=DEFAULT_BASE_URL,
+            timeout=DEFAULT_TIMEOUT,
+        )
+        failed = [
+            {"file": item.get("file_type") or item.get("src"), "error": item["error"]}
+            for item in manifest["files"]
+            if "error" in item
+        ]
+        return _to_json(
+            {
+                "success": not failed,
+                "law_revision_id": law_revision_id_n,
+                "manifest": str((Path(output_dir_n).expanduser() / "manifest.json").resolve()),
+                "retrieved_at_utc": manifest["retrieved_at_utc"],
+                "totals": manifest["totals"],
+                "elapsed_ms": manifest["elapsed_ms"],
+                "failed": failed[:20],
+                "source_terms": source_terms(),
+            }
+        )
+    except ResponseTooLargeError as exc:
+        return _error_json(str(exc), error_type="ResponseTooLarge")
+    except ValueError as exc:
+        return _error_json(str(exc))
+    except error.URLError as exc:
+        return _error_json(str(exc), error_type="NetworkError")
+    except Exception as exc:  # pragma: no cover
+        return _error_json(str(exc), error_type=type(exc).__name__)
+
+
+def _schedule_prefetch(path: str, query: dict[str, Any]) -> None:
+    """Queue a background fetch unless it is cached, already queued, or the queue is full."""
+    if not PREFETCH_ENABLED or _prefetch_queue is None or not response_cache.enabled:
+        return
+    url = build_url(DEFAULT_BASE_URL, path, query)
+    if url in _prefetch_seen or response_cache.contains(url, _JSON_ACCEPT):
+        return
+    try:
+        _prefetch_queue.put_nowait((path, query))
+    except asyncio.QueueFull:
+        return
+    _prefetch_seen.add(url)
+
+
+def _schedule_law_prefetch(law_id: str, elms: list[str] | None = None, *, full_text: bool = True) -> None:
+    """Queue revisions and law text for law_id, using the same queries the tools would send."""
+    _schedule_prefetch(*_law_revisions_query(law_id_or_num=law_id))
+    if full_text:
+        _schedule_prefetch(*_law_data_query(law_id_or_num_or_revision_id=law_id, elm=PREFETCH_ELM))
+    for elm in elms or []:
+        _schedule_prefetch(*_law_data_query(law_id_or_num_or_revision_id=law_id, elm=elm))
+
+
+async def _acquire_background_rate_slot() -> None:
+    """Wait until interactive calls leave headroom, then take one slot in the shared rate window."""
+    budget = max(1, int(RATE_LIMIT_PER_MINUTE * PREFETCH_RATE_SHARE))
+    while True:
+        async with _rate_lock:
+            now = time.monotonic()
+            _prune_window(_rate_window, now)
+            if _tool_gate.queued == 0 and not scheduler.interactive_waiting() and len(_rate_window) < budget:
+                _rate_window.append(now)
+                return
+        await asyncio.sleep(1.0)
+
+
+async def _prefetch_worker() -> None:
+    assert _prefetch_queue is not None
+    while True:
+        path, query = await _prefetch_queue.get()
+        try:
+            await _acquire_background_rate_slot()
+            await _call_json_endpoint(path, query, priority=PREFETCH)
+        except Exception:  # noqa: BLE001 - prefetch is best effort, PreemptedError included
+            pass
+        finally:
+            _prefetch_seen.discard(build_url(DEFAULT_BASE_URL, path, query))
+            _prefetch_queue.task_done()
+
+
+def _load_warm_list(path: Path) -> list[dict[str, Any]]:
+    """Load warm-list entries: a JSON list (or {"scopes": [...]}) of law_id/law_title objects."""
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    entries = payload.get("scopes") if isinstance(payload, dict) else payload
+    if not isinstance(entries, list):
+        raise ValueError(f"Warm list must be a JSON list or an object with 'scopes': {path}")
+    return [entry for entry in entries if isinstance(entry, dict)]
+
+
+async def _resolve_law_id(law_title: str) -> str | None:
+    await _acquire_background_rate_slot()
+    response = await _call_json_endpoint(*_search_law_query(law_title=law_title), priority=PREFETCH)
+    if response.status >= 400:
+        return None
+    laws = parse_laws(_decode_response_payload(response.headers, response.body))
+    if not laws:
+        return None
+    best = next((law for law in laws if law.law_title == law_title), laws[0])
+    return best.law_id or None
+
+
+async def _warm_up(entries: list[dict[str, Any]]) -> None:
+    for entry in entries:
+        try:
+            law_id = entry.get("law_id") or await _resolve_law_id(str(entry.get("law_title") or ""))
+        except Exception:  # noqa: BLE001 - warm-up is best effort
+            continue
+        if not law_id:
+            continue
+        elms = entry.get("elm") or []
+        _schedule_law_prefetch(
+            str(law_id),
+            [elms] if isinstance(elms, str) else [str(elm) for elm in elms],
+            full_text=bool(entry.get("full_text", True)),
+        )
+
+
+def _start_background_prefetch() -> None:
+    """Start the prefetch worker and queue the configured warm list (call inside the server loop)."""
+    global _prefetch_queue, _prefetch_task
+    if not PREFETCH_ENABLED or not response_cache.enabled or _prefetch_task is not None:
+        return
+    _prefetch_queue = asyncio.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+    _prefetch_task = asyncio.create_task(_prefetch_worker())
+    if WARM_LIST_PATH:
+        try:
+            entries = _load_warm_list(Path(WARM_LIST_PATH).expanduser())
+        except (OSError, ValueError) as exc:
+            # Warm-up is best effort: report the bad list and serve without it.
+            print(f"egov-law-mcp: warm list ignored: {exc}", file=sys.stderr)
+            return
+        _background_tasks.add(asyncio.create_task(_warm_up(entries)))
+
+
+def _prefetch_from_search(data: Any) -> None:
+    """Predictive prefetch: after a /laws hit, queue the top law's revisions and text."""
+    if _prefetch_queue is None:
+        return
+    laws = parse_laws(data)
+    if laws and laws[0].law_id:
+        _schedule_law_prefetch(laws[0].law_id)
+
+
+def _validate_batch_item(
+    index: int, item: Any
+) -> tuple[str, str, dict[str, Any], list[tuple[str, ...]]]:
+    if not isinstance(item, dict):
+        raise ValueError(f"requests[{index}] must be an object.")
+    params = {k: v for k, v in item.items() if k not in {"op", "id", "fields"}}
+    op = item.get("op")
+    builder = _BATCH_OPERATIONS.get(op) if isinstance(op, str) else None
+    if builder is None:
+        raise ValueError(f"requests[{index}].op must be one of {', '.join(_BATCH_OPERATIONS)}.")
+    # Builders take keyword-only parameters; those without a default are strings.
+    defaults = getattr(builder, "__wrapped__", builder).__kwdefaults__ or {}
+    for name, value in params.items():
+        expected = type(defaults.get(name, ""))
+        if type(value) is not expected:
+            raise ValueError(f"requests[{index}].{name} must be of type {expected.__name__}.")
+    try:
+        path, query = builder(**params)
+    except (TypeError, AttributeError) as exc:
+        raise ValueError(f"requests[{index}] has invalid parameters for {op}: {exc}") from exc
+    fields = item.get("fields") or ""
+    if not isinstance(fields, str):
+        raise ValueError(f"requests[{index}].fields must be a comma-separated string.")
+    return op, path, query, _validate_fields(fields, query.get("response_format") or "json")
+
+
+async def _run_batch_item(
+    path: str,
+    query: dict[str, Any],
+    fields: list[tuple[str, ...]],
+    semaphore: asyncio.Semaphore,
+) -> dict[str, Any]:
+    async with semaphore:
+        response = await _call_json_endpoint(path, query)
+    if response.status >= 400:
+        return _http_error_payload(
+            endpoint=path, status=response.status, url=response.url, body=response.body, cached=response.from_cache
+        )
+    data = _decode_response_payload(response.headers, response.body)
+    if _needs_full_text_decode(query, fields):
+        data = await asyncio.to_thread(decode_full_text_field, data)
+    if fields:
+        data = project_fields(data, fields)
+    return {
+        "success": True,
+        "endpoint": path,
+        "status": response.status,
+        "url": response.url,
+        "cached": response.from_cache,
+        "data": data,
+    }
+
+
+@_tool
+@_gated
+async def egov_batch(
+    requests: list[dict[str, Any]],
+    deadline_seconds: float = 30.0,
+) -> str:
+    """Run several e-Gov lookups concurrently and return one compact envelope.
+
+    Each request is an object with `op` (search_law, keyword_search,
+    get_law_revisions, get_law_data), an optional `id`, and the same parameters
+    as the matching egov_* tool, plus an optional `fields` projection. All valid
+    items draw from the rate limit at once.
+    """
+    try:
+        if not requests:
+            raise ValueError("requests must not be empty.")
+        if len(requests) > MAX_BATCH_ITEMS:
+            raise ValueError(f"requests must contain at most {MAX_BATCH_ITEMS} items.")
+        if deadline_seconds <= 0 or deadline_seconds > MAX_BATCH_DEADLINE_SECONDS:
+            raise ValueError(f"deadline_seconds must be between 0 and {MAX_BATCH_DEADLINE_SECONDS:g}.")
+
+        started = time.perf_counter()
+        results: list[dict[str, Any]] = []
+        planned: list[tuple[dict[str, Any], str, dict[str, Any], list[tuple[str, ...]]]] = []
+        for index, item in enumerate(requests):
+            result: dict[str, Any] = {"index": index}
+            if isinstance(item, dict) and "id" in item:
+                result["id"] = item["id"]
+            try:
+                op, path, query, fields = _validate_batch_item(index, item)
+            except ValueError as exc:
+                result.update({"success": False, "error_type": "ValidationError", "error": _sanitize_text(str(exc))})
+            else:
+                result["op"] = op
+                planned.append((result, path, query, fields))
+            results.append(result)
+
+        if planned:
+            uncached = sum(1 for _, path, query, _ in planned if not _is_cached(path, query))
+            if uncached:
+                await _enforce_rate_limit("egov_batch", cost=uncached)
+            semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+            tasks = {
+                asyncio.create_task(_run_batch_item(path, query, fields, semaphore)): result
+                for result, path, query, fields in planned
+            }
+            done, pending = await asyncio.wait(tasks, timeout=deadline_seconds)
+            for task in pending:
+                task.cancel()
+                tasks[task].update(
+                    {"success": False, "error_type": "DeadlineExceeded", "error": "Batch deadline exceeded."}
+                )
+            for task in done:
+                exc = task.exception()
+                if exc is None:
+                    tasks[task].update(task.result())
+                elif isinstance(exc, error.URLError):
+                    tasks[task].update({"success": False, "error_type": "NetworkError", "error": _sanitize_text(str(exc))})
+                else:
+                    tasks[task].update(
+                        {"success": False, "error_type": type(exc).__name__, "error": _sanitize_text(str(exc))}
+                    )
+
+        succeeded = sum(1 for result in results if result.get("success"))
+        return _to_json(
+            {
+                "success": True,
+                "retrieved_at_utc": datetime.now(timezone.utc).isoformat(),
+                "source_terms": source_terms(),
+                "count": len(results),
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "results": results,
+            },
+            compact=True,
+        )
+    except ValueError as exc:
+        return _error_json(str(exc))
+    except Exception as exc:  # pragma: no cover
+        return _error_json(str(exc), error_type=type(exc).__name__)
+
+
+async def _load_xref_graph() -> XrefGraph:
+    from .xref import XrefGraph
+
+    if not XREF_GRAPH_PATH:
+        raise ValueError("Cross-reference graph is not configured. Set EGOV_LAW_MCP_XREF_GRAPH.")
+    graph_path = Path(XREF_GRAPH_PATH).expanduser()
+    mtime_ns = graph_path.stat().st_mtime_ns
+    cached = _xref_graphs.get(str(graph_path))
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    graph = await asyncio.to_thread(XrefGraph.load, graph_path)
+    _xref_graphs[str(graph_path)] = (mtime_ns, graph)
+    return graph
+
+
+@_tool
+@_gated
+async def egov_xref_query(
+    node: str,
+    direction: Literal["out", "in", "both"] = "out",
+    hops: int = 1,
+    limit: int = 20,
+) -> str:
+    """Follow article cross-references (cites / cited by / k-hop) in the local xref graph."""
+    from .xref import DIRECTIONS, MAX_HOPS
+
+    try:
+        node_n = _validate_required_text("node", node, max_len=MAX_ID_CHARS)
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(DIRECTIONS)}.")
+        if hops < 1 or hops > MAX_HOPS:
+            raise ValueError(f"hops must be between 1 and {MAX_HOPS}.")
+        graph = await _load_xref_graph()
+        started = time.perf_counter()
+        result = graph.query(node_n, direction=direction, hops=hops, limit=_validate_limit(limit))
+        return _to_json(
+            {
+                "success": True,
+                "graph": XREF_GRAPH_PATH,
+                "query_ms": round((time.perf_counter() - started) * 1000, 3),
+                "source_terms": source_terms(),
+                **result,
+            }
+        )
+    except (ValueError, OSError) as exc:
+        return _error_json(str(exc))
+    except Exception as exc:  # pragma: no cover
+        return _error_json(str(exc), error_type=type(exc).__name__)
+
+
+@_tool
+@_gated
+async def egov_multi_keyword_search(
+    terms: list[str],
+    law_ids: list[str] | None = None,
+    max_hits_per_term: int = 20,
+    context_chars: int = 40,
+) -> str:
+    """Search many terms at once in the local law mirror (one Aho-Corasick pass per law).
+
+    Returns, per term, the total hit count, number of laws hit, and up to
+    max_hits_per_term hits with law_id, article path, and a context snippet.
+    Restrict the scan with law_ids. Requires EGOV_LAW_MCP_MIRROR_DIR.
+    """
+    global _search_pool
+    from .multi_search import MAX_TERMS, multi_search
+
+    try:
+        if not MIRROR_DIR:
+            raise ValueError("Law mirror is not configured. Set EGOV_LAW_MCP_MIRROR_DIR.")
+        if not terms or len(terms) > MAX_TERMS:
+            raise ValueError(f"terms must contain between 1 and {MAX_TERMS} entries.")
+        if context_chars < 0 or context_chars > 200:
+            raise ValueError("context_chars must be between 0 and 200.")
+        ids = [_validate_law_ref("law_ids", law_id) for law_id in law_ids or []]
+        if _search_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Forking this threaded server can deadlock a worker on a lock held by another thread.
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _search_pool = ProcessPoolExecutor(
+                max_workers=SEARCH_WORKERS, mp_context=multiprocessing.get_context(method)
+            )
+        started = time.perf_counter()
+        result = await asyncio.to_thread(
+            multi_search,
+            Path(MIRROR_DIR).expanduser(),
+            terms,
+            law_ids=ids,
+            context_chars=context_chars,
+            max_hits_per_term=_validate_limit(max_hits_per_term),
+            executor=_search_pool,
+        )
+        return _to_json(
+            {
+                "success": True,
+                "mirror_dir": MIRROR_DIR,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "source_terms": source_terms(),
+                **result,
+            },
+            compact=True,
+        )
+    except (ValueError, OSError) as exc:
+        return _error_json(str(exc))
+    except Exception as exc:  # pragma: no cover
+        return _error_json(str(exc), error_type=type(exc).__name__)
+
+
+@_tool
+@_gated
+async def egov_profile_memory(
+    action: Literal["report", "start", "stop", "reset"] = "report",
+    top: int = DEFAULT_TOP_SITES,
+) -> str:
+    """Report or control tracemalloc allocation profiling of tool calls.
+
+    The report lists, per tool, peak and retained traced bytes and response
+    sizes; bytes kept by the decode_bytes, json_parse and serialize stages;
+    and the top allocating call sites since profiling started. start, stop
+    and reset require EGOV_LAW_MCP_PROFILE=1 or manual.
+    """
+    try:
+        if top < 0 or top > MAX_TOP_SITES:
+            raise ValueError(f"top must be between 0 and {MAX_TOP_SITES}.")
+        if action != "report" and PROFILE_MODE == "0":
+            raise ValueError("Profiling is disabled. Set EGOV_LAW_MCP_PROFILE=1 or manual.")
+        if action == "start":
+            profiler.start()
+        elif action == "stop":
+            profiler.stop()
+        elif action == "reset":
+            profiler.reset()
+        elif action != "report":
+            raise ValueError("action must be report, start, stop or reset.")
+        report = await asyncio.to_thread(profiler.report, top)
+        return _to_json({"success": True, "mode": PROFILE_MODE, **report}, compact=True)
+    except ValueError as exc:
+        return _error_json(str(exc))
+    except Exception as exc:  # pragma: no cover
+        return _error_json(str(exc), error_type=type(exc).__name__)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="MCP server for e-Gov Law API v2")
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default=os.environ.get("EGOV_LAW_MCP_TRANSPORT", "stdio"),
+        help="stdio (one client per process) or streamable-http (shared long-running server).",
+    )
+    parser.add_argument("--host", default=os.environ.get("EGOV_LAW_MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("EGOV_LAW_MCP_PORT", "8000")))
+    parser.add_argument(
+        "--allowed-host",
+        action="append",
+        default=[],
+        metavar="HOST:PORT",
+        help="Host header accepted by the HTTP transport (repeatable). Defaults to loopback only.",
+    )
+    parser.add_argument(
+        "--stateless",
+        action="store_true",
+        help="Do not keep per-client MCP sessions on the HTTP transport.",
+    )
+    return parser
+
+
+async def _serve_http(app: Any, host: str, port: int) -> None:
+    import uvicorn
+
+    class _DrainingServer(uvicorn.Server):
+        def handle_exit(self, sig: int, frame: Any) -> None:
+            _tool_gate.start_drain()
+            super().handle_exit(sig, frame)
+
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        log_level=get_server().settings.log_level.lower(),
+        timeout_graceful_shutdown=int(DRAIN_SECONDS),
+    )
+    _start_background_prefetch()
+    await _DrainingServer(config).serve()
+    await _tool_gate.drain(DRAIN_SECONDS)
+
+
+async def _serve_stdio() -> None:
+    _start_background_prefetch()
+    await get_server().run_stdio_async()
+
+
+def _shutdown_search_pool() -> None:
+    global _search_pool
+    if _search_pool is not None:
+        _search_pool.shutdown(cancel_futures=True)
+        _search_pool = None
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.transport == "stdio":
+        try:
+            asyncio.run(_serve_stdio())
+        finally:
+            _shutdown_search_pool()
+        return
+    server = get_server()
+    server.settings.host = args.host
+    server.settings.port = args.port
+    server.settings.stateless_http = args.stateless
+    if args.allowed_host:
+        from mcp.server.transport_security import TransportSecuritySettings
+
+        server.settings.transport_security = TransportSecuritySettings(
+            enable_dns_rebinding_protection=True,
+            allowed_hosts=args.allowed_host,
+            allowed_origins=[f"http://{allowed}" for allowed in args.allowed_host],
+        )
+    app = server.streamable_http_app() if args.transport == "streamable-http" else server.sse_app()
+    try:
+        asyncio.run(_serve_http(app, args.host, args.port))
+    finally:
+        _shutdown_search_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,197 @@
+"""Multi-term search over mirrored law text with one Aho-Corasick pass per law."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from .export import iter_input_files
+from .law_xml import ids_from_filename, iter_articles, load_law_document
+
+MAX_TERMS = 256
+MAX_TERM_CHARS = 200
+DEFAULT_CONTEXT_CHARS = 40
+DEFAULT_MAX_HITS_PER_TERM = 50
+FILES_PER_TASK = 16
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton: finds every occurrence of every term in one scan."""
+
+    def __init__(self, terms: Sequence[str]) -> None:
+        self.terms = list(terms)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        for index, term in enumerate(self.terms):
+            state = 0
+            for char in term:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int]]:
+        """Yield (start offset, term index) for every match, overlaps included."""
+        goto, fail, out, terms = self._goto, self._fail, self._out, self.terms
+        state = 0
+        for pos, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                yield pos - len(terms[index]) + 1, index
+
+
+def normalize_terms(terms: Sequence[str]) -> list[str]:
+    """Strip, drop empties and duplicates (keeping order), and enforce limits."""
+    seen: dict[str, None] = {}
+    for term in terms:
+        term = term.strip()
+        if not term:
+            continue
+        if len(term) > MAX_TERM_CHARS:
+            raise ValueError(f"Term is too long (max {MAX_TERM_CHARS} chars): {term[:20]}...")
+        seen.setdefault(term, None)
+    if not seen:
+        raise ValueError("At least one non-empty term is required.")
+    if len(seen) > MAX_TERMS:
+        raise ValueError(f"At most {MAX_TERMS} terms are supported.")
+    return list(seen)
+
+
+@lru_cache(maxsize=8)
+def _automaton(terms: tuple[str, ...]) -> AhoCorasick:
+    return AhoCorasick(terms)
+
+
+def _snippet(text: str, start: int, end: int, context_chars: int) -> str:
+    return " ".join(text[max(0, start - context_chars):end + context_chars].split())
+
+
+def scan_law_file(
+    path: str,
+    terms: tuple[str, ...],
+    *,
+    context_chars: int = DEFAULT_CONTEXT_CHARS,
+    max_hits_per_term: int = DEFAULT_MAX_HITS_PER_TERM,
+) -> dict[str, Any]:
+    """Scan one mirrored law file and return hits and counts per term index."""
+    automaton = _automaton(terms)
+    doc = load_law_document(Path(path))
+    counts = [0] * len(terms)
+    hits: dict[int, list[dict[str, Any]]] = {}
+    for article in iter_articles(doc):
+        text = article.text
+        for start, index in automaton.iter_matches(text):
+            counts[index] += 1
+            if counts[index] > max_hits_per_term:
+                continue
+            hits.setdefault(index, []).append(
+                {
+                    "path": article.path,
+                    "article_num": article.article_num,
+                    "offset": start,
+                    "context": _snippet(text, start, start + len(terms[index]), context_chars),
+                }
+            )
+    return {"law_id": doc.law_id, "law_title": doc.law_title, "counts": counts, "hits": hits}
+
+
+def _scan_files(
+    paths: list[str], terms: tuple[str, ...], context_chars: int, max_hits_per_term: int
+) -> list[dict[str, Any]]:
+    results = []
+    for path in paths:
+        try:
+            results.append(
+                scan_law_file(path, terms, context_chars=context_chars, max_hits_per_term=max_hits_per_term)
+            )
+        except (OSError, ValueError) as exc:
+            results.append({"path": path, "error": str(exc)})
+    return results
+
+
+def select_files(input_dir: Path, law_ids: Sequence[str] = ()) -> list[str]:
+    """List mirrored files, optionally only those whose file name carries one of law_ids."""
+    if not input_dir.is_dir():
+        raise ValueError(f"Input directory not found: {input_dir}")
+    wanted = {law_id.strip() for law_id in law_ids if law_id.strip()}
+    return [
+        str(path)
+        for path in iter_input_files(input_dir)
+        if not wanted or ids_from_filename(path)[0] in wanted
+    ]
+
+
+def multi_search(
+    input_dir: Path,
+    terms: Sequence[str],
+    *,
+    law_ids: Sequence[str] = (),
+    workers: int | None = None,
+    context_chars: int = DEFAULT_CONTEXT_CHARS,
+    max_hits_per_term: int = DEFAULT_MAX_HITS_PER_TERM,
+    executor: Executor | None = None,
+) -> dict[str, Any]:
+    """Search every term in every selected law, parallelized across laws.
+
+    Returns per-term totals and up to max_hits_per_term hits (law, article path,
+    offset, context snippet) in corpus order.
+    """
+    normalized = tuple(normalize_terms(terms))
+    paths = select_files(input_dir, law_ids)
+    chunks = [paths[i:i + FILES_PER_TASK] for i in range(0, len(paths), FILES_PER_TASK)]
+    args = (normalized, context_chars, max_hits_per_term)
+    if executor is not None:
+        batches = list(executor.map(_scan_files, chunks, *[[arg] * len(chunks) for arg in args]))
+    elif len(chunks) <= 1:
+        batches = [_scan_files(chunk, *args) for chunk in chunks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(_scan_files, chunks, *[[arg] * len(chunks) for arg in args]))
+
+    per_term: list[dict[str, Any]] = [{"term": term, "total": 0, "laws": 0, "hits": []} for term in normalized]
+    errors: list[dict[str, str]] = []
+    for batch in batches:
+        for law in batch:
+            if "error" in law:
+                errors.append(law)
+                continue
+            for index, count in enumerate(law["counts"]):
+                if not count:
+                    continue
+                entry = per_term[index]
+                entry["total"] += count
+                entry["laws"] += 1
+                room = max_hits_per_term - len(entry["hits"])
+                for hit in law["hits"].get(index, [])[:room]:
+                    entry["hits"].append({"law_id": law["law_id"], "law_title": law["law_title"], **hit})
+    return {
+        "terms": list(normalized),
+        "laws_scanned": len(paths) - len(errors),
+        "errors": errors,
+        "results": per_term,
+    }
@@ -0,0 +1,344 @@
+"""Law outlines: the Part/Chapter/Section/Article hierarchy with elm paths, cached per revision.
+
+An outline lists every structure node and article with its number, title,
+caption, and the `elm` path that /law_data accepts (paths as in
+law_xml.iter_articles), so a caller can navigate a law in a few kilobytes
+and then fetch only the articles it needs.
+
+Outlines are built once per law_revision_id from the full text and kept in
+an in-process LRU. Revision contents never change, so when
+EGOV_LAW_API_OUTLINE_DIR is set they are also written there as
+`<law_revision_id>.json` and shared by every process. The full text comes
+from the article store (EGOV_LAW_API_ARTICLE_STORE) when it holds the
+revision, otherwise from /law_file/xml, which bypasses the response cache.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Any
+from urllib import parse
+from xml.etree import ElementTree as ET
+
+from .api_client import (
+    DEFAULT_BASE_URL,
+    DEFAULT_TIMEOUT,
+    RateLimiter,
+    decode_bytes,
+    parse_json_text,
+    request_endpoint,
+)
+from .law_xml import STRUCTURE_TAGS, LawDocument, element_text, law_document_from_element
+from .records import RevisionHistory, is_revision_id
+
+OUTLINE_DIR = os.environ.get("EGOV_LAW_API_OUTLINE_DIR", "").strip()
+OUTLINE_CACHE_ENTRIES = int(os.environ.get("EGOV_LAW_API_OUTLINE_CACHE_ENTRIES", "256"))
+
+if OUTLINE_CACHE_ENTRIES < 1:
+    OUTLINE_CACHE_ENTRIES = 256
+
+
+def _clean(value: str) -> str:
+    return " ".join(value.split())
+
+
+def _segment(tag: str, num: str | None) -> str:
+    return f"{tag}[{num}]" if num else tag
+
+
+def _node(kind: str, elm: str, num: str | None, title: str, caption: str = "") -> dict[str, Any]:
+    node: dict[str, Any] = {"type": kind, "elm": elm}
+    if num:
+        node["num"] = num
+    if title:
+        node["title"] = title
+    if caption:
+        node["caption"] = caption
+    return node
+
+
+def _walk(elem: ET.Element, path: str) -> tuple[list[dict[str, Any]], int]:
+    """Outline nodes for the children of a provision or structure element, and its article count."""
+    nodes: list[dict[str, Any]] = []
+    articles = 0
+    for child in elem:
+        num = child.get("Num")
+        elm = f"{path}-{_segment(child.tag, num)}"
+        if child.tag in STRUCTURE_TAGS:
+            title = child.find(f"{child.tag}Title")
+            node = _node(child.tag, elm, num, element_text(title) if title is not None else "")
+            node["children"], node["article_count"] = _walk(child, elm)
+            articles += node["article_count"]
+            nodes.append(node)
+        elif child.tag == "Article":
+            nodes.append(
+                _node(
+                    "Article",
+                    elm,
+                    num,
+                    _clean(child.findtext("ArticleTitle") or ""),
+                    _clean(child.findtext("ArticleCaption") or ""),
+                )
+            )
+            articles += 1
+        elif child.tag == "Paragraph":
+            # Laws without articles: list their paragraphs instead.
+            nodes.append(_node("Paragraph", elm, num, _clean(child.findtext("ParagraphNum") or "")))
+    return nodes, articles
+
+
+def build_outline(doc: LawDocument) -> dict[str, Any]:
+    """Outline of one revision: main provision tree plus one entry per supplementary provision."""
+    body = doc.root.find("LawBody")
+    main: list[dict[str, Any]] = []
+    main_articles = 0
+    suppl: list[dict[str, Any]] = []
+    for provision in body if body is not None else ():
+        if provision.tag == "MainProvision":
+            main, main_articles = _walk(provision, "MainProvision")
+        elif provision.tag == "SupplProvision":
+            elm = _segment("SupplProvision", str(len(suppl) + 1))
+            children, articles = _walk(provision, elm)
+            entry = _node("SupplProvision", elm, None, _clean(provision.findtext("SupplProvisionLabel") or ""))
+            if provision.get("AmendLawNum"):
+                entry["amend_law_num"] = provision.get("AmendLawNum")
+            entry["article_count"] = articles
+            entry["children"] = children
+            suppl.append(entry)
+    return {
+        "law_id": doc.law_id,
+        "law_revision_id": doc.law_revision_id,
+        "law_num": doc.law_num,
+        "law_title": doc.law_title,
+        "article_count": main_articles,
+        "main_provision": main,
+        "suppl_provisions": suppl,
+    }
+
+
+def _without_articles(nodes: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    kept = []
+    for node in nodes:
+        if node["type"] in ("Article", "Paragraph"):
+            continue
+        children = _without_articles(node.get("children") or [])
+        node = {key: value for key, value in node.items() if key != "children"}
+        if children:
+            node["children"] = children
+        kept.append(node)
+    return kept
+
+
+def _find_node(nodes: list[dict[str, Any]], elm: str) -> dict[str, Any] | None:
+    for node in nodes:
+        if node["elm"] == elm:
+            return node
+        if elm.startswith(f"{node['elm']}-") and "children" in node:
+            return _find_node(node["children"], elm)
+    return None
+
+
+def select_outline(
+    outline: dict[str, Any],
+    *,
+    under: str = "",
+    articles: bool = True,
+    include_suppl_provisions: bool = False,
+) -> dict[str, Any]:
+    """A view of a cached outline.
+
+    under: only the subtree at this elm (for example `MainProvision-Chapter[2]`),
+    returned as `node`. articles=False keeps structure nodes and their
+    article_count only. Supplementary provisions are listed by label and count
+    unless include_suppl_provisions is set.
+    """
+    header = {key: outline[key] for key in ("law_id", "law_revision_id", "law_num", "law_title", "article_count")}
+    if under:
+        node = _find_node([*outline["main_provision"], *outline["suppl_provisions"]], under)
+        if node is None:
+            raise ValueError(f"No outline node at elm {under!r}.")
+        if not articles and node["type"] not in ("Article", "Paragraph"):
+            node = _without_articles([node])[0]
+        return {**header, "node": node}
+    main = outline["main_provision"] if articles else _without_articles(outline["main_provision"])
+    if include_suppl_provisions:
+        suppl = outline["suppl_provisions"] if articles else _without_articles(outline["suppl_provisions"])
+    else:
+        suppl = [{key: value for key, value in entry.items() if key != "children"} for entry in outline["suppl_provisions"]]
+    return {**header, "main_provision": main, "suppl_provisions": suppl}
+
+
+class OutlineCache:
+    """LRU of outlines by law_revision_id, optionally backed by one JSON file per revision."""
+
+    def __init__(self, max_entries: int = OUTLINE_CACHE_ENTRIES, directory: str | Path = "") -> None:
+        self.max_entries = max_entries
+        self.directory = Path(directory).expanduser() if directory else None
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _file(self, law_revision_id: str) -> Path | None:
+        if self.directory is None:
+            return None
+        return self.directory / f"{parse.quote(law_revision_id, safe='')}.json"
+
+    def get(self, law_revision_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            outline = self._entries.get(law_revision_id)
+            if outline is not None:
+                self._entries.move_to_end(law_revision_id)
+                self.hits += 1
+                return outline
+        path = self._file(law_revision_id)
+        if path is not None and path.exists():
+            try:
+                outline = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                outline = None
+            if isinstance(outline, dict):
+                self._remember(law_revision_id, outline)
+                with self._lock:
+                    self.hits += 1
+                return outline
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, law_revision_id: str, outline: dict[str, Any]) -> None:
+        self._remember(law_revision_id, outline)
+        path = self._file(law_revision_id)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(outline, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _remember(self, law_revision_id: str, outline: dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[law_revision_id] = outline
+            self._entries.move_to_end(law_revision_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "directory": str(self.directory) if self.directory else None,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+outline_cache = OutlineCache(OUTLINE_CACHE_ENTRIES, OUTLINE_DIR)
+
+
+def revision_in_force(payload: Any, asof: str = "") -> str:
+    """law_revision_id in force on asof (default: today) from a /law_revisions payload."""
+    history = RevisionHistory.from_dict(payload if isinstance(payload, dict) else {})
+    revision = history.in_force(asof or date.today())
+    if revision is None or not revision.law_revision_id:
+        law_id = history.info.law_id or "this law"
+        raise ValueError(f"No revision of {law_id} is in force on {asof or 'today'}.")
+    return revision.law_revision_id
+
+
+def resolve_revision_id(
+    law_ref: str,
+    asof: str = "",
+    *,
+    base_url: str = DEFAULT_BASE_URL,
+    timeout: float = DEFAULT_TIMEOUT,
+    rate_limiter: RateLimiter | None = None,
+) -> str:
+    """law_revision_id for a law ID or number on asof; revision IDs are returned as they are."""
+    if is_revision_id(law_ref):
+        return law_ref
+    response = request_endpoint(
+        f"/law_revisions/{parse.quote(law_ref, safe='')}",
+        {"response_format": "json"},
+        base_url=base_url,
+        timeout=timeout,
+        rate_limiter=rate_limiter,
+    )
+    if response.status >= 400:
+        raise ValueError(f"HTTP {response.status} while listing revisions: {response.url}")
+    return revision_in_force(parse_json_text(decode_bytes(response.body)), asof)
+
+
+def _load_from_store(law_revision_id: str) -> LawDocument | None:
+    from .article_store import ARTICLE_STORE_PATH, ArticleStore
+
+    if not ARTICLE_STORE_PATH or not Path(ARTICLE_STORE_PATH).expanduser().exists():
+        return None
+    store = ArticleStore(ARTICLE_STORE_PATH)
+    try:
+        if not store.has_revision(law_revision_id):
+            return None
+        return store.load_document(law_revision_id)
+    finally:
+        store.close()
+
+
+def cached_outline(law_revision_id: str) -> tuple[dict[str, Any], str] | None:
+    """(outline, source) without any upstream request: from the cache, else from the article store."""
+    outline = outline_cache.get(law_revision_id)
+    if outline is not None:
+        return outline, "cache"
+    doc = _load_from_store(law_revision_id)
+    if doc is None:
+        return None
+    outline = build_outline(doc)
+    outline_cache.put(law_revision_id, outline)
+    return outline, "article_store"
+
+
+def fetch_outline(
+    law_revision_id: str,
+    *,
+    base_url: str = DEFAULT_BASE_URL,
+    timeout: float = DEFAULT_TIMEOUT,
+    rate_limiter: RateLimiter | None = None,
+) -> dict[str, Any]:
+    """Build and cache an outline from /law_file/xml (not kept in the response cache)."""
+    response = request_endpoint(
+        f"/law_file/xml/{parse.quote(law_revision_id, safe='')}",
+        base_url=base_url,
+        timeout=timeout,
+        accept="application/xml",
+        use_cache=False,
+        rate_limiter=rate_limiter,
+    )
+    if response.status >= 400:
+        raise ValueError(f"HTTP {response.status} while fetching the law file: {response.url}")
+    doc = law_document_from_element(
+        ET.fromstring(bytes(response.body)),
+        law_id=law_revision_id.split("_", 1)[0],
+        law_revision_id=law_revision_id,
+    )
+    outline = build_outline(doc)
+    outline_cache.put(law_revision_id, outline)
+    return outline
+
+
+def load_outline(
+    law_revision_id: str,
+    *,
+    base_url: str = DEFAULT_BASE_URL,
+    timeout: float = DEFAULT_TIMEOUT,
+    rate_limiter: RateLimiter | None = None,
+) -> tuple[dict[str, Any], str]:
+    """Return (outline, source) where source is "cache", "article_store" or "upstream"."""
+    found = cached_outline(law_revision_id)
+    if found is not None:
+        return found
+    return fetch_outline(law_revision_id, base_url=base_url, timeout=timeout, rate_limiter=rate_limiter), "upstream"
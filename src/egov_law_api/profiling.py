@@ -0,0 +1,283 @@
+"""Opt-in tracemalloc profiling of MCP tool calls.
+
+When active, every tool call records how far traced memory peaked above its
+starting point and how much it still held on return. Named stages inside a
+call (such as decode_bytes, json_parse, serialize) record the bytes they
+allocated, and a report ranks the call sites that grew most since profiling
+started. When inactive, call() and stage() hand back a shared no-op context.
+
+EGOV_LAW_MCP_PROFILE: "0" (default, off), "1" (trace from startup), or
+"manual" (off until started through the profiling tool). tracemalloc itself
+is imported only when profiling starts.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ContextManager, Iterator
+
+if TYPE_CHECKING:
+    import tracemalloc
+
+PROFILE_MODE = os.environ.get("EGOV_LAW_MCP_PROFILE", "0").strip().lower()
+PROFILE_FRAMES = int(os.environ.get("EGOV_LAW_MCP_PROFILE_FRAMES", "1"))
+PROFILE_MODES = ("0", "1", "manual")
+DEFAULT_TOP_SITES = 20
+MAX_TOP_SITES = 100
+
+_NULL_CONTEXT: ContextManager[Any] = nullcontext(None)
+_PACKAGE_DIR = str(Path(__file__).resolve().parent)
+_IGNORED_FILES = (__file__, "<frozen importlib._bootstrap>", "<frozen importlib._bootstrap_external>")
+
+if PROFILE_MODE not in PROFILE_MODES:
+    PROFILE_MODE = "0"
+if PROFILE_FRAMES < 1:
+    PROFILE_FRAMES = 1
+
+
+class CallRecord:
+    """Mutable per-call sample; the tool wrapper fills in response_bytes."""
+
+    __slots__ = ("tool", "start_bytes", "session", "response_bytes", "overlapped")
+
+    def __init__(self, tool: str, start_bytes: int, session: int) -> None:
+        self.tool = tool
+        self.start_bytes = start_bytes
+        self.session = session
+        self.response_bytes = 0
+        self.overlapped = False
+
+
+def _new_tool_stats() -> dict[str, Any]:
+    return {
+        "calls": 0,
+        "overlapped_calls": 0,
+        "peak_bytes_max": 0,
+        "peak_bytes_sum": 0,
+        "retained_bytes_max": 0,
+        "retained_bytes_sum": 0,
+        "response_bytes_max": 0,
+        "response_bytes_sum": 0,
+    }
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_PACKAGE_DIR):
+        return f"egov_law_api{filename[len(_PACKAGE_DIR):]}"
+    marker = "site-packages/"
+    index = filename.rfind(marker)
+    return filename[index + len(marker):] if index >= 0 else filename
+
+
+def max_rss_bytes() -> int | None:
+    """Peak resident set size of this process, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class AllocationProfiler:
+    """Per-tool and per-stage allocation statistics backed by tracemalloc."""
+
+    def __init__(self, frames: int = 1) -> None:
+        self.frames = max(1, frames)
+        self.active = False
+        self._lock = threading.Lock()
+        self._running: set[CallRecord] = set()
+        self._tools: dict[str, dict[str, Any]] = {}
+        self._stages: dict[str, dict[str, int]] = {}
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._started_at = 0.0
+        self._owns_tracemalloc = False
+        # Bumped by start(): byte counters from different tracing sessions don't compare.
+        self._session = 0
+
+    def start(self, frames: int | None = None) -> None:
+        import tracemalloc
+
+        if self.active:
+            return
+        if frames is not None:
+            self.frames = max(1, frames)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._owns_tracemalloc = True
+        self._session += 1
+        self.active = True
+        self.reset()
+
+    def stop(self) -> None:
+        """Stop tracing; collected statistics stay available to report()."""
+        self.active = False
+        if self._owns_tracemalloc:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        self._baseline = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+            self._stages.clear()
+        self._started_at = time.time()
+        if self.active:
+            self._baseline = self._snapshot()
+
+    def _tracing(self, session: int) -> bool:
+        """Whether the tracing session a sample started in is still running."""
+        import tracemalloc
+
+        return self.active and session == self._session and tracemalloc.is_tracing()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        import tracemalloc
+
+        ignored = (tracemalloc.__file__, *_IGNORED_FILES)
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, name) for name in ignored])
+
+    def call(self, tool: str) -> ContextManager[CallRecord | None]:
+        """Profile one tool call; a shared no-op context while inactive."""
+        if not self.active:
+            return _NULL_CONTEXT
+        return self._profile_call(tool)
+
+    @contextmanager
+    def _profile_call(self, tool: str) -> Iterator[CallRecord]:
+        import tracemalloc
+
+        with self._lock:
+            record = CallRecord(tool, tracemalloc.get_traced_memory()[0], self._session)
+            if self._running:
+                # The peak counter is process-wide: overlapping calls share one peak.
+                record.overlapped = True
+                for other in self._running:
+                    other.overlapped = True
+            else:
+                tracemalloc.reset_peak()
+            self._running.add(record)
+        try:
+            yield record
+        finally:
+            # stop() may run mid-call (egov_profile_memory itself stops it); once tracing
+            # is off the counters read 0, so the call has nothing meaningful to record.
+            tracing = self._tracing(record.session)
+            current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+            with self._lock:
+                self._running.discard(record)
+                if tracing:
+                    self._record_call(tool, record, current, peak)
+
+    def _record_call(self, tool: str, record: CallRecord, current: int, peak: int) -> None:
+        stats = self._tools.setdefault(tool, _new_tool_stats())
+        stats["calls"] += 1
+        retained = current - record.start_bytes
+        stats["retained_bytes_sum"] += retained
+        stats["retained_bytes_max"] = max(stats["retained_bytes_max"], retained)
+        stats["response_bytes_sum"] += record.response_bytes
+        stats["response_bytes_max"] = max(stats["response_bytes_max"], record.response_bytes)
+        if record.overlapped:
+            stats["overlapped_calls"] += 1
+        else:
+            peak_delta = peak - record.start_bytes
+            stats["peak_bytes_sum"] += peak_delta
+            stats["peak_bytes_max"] = max(stats["peak_bytes_max"], peak_delta)
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """Count the bytes a stage allocates and keeps (for example a decoded str)."""
+        if not self.active:
+            return _NULL_CONTEXT
+        return self._profile_stage(name)
+
+    @contextmanager
+    def _profile_stage(self, name: str) -> Iterator[None]:
+        import tracemalloc
+
+        session = self._session
+        before = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            if self._tracing(session):
+                self._record_stage(name, tracemalloc.get_traced_memory()[0] - before)
+
+    def _record_stage(self, name: str, allocated: int) -> None:
+        with self._lock:
+            stats = self._stages.setdefault(name, {"calls": 0, "bytes_sum": 0, "bytes_max": 0})
+            stats["calls"] += 1
+            stats["bytes_sum"] += allocated
+            stats["bytes_max"] = max(stats["bytes_max"], allocated)
+
+    def top_sites(self, limit: int = DEFAULT_TOP_SITES) -> list[dict[str, Any]]:
+        """Call sites ranked by memory growth since start/reset."""
+        if not self.active or self._baseline is None:
+            return []
+        key_type = "traceback" if self.frames > 1 else "lineno"
+        sites = []
+        for stat in self._snapshot().compare_to(self._baseline, key_type)[:limit]:
+            frames = [f"{_short_path(frame.filename)}:{frame.lineno}" for frame in stat.traceback]
+            sites.append(
+                {
+                    "site": frames[0],
+                    "stack": frames[1:] if key_type == "traceback" else [],
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+            )
+        return sites
+
+    def report(self, top: int = DEFAULT_TOP_SITES) -> dict[str, Any]:
+        with self._lock:
+            tools = {}
+            for tool, stats in self._tools.items():
+                exclusive = stats["calls"] - stats["overlapped_calls"]
+                tools[tool] = {
+                    "calls": stats["calls"],
+                    "overlapped_calls": stats["overlapped_calls"],
+                    "peak_bytes_max": stats["peak_bytes_max"],
+                    "peak_bytes_mean": stats["peak_bytes_sum"] // exclusive if exclusive else 0,
+                    "retained_bytes_max": stats["retained_bytes_max"],
+                    "retained_bytes_mean": stats["retained_bytes_sum"] // stats["calls"],
+                    "response_bytes_max": stats["response_bytes_max"],
+                    "response_bytes_mean": stats["response_bytes_sum"] // stats["calls"],
+                }
+            stages = {
+                name: {**stats, "bytes_mean": stats["bytes_sum"] // stats["calls"]}
+                for name, stats in self._stages.items()
+            }
+        traced: dict[str, int] = {}
+        if self.active:
+            import tracemalloc
+
+            current, peak = tracemalloc.get_traced_memory()
+            traced = {
+                "traced_bytes": current,
+                "traced_peak_bytes": peak,
+                "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory(),
+            }
+        return {
+            "active": self.active,
+            "frames": self.frames,
+            "since": self._started_at or None,
+            **traced,
+            "max_rss_bytes": max_rss_bytes(),
+            "tools": dict(sorted(tools.items(), key=lambda item: -item[1]["peak_bytes_max"])),
+            "stages": dict(sorted(stages.items(), key=lambda item: -item[1]["bytes_sum"])),
+            "top_sites": self.top_sites(min(max(top, 0), MAX_TOP_SITES)),
+        }
+
+
+profiler = AllocationProfiler(PROFILE_FRAMES)
+if PROFILE_MODE == "1":
+    profiler.start()
@@ -0,0 +1,372 @@
+"""Record upstream HTTP exchanges to a gzip JSONL archive and replay them offline.
+
+With EGOV_LAW_API_RECORD set, every network fetch is appended to the archive
+(status, headers, body, start offset, and measured duration). With
+EGOV_LAW_API_REPLAY set, fetches are answered from an archive instead of the
+network, delayed by the recorded duration divided by EGOV_LAW_API_REPLAY_SPEED
+(0 = no delay). EGOV_LAW_API_REPLAY_MATCH selects how requests are matched:
+
+- strict: same normalized URL (sorted query, host included) and Accept header.
+- lenient: path and sorted query only; if nothing matches, the recording for
+  the same path with the most query parameters in common.
+
+Repeated requests get the recorded responses in order; the last one repeats.
+"""
+
+from __future__ import annotations
+
+import atexit
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from urllib import error, parse
+
+from .cache_store import CachedEntry, normalize_cache_key
+
+RECORD_PATH = os.environ.get("EGOV_LAW_API_RECORD", "").strip()
+REPLAY_PATH = os.environ.get("EGOV_LAW_API_REPLAY", "").strip()
+REPLAY_SPEED = float(os.environ.get("EGOV_LAW_API_REPLAY_SPEED", "1.0"))
+REPLAY_MATCH = os.environ.get("EGOV_LAW_API_REPLAY_MATCH", "strict").strip().lower()
+MATCH_POLICIES = ("strict", "lenient")
+ARCHIVE_FORMAT = "egov-law-recording"
+ARCHIVE_VERSION = 1
+
+
+class ReplayMissError(error.URLError):
+    """Raised in replay mode when the archive has no response for a request.
+
+    Subclasses URLError so callers report it like any other network failure.
+    """
+
+
+def _encode_body(body: bytes) -> dict[str, str]:
+    try:
+        return {"body": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(body).decode("ascii")}
+
+
+def _decode_body(entry: dict[str, Any]) -> bytes:
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+def _lenient_key(url: str) -> str:
+    parts = parse.urlsplit(url)
+    return f"{parts.path.rstrip('/')}?{parse.urlencode(sorted(parse.parse_qsl(parts.query, keep_blank_values=True)))}"
+
+
+def iter_archive(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Yield the header line, then one dict per recorded exchange.
+
+    An archive cut short (the recording process was killed before closing it)
+    yields the complete lines that reached the file.
+    """
+    with gzip.open(Path(path).expanduser(), "rt", encoding="utf-8") as handle:
+        try:
+            for line in handle:
+                if not line.endswith("\n"):
+                    break
+                if line.strip():
+                    yield json.loads(line)
+        except EOFError:
+            return
+
+
+def read_archive(path: str | Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Return (header, exchanges) and check the archive format."""
+    records = iter_archive(path)
+    header = next(records, None)
+    if not header or header.get("format") != ARCHIVE_FORMAT:
+        raise ValueError(f"Not a recording archive: {path}")
+    if header.get("version") != ARCHIVE_VERSION:
+        raise ValueError(f"Unsupported recording version {header.get('version')}: {path}")
+    return header, list(records)
+
+
+class Recorder:
+    """Append fetched exchanges to a gzip JSONL archive (one writer per file)."""
+
+    def __init__(self, path: str | Path, *, base_url: str = "") -> None:
+        self.path = Path(path).expanduser()
+        self.base_url = base_url
+        self.count = 0
+        self._lock = threading.Lock()
+        self._handle: Any = None
+        self._started = 0.0
+
+    def _open(self) -> Any:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._started = time.time()
+        handle = gzip.open(self.path, "wt", encoding="utf-8")
+        header = {
+            "format": ARCHIVE_FORMAT,
+            "version": ARCHIVE_VERSION,
+            "recorded_at": self._started,
+            "base_url": self.base_url,
+        }
+        handle.write(json.dumps(header) + "\n")
+        return handle
+
+    def record(
+        self,
+        url: str,
+        accept: str,
+        entry: CachedEntry,
+        *,
+        started_at: float,
+        duration: float,
+    ) -> None:
+        status, headers, body = entry
+        with self._lock:
+            if self._handle is None:
+                self._handle = self._open()
+            line = {
+                "url": url,
+                "accept": accept,
+                "status": status,
+                "headers": headers,
+                "offset": round(started_at - self._started, 6),
+                "duration": round(duration, 6),
+                **_encode_body(bytes(body)),
+            }
+            # No per-record flush: it would end a deflate block per line and defeat compression.
+            # The archive is closed at exit; a killed run still leaves the lines written so far.
+            self._handle.write(json.dumps(line, ensure_ascii=False) + "\n")
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+class Replayer:
+    """Serve fetches from a recording archive with the recorded (scaled) latency."""
+
+    def __init__(self, path: str | Path, *, match: str = "strict", speed: float = 1.0) -> None:
+        if match not in MATCH_POLICIES:
+            raise ValueError(f"EGOV_LAW_API_REPLAY_MATCH must be one of {', '.join(MATCH_POLICIES)}.")
+        if speed < 0:
+            raise ValueError("EGOV_LAW_API_REPLAY_SPEED must be >= 0.")
+        self.path = Path(path).expanduser()
+        self.match = match
+        self.speed = speed
+        try:
+            self.header, exchanges = read_archive(self.path)
+        except (OSError, ValueError) as exc:
+            raise ValueError(f"Cannot read EGOV_LAW_API_REPLAY archive {self.path}: {exc}") from exc
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._queues: dict[str, deque[dict[str, Any]]] = {}
+        self._by_path: dict[str, list[str]] = {}
+        for item in exchanges:
+            key = self._key(item["url"], item.get("accept", ""))
+            if key not in self._queues:
+                self._queues[key] = deque()
+                self._by_path.setdefault(key.split("?", 1)[0], []).append(key)
+            self._queues[key].append(item)
+
+    def _key(self, url: str, accept: str) -> str:
+        return _lenient_key(url) if self.match == "lenient" else normalize_cache_key(url, accept)
+
+    def _closest(self, key: str) -> str | None:
+        path, _, query = key.partition("?")
+        wanted = set(parse.parse_qsl(query, keep_blank_values=True))
+        candidates = self._by_path.get(path, [])
+        if not candidates:
+            return None
+        return max(
+            candidates,
+            key=lambda other: len(wanted & set(parse.parse_qsl(other.partition("?")[2], keep_blank_values=True))),
+        )
+
+    def _take(self, url: str, accept: str) -> dict[str, Any] | None:
+        key = self._key(url, accept)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is None and self.match == "lenient":
+                closest = self._closest(key)
+                queue = self._queues.get(closest) if closest else None
+            if not queue:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return queue.popleft() if len(queue) > 1 else queue[0]
+
+    def respond(self, url: str, accept: str) -> CachedEntry:
+        item = self._take(url, accept)
+        if item is None:
+            raise ReplayMissError(f"No recorded response for {url} in {self.path} ({self.match} match)")
+        if self.speed > 0:
+            time.sleep(item.get("duration", 0.0) / self.speed)
+        return item["status"], item.get("headers", {}), _decode_body(item)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "match": self.match,
+            "speed": self.speed,
+            "requests": sum(len(queue) for queue in self._queues.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def summarize_archive(path: str | Path) -> dict[str, Any]:
+    """Count exchanges per endpoint path and total recorded bytes and time."""
+    header, exchanges = read_archive(path)
+    endpoints: dict[str, int] = {}
+    statuses: dict[str, int] = {}
+    for item in exchanges:
+        endpoint = parse.urlsplit(item["url"]).path
+        endpoints[endpoint] = endpoints.get(endpoint, 0) + 1
+        statuses[str(item["status"])] = statuses.get(str(item["status"]), 0) + 1
+    return {
+        "path": str(path),
+        "recorded_at": header.get("recorded_at"),
+        "base_url": header.get("base_url", ""),
+        "requests": len(exchanges),
+        "span_seconds": round(max((item["offset"] + item["duration"] for item in exchanges), default=0.0), 3),
+        "fetch_seconds": round(sum(item["duration"] for item in exchanges), 3),
+        "body_bytes": sum(len(_decode_body(item)) for item in exchanges),
+        "statuses": statuses,
+        "endpoints": endpoints,
+    }
+
+
+def rebase_url(url: str, recorded_base: str, target_base: str) -> str:
+    """Point a recorded URL at target_base when it was made under recorded_base."""
+    recorded_base = recorded_base.rstrip("/")
+    if target_base and recorded_base and url.startswith(recorded_base + "/"):
+        return target_base.rstrip("/") + url[len(recorded_base):]
+    return url
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _latency_summary(values: list[float]) -> dict[str, float]:
+    return {
+        "p50_ms": round(_percentile(values, 0.5) * 1000, 1),
+        "p95_ms": round(_percentile(values, 0.95) * 1000, 1),
+        "max_ms": round(max(values, default=0.0) * 1000, 1),
+    }
+
+
+def run_load(
+    path: str | Path,
+    send: Callable[[str, str], int],
+    *,
+    target_base: str = "",
+    speed: float = 1.0,
+    workers: int = 8,
+    limit: int | None = None,
+) -> dict[str, Any]:
+    """Re-issue a recorded session through send(url, accept) -> status.
+
+    Requests start at their recorded offsets divided by speed (0 = back to back)
+    on up to `workers` threads. Returns latency percentiles next to the recorded
+    ones and the requests whose status differed from the recording.
+    """
+    if speed < 0:
+        raise ValueError("speed must be >= 0.")
+    header, exchanges = read_archive(path)
+    exchanges = exchanges[:limit] if limit is not None else exchanges
+    base = header.get("base_url", "")
+
+    def issue(item: dict[str, Any]) -> tuple[dict[str, Any], float, int | str]:
+        if speed > 0:
+            delay = started + item["offset"] / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        url = rebase_url(item["url"], base, target_base)
+        begin = time.perf_counter()
+        try:
+            status: int | str = send(url, item.get("accept", ""))
+        except (OSError, ValueError) as exc:
+            status = type(exc).__name__
+        return item, time.perf_counter() - begin, status
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(issue, exchanges))
+    wall = time.monotonic() - started
+
+    mismatches = [
+        {"url": item["url"], "recorded": item["status"], "replayed": status}
+        for item, _, status in results
+        if status != item["status"]
+    ]
+    return {
+        "path": str(path),
+        "requests": len(results),
+        "speed": speed,
+        "workers": workers,
+        "wall_seconds": round(wall, 3),
+        "recorded_span_seconds": round(max((item["offset"] for item in exchanges), default=0.0), 3),
+        "latency": _latency_summary([elapsed for _, elapsed, _ in results]),
+        "recorded_latency": _latency_summary([item["duration"] for item in exchanges]),
+        "status_mismatches": len(mismatches),
+        "mismatch_samples": mismatches[:20],
+    }
+
+
+recorder: Recorder | None = None
+replayer: Replayer | None = None
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def configure(
+    *,
+    record: str | None = None,
+    replay: str | None = None,
+    match: str = REPLAY_MATCH,
+    speed: float = REPLAY_SPEED,
+    base_url: str = "",
+) -> None:
+    """Switch recording or replay on (or both off) at runtime."""
+    global recorder, replayer, _configured
+    _configured = True
+    if record and replay:
+        raise ValueError("EGOV_LAW_API_RECORD and EGOV_LAW_API_REPLAY cannot be used together.")
+    if recorder is not None:
+        recorder.close()
+    recorder = Recorder(record, base_url=base_url) if record else None
+    if recorder is not None:
+        atexit.register(recorder.close)
+    replayer = Replayer(replay, match=match, speed=speed) if replay else None
+
+
+def ensure_configured(base_url: str = "") -> None:
+    """Apply EGOV_LAW_API_RECORD / EGOV_LAW_API_REPLAY before the first fetch.
+
+    Deferred from import time so that a bad setting fails the request with a
+    ValueError instead of every command, `--help` included. An explicit
+    configure() call takes precedence.
+    """
+    if _configured:
+        return
+    with _configure_lock:
+        if _configured:
+            return
+        if RECORD_PATH or REPLAY_PATH:
+            configure(record=RECORD_PATH, replay=REPLAY_PATH, base_url=base_url)
+        else:
+            configure()
@@ -0,0 +1,299 @@
+"""Compact typed records for /laws, /law_revisions and /keyword metadata.
+
+json.loads gives one dict per law_info / revision_info with its own copy of
+every key, date string and repeated code. These records use __slots__,
+intern identifiers and enumerated values (so a law_id or law_type shared by
+many entries is stored once), and keep YYYY-MM-DD dates as proleptic
+ordinals (0 = missing). Unknown keys are kept in `extra`, so to_dict()
+rebuilds the API shape (null/missing fields are omitted) from the same
+string objects without copying them.
+
+RevisionHistory keeps enforcement ordinals in an array for bisect-based
+as-of lookups.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import Any, Callable, Iterator
+
+# Field kinds: interned identifier/code, free text, YYYY-MM-DD date, raw JSON value.
+ID, TEXT, DATE, RAW = "id", "text", "date", "raw"
+
+_REVISION_ID_PATTERN = re.compile(r"^[0-9A-Za-z]+_[0-9]{8}_[0-9A-Za-z]+$")
+
+
+def is_revision_id(value: str) -> bool:
+    """True for a law_revision_id (`<law_id>_<YYYYMMDD>_<amendment_law_id>`) rather than a law ID or number."""
+    return _REVISION_ID_PATTERN.fullmatch(value) is not None
+
+
+def date_to_ordinal(value: Any) -> int:
+    """Return date.toordinal() for a YYYY-MM-DD prefix, or 0 when missing or malformed."""
+    if not isinstance(value, str) or len(value) < 10:
+        return 0
+    try:
+        return date.fromisoformat(value[:10]).toordinal()
+    except ValueError:
+        return 0
+
+
+def ordinal_to_date(value: int) -> str | None:
+    return date.fromordinal(value).isoformat() if value > 0 else None
+
+
+def _intern(value: Any) -> str | None:
+    return sys.intern(value) if isinstance(value, str) else None
+
+
+def _text(value: Any) -> str | None:
+    return value if isinstance(value, str) else None
+
+
+def _raw(value: Any) -> Any:
+    return value
+
+
+_CONVERTERS: dict[str, Callable[[Any], Any]] = {ID: _intern, TEXT: _text, DATE: date_to_ordinal, RAW: _raw}
+
+
+class _Record:
+    """Base for slotted records declared by a `FIELDS` table of (name, kind)."""
+
+    __slots__ = ("extra",)
+    FIELDS: tuple[tuple[str, str], ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._names = frozenset(name for name, _ in cls.FIELDS)
+        cls._kinds = dict(cls.FIELDS)
+        cls._plan = tuple((name, _CONVERTERS[kind], kind == DATE) for name, kind in cls.FIELDS)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Any:
+        record = cls.__new__(cls)
+        extra: dict[str, Any] = {}
+        for name, convert, is_date in cls._plan:
+            value = data.get(name)
+            converted = convert(value)
+            setattr(record, name, converted)
+            if is_date and value is not None and (not converted or len(value) != 10):
+                # Keep timestamps or malformed values verbatim for to_dict().
+                extra[name] = value
+        for key, value in data.items():
+            if key not in cls._names:
+                extra[key] = value
+        record.extra = extra or None
+        return record
+
+    def value(self, name: str) -> Any:
+        """One field as the API returned it (dates as strings, None when missing)."""
+        if self.extra and name in self.extra:
+            return self.extra[name]
+        value = getattr(self, name)
+        return ordinal_to_date(value) if type(self)._kinds[name] == DATE else value
+
+    def to_dict(self) -> dict[str, Any]:
+        """API-shaped dict sharing this record's string objects."""
+        out: dict[str, Any] = {}
+        for name, _, is_date in self._plan:
+            value = getattr(self, name)
+            if is_date:
+                value = ordinal_to_date(value)
+            if value is not None:
+                out[name] = value
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in (*self._names, "extra"))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        shown = ", ".join(f"{name}={getattr(self, name)!r}" for name, _ in self.FIELDS[:3])
+        return f"{type(self).__name__}({shown}, ...)"
+
+
+class LawInfo(_Record):
+    """law_info: identity of a law, shared by all of its revisions."""
+
+    FIELDS = (
+        ("law_id", ID),
+        ("law_num", ID),
+        ("law_type", ID),
+        ("law_num_era", ID),
+        ("law_num_year", RAW),
+        ("law_num_type", ID),
+        ("law_num_num", ID),
+        ("promulgation_date", DATE),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+class RevisionRecord(_Record):
+    """revision_info / current_revision_info, or one /law_revisions entry."""
+
+    FIELDS = (
+        ("law_revision_id", ID),
+        ("law_type", ID),
+        ("law_title", TEXT),
+        ("law_title_kana", TEXT),
+        ("abbrev", TEXT),
+        ("category", ID),
+        ("updated", TEXT),
+        ("amendment_promulgate_date", DATE),
+        ("amendment_enforcement_date", DATE),
+        ("amendment_enforcement_comment", TEXT),
+        ("amendment_scheduled_enforcement_date", DATE),
+        ("amendment_law_id", ID),
+        ("amendment_law_title", TEXT),
+        ("amendment_law_title_kana", TEXT),
+        ("amendment_law_num", ID),
+        ("amendment_type", ID),
+        ("repeal_status", ID),
+        ("repeal_date", DATE),
+        ("remain_in_force", RAW),
+        ("mission", ID),
+        ("current_revision_status", ID),
+    )
+    __slots__ = tuple(name for name, _ in FIELDS)
+
+
+def _revision(value: Any) -> RevisionRecord | None:
+    return RevisionRecord.from_dict(value) if isinstance(value, dict) else None
+
+
+class LawRecord:
+    """One /laws entry: law_info plus its revision_info and current_revision_info.
+
+    law_id and law_title (from current_revision_info, else revision_info) are
+    resolved once so matching over a catalog is plain attribute access.
+    """
+
+    __slots__ = ("info", "revision", "current_revision", "law_id", "law_title")
+
+    def __init__(
+        self, info: LawInfo, revision: RevisionRecord | None, current_revision: RevisionRecord | None
+    ) -> None:
+        self.info = info
+        self.revision = revision
+        self.current_revision = current_revision
+        self.law_id = info.law_id or ""
+        best = current_revision or revision
+        self.law_title = (best.law_title or "") if best is not None else ""
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> LawRecord:
+        revision = _revision(item.get("revision_info"))
+        current = _revision(item.get("current_revision_info"))
+        if current is not None and current == revision:
+            current = revision  # The search hit is the current revision: store it once.
+        return cls(LawInfo.from_dict(item.get("law_info") or {}), revision, current)
+
+    @property
+    def best_revision(self) -> RevisionRecord | None:
+        """current_revision_info when present, else revision_info."""
+        return self.current_revision or self.revision
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"law_info": self.info.to_dict()}
+        if self.revision is not None:
+            out["revision_info"] = self.revision.to_dict()
+        if self.current_revision is not None:
+            out["current_revision_info"] = self.current_revision.to_dict()
+        return out
+
+
+class SearchHit:
+    """One /keyword item: the law, the matching revision, and matched sentences (as returned)."""
+
+    __slots__ = ("info", "revision", "sentences")
+
+    def __init__(self, info: LawInfo, revision: RevisionRecord | None, sentences: list[Any]) -> None:
+        self.info = info
+        self.revision = revision
+        self.sentences = sentences
+
+    @classmethod
+    def from_dict(cls, item: dict[str, Any]) -> SearchHit:
+        sentences = item.get("sentences")
+        return cls(
+            LawInfo.from_dict(item.get("law_info") or {}),
+            _revision(item.get("revision_info")),
+            sentences if isinstance(sentences, list) else [],
+        )
+
+    @property
+    def law_id(self) -> str:
+        return self.info.law_id or ""
+
+    @property
+    def law_title(self) -> str:
+        return (self.revision.law_title or "") if self.revision is not None else ""
+
+    def to_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"law_info": self.info.to_dict()}
+        if self.revision is not None:
+            out["revision_info"] = self.revision.to_dict()
+        out["sentences"] = self.sentences
+        return out
+
+
+class RevisionHistory:
+    """Revisions of one law ordered by enforcement date, with as-of lookup by bisect."""
+
+    __slots__ = ("info", "revisions", "_enforced")
+
+    def __init__(self, info: LawInfo, revisions: list[RevisionRecord]) -> None:
+        self.info = info
+        self.revisions = sorted(revisions, key=lambda revision: revision.amendment_enforcement_date)
+        self._enforced = array("l", (revision.amendment_enforcement_date for revision in self.revisions))
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> RevisionHistory:
+        items = payload.get("revisions") or []
+        return cls(
+            LawInfo.from_dict(payload.get("law_info") or {}),
+            [RevisionRecord.from_dict(item) for item in items if isinstance(item, dict)],
+        )
+
+    def __len__(self) -> int:
+        return len(self.revisions)
+
+    def __iter__(self) -> Iterator[RevisionRecord]:
+        return iter(self.revisions)
+
+    def in_force(self, asof: str | date) -> RevisionRecord | None:
+        """Latest revision whose enforcement date is on or before asof (undated revisions never match).
+
+        On equal dates the revision listed first in the payload wins.
+        """
+        ordinal = asof.toordinal() if isinstance(asof, date) else date_to_ordinal(asof)
+        index = bisect_right(self._enforced, ordinal)
+        if index == 0 or self._enforced[index - 1] <= 0:
+            return None
+        day = self._enforced[index - 1]
+        return self.revisions[bisect_right(self._enforced, day - 1)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"law_info": self.info.to_dict(), "revisions": [revision.to_dict() for revision in self.revisions]}
+
+
+def parse_laws(payload: Any) -> list[LawRecord]:
+    """LawRecords for the `laws` list of a /laws payload (empty for anything else)."""
+    laws = payload.get("laws") if isinstance(payload, dict) else None
+    return [LawRecord.from_dict(item) for item in laws or [] if isinstance(item, dict)]
+
+
+def parse_keyword_hits(payload: Any) -> list[SearchHit]:
+    """SearchHits for the `items` list of a /keyword payload."""
+    items = payload.get("items") if isinstance(payload, dict) else None
+    return [SearchHit.from_dict(item) for item in items or [] if isinstance(item, dict)]
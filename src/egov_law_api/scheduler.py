@@ -0,0 +1,217 @@
+"""Priority scheduler for upstream fetches shared by interactive and background work.
+
+Every cache miss in request_endpoint takes a slot here before going to the
+network. There are three priority classes:
+
+- interactive: CLI commands and egov_* tool calls. Always dispatched first,
+  and EGOV_LAW_API_INTERACTIVE_RESERVE slots are kept for them alone.
+- prefetch and bulk: background work (prefetch/warm-up; archive downloads,
+  article-store pulls, and other per-revision fan-outs).
+  They share the remaining slots by weighted fair queuing
+  (EGOV_LAW_API_PREFETCH_WEIGHT : EGOV_LAW_API_BULK_WEIGHT) and only run
+  while no interactive request is waiting.
+
+Queued prefetch requests are speculative: when an interactive request finds
+every slot busy, they are preempted (PreemptedError) instead of waiting ahead
+of later interactive traffic. Queued bulk requests are only deferred.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from .tracing import span
+
+INTERACTIVE = "interactive"
+PREFETCH = "prefetch"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, PREFETCH, BULK)
+PREEMPTIBLE = frozenset({PREFETCH})
+
+MAX_CONCURRENCY = int(os.environ.get("EGOV_LAW_API_MAX_CONCURRENCY", "8"))
+INTERACTIVE_RESERVE = int(os.environ.get("EGOV_LAW_API_INTERACTIVE_RESERVE", "2"))
+PREFETCH_WEIGHT = float(os.environ.get("EGOV_LAW_API_PREFETCH_WEIGHT", "3"))
+BULK_WEIGHT = float(os.environ.get("EGOV_LAW_API_BULK_WEIGHT", "1"))
+
+if MAX_CONCURRENCY < 1:
+    MAX_CONCURRENCY = 8
+if not 0 <= INTERACTIVE_RESERVE < MAX_CONCURRENCY:
+    INTERACTIVE_RESERVE = min(2, MAX_CONCURRENCY - 1)
+if PREFETCH_WEIGHT <= 0:
+    PREFETCH_WEIGHT = 3.0
+if BULK_WEIGHT <= 0:
+    BULK_WEIGHT = 1.0
+
+_current_priority: ContextVar[str] = ContextVar("egov_law_request_priority", default=INTERACTIVE)
+
+
+class PreemptedError(RuntimeError):
+    """Raised to a queued background request that was dropped in favour of interactive work."""
+
+
+class _Ticket:
+    __slots__ = ("priority", "tag", "granted", "preempted", "event")
+
+    def __init__(self, priority: str, tag: float) -> None:
+        self.priority = priority
+        self.tag = tag
+        self.granted = False
+        self.preempted = False
+        self.event = threading.Event()
+
+
+class RequestScheduler:
+    """Thread-safe slot allocator: strict priority for interactive, WFQ for background classes."""
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENCY,
+        *,
+        interactive_reserve: int = INTERACTIVE_RESERVE,
+        weights: dict[str, float] | None = None,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1.")
+        if not 0 <= interactive_reserve < max_concurrent:
+            raise ValueError("interactive_reserve must be between 0 and max_concurrent - 1.")
+        self.max_concurrent = max_concurrent
+        self.interactive_reserve = interactive_reserve
+        self.weights = weights or {PREFETCH: PREFETCH_WEIGHT, BULK: BULK_WEIGHT}
+        self._lock = threading.Lock()
+        self._running = dict.fromkeys(PRIORITIES, 0)
+        self._interactive: deque[_Ticket] = deque()
+        self._background: list[tuple[float, int, _Ticket]] = []
+        self._order = itertools.count()
+        self._virtual_time = 0.0
+        self._last_tag = dict.fromkeys(PRIORITIES, 0.0)
+        self._dispatched = dict.fromkeys(PRIORITIES, 0)
+        self.preempted = 0
+
+    @property
+    def in_use(self) -> int:
+        return sum(self._running.values())
+
+    def _enqueue(self, priority: str) -> _Ticket:
+        if priority == INTERACTIVE:
+            ticket = _Ticket(priority, 0.0)
+            self._interactive.append(ticket)
+            if self.in_use >= self.max_concurrent:
+                self._preempt_background()
+            return ticket
+        # Start-time fair queuing: each class advances by 1/weight per request.
+        tag = max(self._virtual_time, self._last_tag[priority]) + 1.0 / self.weights[priority]
+        self._last_tag[priority] = tag
+        ticket = _Ticket(priority, tag)
+        heapq.heappush(self._background, (tag, next(self._order), ticket))
+        return ticket
+
+    def _preempt_background(self) -> None:
+        kept = []
+        for entry in self._background:
+            ticket = entry[2]
+            if ticket.priority in PREEMPTIBLE:
+                ticket.preempted = True
+                ticket.event.set()
+                self.preempted += 1
+            else:
+                kept.append(entry)
+        if len(kept) != len(self._background):
+            heapq.heapify(kept)
+            self._background = kept
+
+    def _grant(self, ticket: _Ticket) -> None:
+        ticket.granted = True
+        self._running[ticket.priority] += 1
+        self._dispatched[ticket.priority] += 1
+        ticket.event.set()
+
+    def _dispatch(self) -> None:
+        while self._interactive and self.in_use < self.max_concurrent:
+            self._grant(self._interactive.popleft())
+        background_limit = self.max_concurrent - self.interactive_reserve
+        while self._background and not self._interactive and self.in_use < background_limit:
+            tag, _, ticket = heapq.heappop(self._background)
+            self._virtual_time = tag
+            self._grant(ticket)
+
+    def _cancel(self, ticket: _Ticket) -> None:
+        if ticket.priority == INTERACTIVE:
+            self._interactive.remove(ticket)
+            return
+        self._background = [entry for entry in self._background if entry[2] is not ticket]
+        heapq.heapify(self._background)
+
+    @contextmanager
+    def slot(self, priority: str | None = None, timeout: float | None = None) -> Iterator[None]:
+        """Hold one upstream slot for the body of the with block.
+
+        Raises PreemptedError when a queued prefetch request is dropped, and
+        TimeoutError when no slot was granted within timeout seconds.
+        """
+        priority = priority or _current_priority.get()
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}.")
+        with self._lock:
+            ticket = self._enqueue(priority)
+            self._dispatch()
+        if not ticket.granted:
+            with span("scheduler.wait", priority=priority):
+                ticket.event.wait(timeout)
+        with self._lock:
+            if not ticket.granted:
+                if ticket.preempted:
+                    raise PreemptedError("Background request preempted by interactive traffic.")
+                self._cancel(ticket)
+                raise TimeoutError(f"No upstream slot within {timeout} seconds ({priority}).")
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._running[priority] -= 1
+                self._dispatch()
+
+    def interactive_waiting(self) -> int:
+        return len(self._interactive)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            queued = dict.fromkeys(PRIORITIES, 0)
+            queued[INTERACTIVE] = len(self._interactive)
+            for _, _, ticket in self._background:
+                queued[ticket.priority] += 1
+            return {
+                "max_concurrent": self.max_concurrent,
+                "interactive_reserve": self.interactive_reserve,
+                "weights": dict(self.weights),
+                "running": dict(self._running),
+                "queued": queued,
+                "dispatched": dict(self._dispatched),
+                "preempted": self.preempted,
+            }
+
+
+def current_priority() -> str:
+    """Priority of the calling context (interactive unless inside use_priority())."""
+    return _current_priority.get()
+
+
+@contextmanager
+def use_priority(priority: str) -> Iterator[None]:
+    """Run the block's requests (including asyncio.to_thread calls) at `priority`."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"priority must be one of {', '.join(PRIORITIES)}.")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+scheduler = RequestScheduler()
@@ -0,0 +1,227 @@
+"""Lightweight per-call tracing spans with a local JSONL / OTLP-JSON file exporter.
+
+Tracing is off unless EGOV_LAW_TRACE_FILE is set. Sampling is decided once per
+root span (EGOV_LAW_TRACE_SAMPLE_RATE); unsampled calls only pay for a
+contextvar lookup and a shared no-op span.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+TRACE_FILE = os.environ.get("EGOV_LAW_TRACE_FILE", "").strip()
+TRACE_FORMAT = os.environ.get("EGOV_LAW_TRACE_FORMAT", "jsonl").strip().lower()
+TRACE_SAMPLE_RATE = float(os.environ.get("EGOV_LAW_TRACE_SAMPLE_RATE", "1.0"))
+TRACE_FORMATS = ("jsonl", "otlp")
+SERVICE_NAME = "egov_law_api"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """One timed stage. Child spans share the trace and are exported with their root."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status", "_trace")
+
+    def __init__(self, name: str, trace: list["Span"], trace_id: str, parent_id: str | None) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: dict[str, Any] = {}
+        self.status = "ok"
+        self._trace = trace
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+# None = no active trace; False = inside an unsampled trace; Span = sampled.
+_current: ContextVar[Span | bool | None] = ContextVar("egov_law_trace_span", default=None)
+
+
+class TraceExporter:
+    """Append finished traces to a local file, one line per trace."""
+
+    def __init__(self, path: str, fmt: str = "jsonl") -> None:
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"EGOV_LAW_TRACE_FORMAT must be one of {', '.join(TRACE_FORMATS)}.")
+        self.path = Path(path).expanduser()
+        self.fmt = fmt
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[Span]) -> None:
+        if self.fmt == "otlp":
+            lines = [json.dumps(_otlp_payload(spans), ensure_ascii=False)]
+        else:
+            lines = [json.dumps(item.to_dict(), ensure_ascii=False, default=str) for item in spans]
+        data = "".join(f"{line}\n" for line in lines)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(data)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def _otlp_payload(spans: list[Span]) -> dict[str, Any]:
+    """Build an OTLP/JSON ExportTraceServiceRequest (the collector file exporter format)."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": SERVICE_NAME},
+                        "spans": [
+                            {
+                                "traceId": item.trace_id,
+                                "spanId": item.span_id,
+                                "parentSpanId": item.parent_id or "",
+                                "name": item.name,
+                                "kind": 1,
+                                "startTimeUnixNano": str(item.start_ns),
+                                "endTimeUnixNano": str(item.end_ns),
+                                "attributes": _otlp_attributes(item.attributes),
+                                "status": {"code": 2 if item.status == "error" else 1},
+                            }
+                            for item in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+exporter: TraceExporter | None = TraceExporter(TRACE_FILE, TRACE_FORMAT) if TRACE_FILE else None
+
+
+def configure(path: str | None, *, fmt: str = "jsonl", sample_rate: float | None = None) -> None:
+    """Enable (or, with path=None, disable) tracing at runtime."""
+    global exporter, TRACE_SAMPLE_RATE
+    exporter = TraceExporter(path, fmt) if path else None
+    if sample_rate is not None:
+        TRACE_SAMPLE_RATE = sample_rate
+
+
+def current_span() -> Span | _NoopSpan:
+    active = _current.get()
+    return active if isinstance(active, Span) else NOOP_SPAN
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+    """Time a stage as a child of the active span, or start a new (sampled) trace."""
+    parent = _current.get()
+    if parent is False or (parent is None and exporter is None):
+        yield NOOP_SPAN
+        return
+    if parent is None and random.random() >= TRACE_SAMPLE_RATE:
+        token = _current.set(False)
+        try:
+            yield NOOP_SPAN
+        finally:
+            _current.reset(token)
+        return
+    if isinstance(parent, Span):
+        item = Span(name, parent._trace, parent.trace_id, parent.span_id)
+    else:
+        item = Span(name, [], f"{random.getrandbits(128):032x}", None)
+    item.attributes.update(attributes)
+    token = _current.set(item)
+    try:
+        yield item
+    except BaseException as exc:
+        item.status = "error"
+        item.attributes.setdefault("error_type", type(exc).__name__)
+        raise
+    finally:
+        _current.reset(token)
+        item.end_ns = time.time_ns()
+        item._trace.append(item)
+        if item.parent_id is None and exporter is not None:
+            try:
+                exporter.export(item._trace)
+            except OSError:
+                pass
+
+
+def record_span(name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+    """Record an already-finished stage (such as thread-pool queueing) under the active span."""
+    parent = _current.get()
+    if not isinstance(parent, Span):
+        return
+    item = Span(name, parent._trace, parent.trace_id, parent.span_id)
+    item.start_ns = start_ns
+    item.end_ns = end_ns
+    item.attributes.update(attributes)
+    parent._trace.append(item)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorate a sync or async function so each call runs inside span(name)."""
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -0,0 +1,320 @@
+"""Cross-reference graph between law articles, extracted from mirrored law text."""
+
+from __future__ import annotations
+
+import json
+import re
+import struct
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from .export import iter_input_files
+from .law_xml import iter_articles, load_law_document
+
+GRAPH_MAGIC = b"EGXREF1\n"
+DIRECTIONS = ("out", "in", "both")
+MAX_HOPS = 5
+CONTEXT_CHARS = 64
+
+_KANJI_DIGITS = {"〇": 0, "一": 1, "二": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+_KANJI_UNITS = {"十": 10, "百": 100, "千": 1000}
+_KANJI_NUM = "〇一二三四五六七八九十百千"
+_ARTICLE_REF = re.compile(rf"第([{_KANJI_NUM}]+)条((?:の[{_KANJI_NUM}]+)*)")
+_SELF_LAW_SUFFIXES = ("この法律", "この政令", "この省令", "この命令", "この規則", "本法")
+_SAME_LAW_SUFFIXES = ("同法", "同令", "同規則")
+_LAW_LIKE_ENDINGS = ("法", "律", "令", "則")
+_ARTICLE_BRANCH_SEPARATORS = re.compile(r"[の\-]")
+# 「行政手続法（平成五年法律第八十八号）第二条」: the law number between the title and 第…条.
+_LAW_NUM_SUFFIX = re.compile(r"（[^（）]*号）$")
+# 「民法第九十条第一項及び第九十一条」: a later item of the same list cites the same law.
+_LIST_CONTINUATION = re.compile(rf"(?:第[{_KANJI_NUM}]+[項号])*(?:及び|並びに|又は|若しくは|、)")
+
+# (kind, context, article_num) where kind is "internal", "external", or "same".
+RawRef = tuple[str, str, str]
+
+
+def kanji_to_int(value: str) -> int:
+    """Convert a kanji numeral such as `二十七` or `百二` into an int."""
+    total = 0
+    current = 0
+    for char in value:
+        if char in _KANJI_DIGITS:
+            current = current * 10 + _KANJI_DIGITS[char]
+        elif char in _KANJI_UNITS:
+            total += (current or 1) * _KANJI_UNITS[char]
+            current = 0
+        else:
+            raise ValueError(f"Not a kanji numeral: {value!r}")
+    return total + current
+
+
+def article_num_from_ref(main: str, branches: str) -> str:
+    """Convert `二十七` + `の二` into the e-Gov `Num` form `27_2`."""
+    parts = [str(kanji_to_int(main))]
+    parts.extend(str(kanji_to_int(branch)) for branch in branches.split("の") if branch)
+    return "_".join(parts)
+
+
+def normalize_node_key(value: str) -> str:
+    """Normalize `LAW_ID:27の2` / `LAW_ID:27-2` into `LAW_ID:27_2`."""
+    law_id, sep, article = value.strip().partition(":")
+    if not sep or not law_id or not article:
+        raise ValueError("node must be in LAW_ID:ARTICLE_NUM form (for example 415AC0000000057:27).")
+    return f"{law_id}:{_ARTICLE_BRANCH_SEPARATORS.sub('_', article)}"
+
+
+def extract_references(text: str) -> list[RawRef]:
+    """Extract article references from provision text in document order.
+
+    A law number in parentheses right after the law title is skipped, and an
+    item joined to the previous reference by 及び/並びに/又は/若しくは/、 keeps
+    that reference's law.
+    """
+    refs: list[RawRef] = []
+    previous_end = -1
+    for match in _ARTICLE_REF.finditer(text):
+        start = match.start()
+        article_num = article_num_from_ref(match.group(1), match.group(2))
+        if refs and refs[-1][0] != "internal" and _LIST_CONTINUATION.fullmatch(text, previous_end, start):
+            refs.append((refs[-1][0], refs[-1][1], article_num))
+            previous_end = match.end()
+            continue
+        previous_end = match.end()
+        context = _LAW_NUM_SUFFIX.sub("", text[max(0, start - CONTEXT_CHARS):start])
+        if context.endswith(_SAME_LAW_SUFFIXES):
+            refs.append(("same", "", article_num))
+        elif context.endswith(_LAW_LIKE_ENDINGS) and not context.endswith(_SELF_LAW_SUFFIXES):
+            refs.append(("external", context, article_num))
+        else:
+            refs.append(("internal", "", article_num))
+    return refs
+
+
+def _scan_law_file_safe(path: str) -> tuple[str, str, list[tuple[str, list[RawRef]]]] | str:
+    """scan_law_file() for the process pool: an error message instead of an exception."""
+    try:
+        return scan_law_file(path)
+    except Exception as exc:  # noqa: BLE001 - one bad file must not stop the build
+        return f"{type(exc).__name__}: {exc}"
+
+
+def scan_law_file(path: str) -> tuple[str, str, list[tuple[str, list[RawRef]]]]:
+    """Extract (law_id, law_title, per-article raw references) from one mirrored file."""
+    doc = load_law_document(Path(path))
+    articles = [
+        (article.article_num, extract_references(article.text))
+        for article in iter_articles(doc)
+        if article.article_num and article.provision == "MainProvision"
+    ]
+    return doc.law_id, doc.law_title, articles
+
+
+@dataclass
+class XrefGraph:
+    """Compact article graph: integer node IDs with CSR (offset + target) edge arrays."""
+
+    nodes: list[str]
+    law_titles: dict[str, str]
+    out_offsets: array
+    out_targets: array
+    in_offsets: array
+    in_targets: array
+    stats: dict[str, Any]
+
+    def __post_init__(self) -> None:
+        self._index = {key: node_id for node_id, key in enumerate(self.nodes)}
+
+    def node_id(self, key: str) -> int:
+        node_id = self._index.get(normalize_node_key(key))
+        if node_id is None:
+            raise ValueError(f"Unknown node: {key}")
+        return node_id
+
+    def outbound(self, node_id: int) -> array:
+        return self.out_targets[self.out_offsets[node_id]:self.out_offsets[node_id + 1]]
+
+    def inbound(self, node_id: int) -> array:
+        return self.in_targets[self.in_offsets[node_id]:self.in_offsets[node_id + 1]]
+
+    def neighborhood(self, node_id: int, *, direction: str = "out", hops: int = 1) -> list[tuple[int, int]]:
+        """Breadth-first (node_id, distance) pairs within `hops`, excluding the start node."""
+        if direction not in DIRECTIONS:
+            raise ValueError(f"direction must be one of {', '.join(DIRECTIONS)}.")
+        if hops < 1 or hops > MAX_HOPS:
+            raise ValueError(f"hops must be between 1 and {MAX_HOPS}.")
+        seen = {node_id}
+        found: list[tuple[int, int]] = []
+        frontier = deque([(node_id, 0)])
+        while frontier:
+            current, distance = frontier.popleft()
+            if distance == hops:
+                continue
+            neighbors: Iterable[int] = ()
+            if direction in ("out", "both"):
+                neighbors = self.outbound(current)
+            if direction in ("in", "both"):
+                neighbors = [*neighbors, *self.inbound(current)]
+            for neighbor in neighbors:
+                if neighbor in seen:
+                    continue
+                seen.add(neighbor)
+                found.append((neighbor, distance + 1))
+                frontier.append((neighbor, distance + 1))
+        return found
+
+    def describe(self, node_id: int) -> dict[str, str]:
+        key = self.nodes[node_id]
+        law_id, _, article_num = key.partition(":")
+        return {
+            "node": key,
+            "law_id": law_id,
+            "law_title": self.law_titles.get(law_id, ""),
+            "article_num": article_num,
+        }
+
+    def query(self, key: str, *, direction: str = "out", hops: int = 1, limit: int = 100) -> dict[str, Any]:
+        """Return neighbors of `key` as JSON-ready dicts."""
+        node_id = self.node_id(key)
+        neighborhood = self.neighborhood(node_id, direction=direction, hops=hops)
+        return {
+            "node": self.describe(node_id),
+            "direction": direction,
+            "hops": hops,
+            "total": len(neighborhood),
+            "results": [
+                {**self.describe(neighbor), "distance": distance}
+                for neighbor, distance in neighborhood[:limit]
+            ],
+        }
+
+    def save(self, path: Path) -> None:
+        header = json.dumps(
+            {"nodes": self.nodes, "law_titles": self.law_titles, "stats": self.stats},
+            ensure_ascii=False,
+        ).encode("utf-8")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as handle:
+            handle.write(GRAPH_MAGIC)
+            handle.write(struct.pack("<Q", len(header)))
+            handle.write(header)
+            for values in (self.out_offsets, self.out_targets, self.in_offsets, self.in_targets):
+                handle.write(struct.pack("<Q", len(values)))
+                handle.write(values.tobytes())
+
+    @classmethod
+    def load(cls, path: Path) -> "XrefGraph":
+        data = path.read_bytes()
+        if not data.startswith(GRAPH_MAGIC):
+            raise ValueError(f"Not an xref graph file: {path}")
+        pos = len(GRAPH_MAGIC)
+        (header_len,) = struct.unpack_from("<Q", data, pos)
+        pos += 8
+        header = json.loads(data[pos:pos + header_len].decode("utf-8"))
+        pos += header_len
+        arrays: list[array] = []
+        for _ in range(4):
+            (count,) = struct.unpack_from("<Q", data, pos)
+            pos += 8
+            values = array("I")
+            values.frombytes(data[pos:pos + count * values.itemsize])
+            pos += count * values.itemsize
+            arrays.append(values)
+        return cls(header["nodes"], header["law_titles"], *arrays, stats=header["stats"])
+
+
+def _csr(edges: list[tuple[int, int]], node_count: int) -> tuple[array, array]:
+    offsets = array("I", [0] * (node_count + 1))
+    for src, _ in edges:
+        offsets[src + 1] += 1
+    for i in range(node_count):
+        offsets[i + 1] += offsets[i]
+    targets = array("I", [0] * len(edges))
+    cursor = array("I", offsets[:-1])
+    for src, dst in edges:
+        targets[cursor[src]] = dst
+        cursor[src] += 1
+    return offsets, targets
+
+
+def _resolve_title(context: str, titles: dict[str, str], lengths: list[int]) -> str | None:
+    for length in lengths:
+        law_id = titles.get(context[-length:])
+        if law_id is not None:
+            return law_id
+    return None
+
+
+def build_graph(
+    scanned: Iterable[tuple[str, str, list[tuple[str, list[RawRef]]]]],
+) -> XrefGraph:
+    """Resolve raw references into an XrefGraph.
+
+    External references are resolved by matching the longest corpus law title that
+    ends right before `第…条`; `同法` resolves to the last external law cited in the
+    same article. References to laws outside the corpus are counted as unresolved.
+    """
+    laws = [item for item in scanned if item[0]]
+    law_titles = {law_id: title for law_id, title, _ in laws}
+    titles = {title: law_id for law_id, title in law_titles.items() if title}
+    lengths = sorted({len(title) for title in titles}, reverse=True)
+
+    index: dict[str, int] = {}
+    nodes: list[str] = []
+
+    def intern(key: str) -> int:
+        node_id = index.get(key)
+        if node_id is None:
+            node_id = index[key] = len(nodes)
+            nodes.append(key)
+        return node_id
+
+    edges: set[tuple[int, int]] = set()
+    unresolved = 0
+    for law_id, _, articles in laws:
+        for article_num, refs in articles:
+            src = intern(f"{law_id}:{article_num}")
+            last_external: str | None = None
+            for kind, context, target_article in refs:
+                if kind == "internal":
+                    target_law = law_id
+                elif kind == "external":
+                    target_law = _resolve_title(context, titles, lengths)
+                    last_external = target_law
+                else:
+                    target_law = last_external
+                if target_law is None:
+                    unresolved += 1
+                    continue
+                dst = intern(f"{target_law}:{target_article}")
+                if dst != src:
+                    edges.add((src, dst))
+
+    ordered = sorted(edges)
+    out_offsets, out_targets = _csr(ordered, len(nodes))
+    in_offsets, in_targets = _csr(sorted((dst, src) for src, dst in ordered), len(nodes))
+    stats = {"laws": len(laws), "nodes": len(nodes), "edges": len(ordered), "unresolved_refs": unresolved}
+    return XrefGraph(nodes, law_titles, out_offsets, out_targets, in_offsets, in_targets, stats)
+
+
+def build_graph_from_mirror(input_dir: Path, *, workers: int | None = None) -> XrefGraph:
+    """Scan mirrored law files in a process pool and build the graph."""
+    if not input_dir.is_dir():
+        raise ValueError(f"Input directory not found: {input_dir}")
+    from concurrent.futures import ProcessPoolExecutor
+
+    paths = [str(path) for path in iter_input_files(input_dir)]
+    scanned: list[tuple[str, str, list[tuple[str, list[RawRef]]]]] = []
+    errors: list[dict[str, str]] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, result in zip(paths, pool.map(_scan_law_file_safe, paths, chunksize=16)):
+            if isinstance(result, str):
+                errors.append({"file": path, "error": result})
+            else:
+                scanned.append(result)
+    graph = build_graph(scanned)
+    graph.stats["files_failed"] = len(errors)
+    graph.stats["errors"] = errors
+    return graph